@@ -5,37 +5,18 @@ PyQt6 ASS Font Checker & Copier (Linux only) — UI po polsku, poprawione wykryw
 Autor: Twój Nick
 Wersja: 1.0
 """
+import os
 import sys
-import base64
-import argparse
 import subprocess
 import re
+import threading
 from pathlib import Path
 from collections import defaultdict
 from PyQt6 import QtGui, QtWidgets
-from PyQt6.QtWidgets import QApplication, QMessageBox, QStyleFactory
-
-def apply_theme(app):
-    """
-    Parsuje argumenty wiersza poleceń i aplikuje motyw przekazany
-    z aplikacji głównej.
-    """
-    parser = argparse.ArgumentParser(description="Uruchomienie dodatku DLC z motywem.")
-    parser.add_argument('--style-name', type=str, help='Nazwa stylu Qt do zastosowania.')
-    parser.add_argument('--stylesheet-b64', type=str, help='Arkusz stylów QSS zakodowany w Base64.')
-
-    args, _ = parser.parse_known_args()
-
-    if args.style_name:
-        QApplication.setStyle(QStyleFactory.create(args.style_name))
-
-    if args.stylesheet_b64:
-        try:
-            decoded_bytes = base64.b64decode(args.stylesheet_b64)
-            stylesheet = decoded_bytes.decode('utf-8')
-            app.setStyleSheet(stylesheet)
-        except Exception as e:
-            print(f"Nie udało się zastosować motywu: {e}")
+from PyQt6.QtWidgets import QMessageBox
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # katalog DLC z dlc_common
+from dlc_common.theme import apply_theme
 
 def run_cmd(cmd):
     try:
@@ -102,9 +83,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self.ass_files = []
         self.per_file_fonts = {}
         self.font_to_files = defaultdict(set)
-        self.font_index = build_font_index()
+        # fc-list potrafi trwać kilka sekund przy wielu czcionkach - indeks budujemy w tle,
+        # a okno pokazuje się od razu.
+        self._font_index = None
+        self._font_index_thread = threading.Thread(target=self._load_font_index, daemon=True)
+        self._font_index_thread.start()
         self._build_ui()
 
+    def _load_font_index(self):
+        self._font_index = build_font_index()
+
+    @property
+    def font_index(self):
+        # Czeka tylko wtedy, gdy skan zaczął się przed końcem fc-list.
+        self._font_index_thread.join()
+        return self._font_index
+
     def _build_ui(self):
         central = QtWidgets.QWidget()
         self.setCentralWidget(central)
@@ -215,16 +209,39 @@ class MainWindow(QtWidgets.QMainWindow):
         fonts = sorted(self.per_file_fonts.get(file_path, []))
         self.details_right.setPlainText(f"Czcionki wymagane przez '{file_path.name}':\n" + "\n".join(fonts))
 
+def check_files(paths):
+    """Tryb bez okna (--check): wypisuje czcionki plików ASS; kod wyjścia 1, gdy jakiejś brakuje."""
+    index = build_font_index()
+    status = 0
+    for path in paths:
+        print(f"{path}:")
+        for font in sorted(parse_ass_fonts(path), key=str.casefold):
+            installed = normalize_font_name(font) in index
+            if not installed:
+                status = 1
+            print(f"  {'✔' if installed else '✖'} {font}")
+    return status
+
+def create_window():
+    """Punkt wejścia dla gospodarza dodatków (dlc_common/host.py)."""
+    return MainWindow()
+
 # --- KLUCZOWA ZMIANA JEST TUTAJ ---
 def main():
+    if sys.argv[1:2] == ["--check"]:
+        sys.exit(check_files(sys.argv[2:]))
+
     # Krok 1: Utwórz aplikację
     app = QtWidgets.QApplication(sys.argv)
 
     # Krok 2: Zastosuj motyw przekazany z aplikacji głównej
     apply_theme(app)
+    from dlc_common.config import plugin_data_dir
+    from dlc_common.watchdog import install_watchdog
+    install_watchdog(app, os.path.join(plugin_data_dir(os.path.dirname(os.path.abspath(__file__))), "watchdog.log"))
 
     # Krok 3: Dopiero teraz stwórz główne okno i je pokaż
-    w = MainWindow()
+    w = create_window()
     w.show()
 
     # Krok 4: Uruchom pętlę zdarzeń
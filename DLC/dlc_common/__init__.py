@@ -0,0 +1,8 @@
+# dlc_common
+"""
+Wspólny rdzeń dodatków DLC: motyw, konfiguracja, transport HTTP, kolejka wysyłania,
+dławienie postępu i lista transferów (model/widok).
+
+Moduły są importowane osobno (np. ``from dlc_common.transport import send_file``),
+żeby dodatek ładował tylko to, czego używa.
+"""
@@ -0,0 +1,40 @@
+# config.py
+import json
+import os
+
+# Katalog, do którego dodatki zapisują swoje dane zamiast do własnych katalogów (benchmarki, testy).
+DATA_DIR_ENV = "DLC_DATA_DIR"
+
+
+def plugin_data_dir(plugin_dir):
+    """
+    Katalog danych dodatku (konfiguracja, bazy): domyślnie katalog dodatku, a przy ustawionej
+    zmiennej DLC_DATA_DIR - jego podkatalog o nazwie dodatku, tworzony w razie potrzeby.
+    """
+    root = os.environ.get(DATA_DIR_ENV)
+    if not root:
+        return plugin_dir
+    path = os.path.join(root, os.path.basename(plugin_dir))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def load_config(path):
+    """Zwraca słownik z pliku konfiguracji dodatku; brak lub uszkodzony plik daje pusty słownik."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_config(path, data):
+    """
+    Zapisuje konfigurację (np. API key i ustawienia kolejki) przez plik tymczasowy,
+    więc przerwany zapis nie zostawia uszkodzonego pliku. Błędy zapisu rzuca jako OSError.
+    """
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
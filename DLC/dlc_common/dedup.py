@@ -0,0 +1,89 @@
+# dedup.py
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def account_id(api_key):
+    """Identyfikator konta w bazach dodatków - skrót klucza API, żeby nie zapisywać samego klucza na dysku."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class DedupIndex:
+    """Mapuje skrót zawartości pliku na ID i linki pliku już wysłanego do danego serwisu."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            # Skróty są zapamiętywane po (ścieżka, rozmiar, mtime), żeby nie czytać pliku ponownie.
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS hashes ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime REAL NOT NULL, digest TEXT NOT NULL)"
+            )
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                " service TEXT NOT NULL, account TEXT NOT NULL, digest TEXT NOT NULL,"
+                " remote_id TEXT NOT NULL, links TEXT NOT NULL, uploaded REAL NOT NULL,"
+                " PRIMARY KEY (service, account, digest))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Osobne połączenie na każde wywołanie - indeks jest używany z wątków roboczych.
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def file_digest(self, path, cancelled=None):
+        """Zwraca skrót BLAKE2b zawartości pliku, licząc go przyrostowo tylko gdy plik się zmienił."""
+        st = os.stat(path)
+        with self._connect() as db:
+            row = db.execute("SELECT size, mtime, digest FROM hashes WHERE path = ?", (path,)).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime:
+            return row[2]
+
+        h = hashlib.blake2b(digest_size=32)
+        with open(path, "rb") as f:
+            while True:
+                if cancelled and cancelled():
+                    return None
+                data = f.read(HASH_CHUNK_SIZE)
+                if not data:
+                    break
+                h.update(data)
+        digest = h.hexdigest()
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO hashes (path, size, mtime, digest) VALUES (?, ?, ?, ?)",
+                       (path, st.st_size, st.st_mtime, digest))
+        return digest
+
+    def lookup(self, service, api_key, digest):
+        """Zwraca {"remote_id": ..., "links": {...}} dla już wysłanej zawartości albo None."""
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT remote_id, links FROM uploads WHERE service = ? AND account = ? AND digest = ?",
+                (service, account_id(api_key), digest)).fetchone()
+        if not row:
+            return None
+        return {"remote_id": row[0], "links": json.loads(row[1])}
+
+    def record(self, service, api_key, digest, remote_id, links):
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO uploads (service, account, digest, remote_id, links, uploaded)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (service, account_id(api_key), digest, remote_id, json.dumps(links), time.time()))
+
+    def forget(self, service, api_key, remote_id):
+        """Usuwa wpis, np. gdy plik zniknął z serwisu i trzeba go wysłać ponownie."""
+        with self._connect() as db:
+            db.execute("DELETE FROM uploads WHERE service = ? AND account = ? AND remote_id = ?",
+                       (service, account_id(api_key), remote_id))
@@ -0,0 +1,258 @@
+# host.py
+"""
+Gospodarz dodatków: jeden długo żyjący proces z jednym QApplication, który ładuje moduły dodatków
+na żądanie i otwiera ich okna bez ponownego startu Pythona, PyQt6 i nakładania motywu.
+
+Dodatek nadaje się do gospodarza, gdy plugin.json deklaruje w "capabilities" funkcję "window"
+(zwykle create_window) zwracającą okno bez pokazywania go (zob. manifest.py). Pozostałe dodatki
+(np. DLCTEST) uruchamia się jak dotąd jako osobny proces - tym zajmuje się launcher.py. Manifesty
+i wymagania (programy w PATH, platforma) gospodarz sprawdza raz, przy starcie i po zmianie plugin.json.
+
+Protokół (QLocalServer o nazwie SERVER_NAME): jedno zapytanie JSON na linię, jedna odpowiedź na linię.
+  {"cmd": "open", "plugin": "pixeldrain_integration", "args": ["--stylesheet-b64", "..."]}
+  {"cmd": "list"} - manifesty dodatków z brakującymi wymaganiami
+  {"cmd": "ping"} / {"cmd": "quit"}
+Odpowiedź: {"ok": true, ...} albo {"ok": false, "error": "..."}.
+
+Użycie: python DLC/dlc_common/host.py [--idle-exit 30] [--style-name ...] [--stylesheet-b64 ...]
+"""
+import argparse
+import getpass
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # katalog DLC z dlc_common
+
+from PyQt6.QtCore import QEvent, QObject, QThreadPool, QTimer
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+from PyQt6.QtWidgets import QApplication
+
+from dlc_common.config import plugin_data_dir
+from dlc_common.manifest import ManifestIndex, PluginUnavailable
+from dlc_common.theme import apply_theme
+from dlc_common.watchdog import install_watchdog
+
+DLC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SERVER_NAME = f"dlc-plugin-host-{getpass.getuser()}"
+IDLE_EXIT_MINUTES = 30  # po tylu minutach bez otwartych okien gospodarz się zamyka (0 = nigdy)
+RETIRE_POLL_MS = 500  # co tyle sprawdzamy, czy zamknięte okna mogą już zostać usunięte
+
+
+class PluginNotHostable(Exception):
+    """Dodatek nie deklaruje funkcji okna - trzeba go uruchomić jako osobny proces."""
+
+
+class PluginHost(QObject):
+    def __init__(self, app, dlc_dir=DLC_DIR, idle_exit=IDLE_EXIT_MINUTES, parent=None):
+        super().__init__(parent)
+        self.app = app
+        self.dlc_dir = dlc_dir
+        self.index = ManifestIndex(dlc_dir)
+        self.index.refresh()
+        self.modules = {}  # katalog dodatku -> załadowany moduł
+        self.windows = {}  # katalog dodatku -> otwarte okno
+        self.retiring = []  # zamknięte okna czekające, aż ich pule wątków skończą pracę
+        self.buffers = {}  # gniazdo -> nieprzetworzone bajty zapytania
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self._on_connection)
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.timeout.connect(self.app.quit)
+        self.retire_timer = QTimer(self)
+        self.retire_timer.setInterval(RETIRE_POLL_MS)
+        self.retire_timer.timeout.connect(self._retire_windows)
+        self.idle_exit = idle_exit
+
+    def listen(self, name=SERVER_NAME):
+        """Zwraca False, jeśli pod tą nazwą działa już inny gospodarz."""
+        probe = QLocalSocket()
+        probe.connectToServer(name)
+        if probe.waitForConnected(200):
+            probe.disconnectFromServer()
+            return False
+        # Gniazdo po gospodarzu, który nie zamknął się poprawnie, blokowałoby listen().
+        QLocalServer.removeServer(name)
+        if not self.server.listen(name):
+            raise RuntimeError(f"Nie można nasłuchiwać na {name}: {self.server.errorString()}")
+        self._update_idle()
+        return True
+
+    def _on_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self.buffers[sock] = b""
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(lambda s=sock: self._on_disconnected(s))
+
+    def _on_disconnected(self, sock):
+        self.buffers.pop(sock, None)
+        sock.deleteLater()
+
+    def _on_ready_read(self, sock):
+        self.buffers[sock] += bytes(sock.readAll())
+        while b"\n" in self.buffers[sock]:
+            line, self.buffers[sock] = self.buffers[sock].split(b"\n", 1)
+            try:
+                reply = self.handle(json.loads(line))
+            except ValueError as e:
+                reply = {"ok": False, "error": f"Niepoprawne zapytanie: {e}"}
+            sock.write(json.dumps(reply).encode("utf-8") + b"\n")
+            sock.flush()
+
+    def handle(self, request):
+        cmd = request.get("cmd")
+        if cmd == "ping":
+            return {"ok": True, "plugins": sorted(self.modules), "windows": sorted(self.windows)}
+        if cmd == "list":
+            self.index.refresh()
+            return {"ok": True, "plugins": self.index.summary()}
+        if cmd == "quit":
+            QTimer.singleShot(0, self.app.quit)
+            return {"ok": True}
+        if cmd != "open":
+            return {"ok": False, "error": f"Nieznane polecenie: {cmd}"}
+        start = time.perf_counter()
+        try:
+            self.open_plugin(request["plugin"], request.get("args", []))
+        except PluginNotHostable as e:
+            return {"ok": False, "error": str(e), "hostable": False}
+        except PluginUnavailable as e:
+            return {"ok": False, "error": str(e), "missing": e.missing}
+        except Exception as e:
+            traceback.print_exc()
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "ms": (time.perf_counter() - start) * 1000}
+
+    def open_plugin(self, plugin, args=()):
+        apply_theme(self.app, list(args))
+        window = self.windows.get(plugin)
+        if window is None:
+            module = self.load_plugin(plugin)
+            window = getattr(module, self.index.get(plugin)["capabilities"]["window"])()
+            # Bez WA_DeleteOnClose: zamknięte okno usuwamy sami, dopiero gdy jego pule wątków są puste.
+            window.installEventFilter(self)
+            window.destroyed.connect(lambda _=None, p=plugin, w=window: self._on_window_destroyed(p, w))
+            self.windows[plugin] = window
+            self._update_idle()
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        return window
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Close:
+            # Dodatek może zignorować zamknięcie - sprawdzamy po obsłużeniu zdarzenia.
+            QTimer.singleShot(0, lambda w=obj: self._on_window_closed(w))
+        return False
+
+    def _on_window_closed(self, window):
+        plugin = next((p for p, w in self.windows.items() if w is window), None)
+        if plugin is None or window.isVisible():
+            return
+        del self.windows[plugin]
+        self.retiring.append(window)
+        self._retire_windows()
+        self._update_idle()
+
+    def _retire_windows(self):
+        """
+        Usuwa zamknięte okna, których pule wątków (QThreadPool) nie mają już zadań. Destruktor puli
+        czeka na trwające zadania (np. zapytanie z 30 s limitem) w jedynym wątku GUI gospodarza,
+        co zablokowałoby okna wszystkich pozostałych dodatków. Okno z pracą w innych wątkach
+        (np. ThreadPoolExecutor) zgłasza ją metodą has_background_work().
+        """
+        for window in list(self.retiring):
+            busy = getattr(window, "has_background_work", None)
+            if busy is not None and busy():
+                continue
+            if all(pool.waitForDone(0) for pool in window.findChildren(QThreadPool)):
+                self.retiring.remove(window)
+                window.deleteLater()
+        if not self.retiring:
+            self.retire_timer.stop()
+        elif not self.retire_timer.isActive():
+            self.retire_timer.start()
+
+    def _on_window_destroyed(self, plugin, window):
+        if self.windows.get(plugin) is window:
+            del self.windows[plugin]
+        self._update_idle()
+
+    def _update_idle(self):
+        if self.windows or not self.idle_exit:
+            self.idle_timer.stop()
+        else:
+            self.idle_timer.start(int(self.idle_exit * 60 * 1000))
+
+    def load_plugin(self, plugin):
+        """Importuje moduł dodatku raz na życie gospodarza."""
+        module = self.modules.get(plugin)
+        if module is not None:
+            return module
+        plugin_dir = os.path.join(self.dlc_dir, plugin)
+        if os.path.dirname(os.path.abspath(plugin_dir)) != os.path.abspath(self.dlc_dir):
+            raise ValueError(f"Niepoprawna nazwa dodatku: {plugin}")
+        manifest = self.index.get(plugin)
+        missing = self.index.missing(plugin, recheck=True)
+        if missing:
+            raise PluginUnavailable(plugin, missing)
+        if not manifest["capabilities"]["window"]:
+            raise PluginNotHostable(f"{plugin}: plugin.json nie deklaruje funkcji okna")
+        path = os.path.join(plugin_dir, manifest["executable"])
+
+        module_name = "dlc_plugin_" + re.sub(r"\W", "_", plugin)
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        before = set(sys.modules)
+        sys.modules[module_name] = module
+        sys.path.insert(0, plugin_dir)
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(module_name, None)
+            raise
+        finally:
+            sys.path.remove(plugin_dir)
+            # Moduły pomocnicze dodatku (np. api_client) importowane są gołą nazwą - wyjmujemy je
+            # z sys.modules, żeby inny dodatek z modułem o tej samej nazwie dostał swój własny.
+            for name in set(sys.modules) - before - {module_name}:
+                file = getattr(sys.modules[name], "__file__", None)
+                if file and os.path.dirname(os.path.abspath(file)) == os.path.abspath(plugin_dir):
+                    del sys.modules[name]
+        self.modules[plugin] = module
+        return module
+
+
+def _report_exception(exc_type, exc, tb):
+    # Domyślnie PyQt6 przerywa proces przy wyjątku w slocie - w gospodarzu zamknęłoby to okna
+    # wszystkich dodatków, więc tylko wypisujemy błąd.
+    traceback.print_exception(exc_type, exc, tb)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gospodarz dodatków DLC.")
+    parser.add_argument("--idle-exit", type=float, default=IDLE_EXIT_MINUTES,
+                        help="minuty bez otwartych okien do zamknięcia gospodarza (0 = nigdy)")
+    args, _ = parser.parse_known_args()
+
+    app = QApplication(sys.argv)
+    app.setQuitOnLastWindowClosed(False)
+    apply_theme(app)
+    sys.excepthook = _report_exception
+    host = PluginHost(app, idle_exit=args.idle_exit)
+    if not host.listen():
+        print("Gospodarz dodatków już działa.")
+        return 0
+    # Jeden strażnik na wszystkie okna - stos w logu pokazuje, który dodatek zablokował pętlę.
+    install_watchdog(app, os.path.join(plugin_data_dir(os.path.join(DLC_DIR, "dlc_common")), "host_watchdog.log"))
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+# launcher.py
+"""
+Uruchamianie dodatku z automatyzera: najpierw przez gospodarza dodatków (host.py, okno w kilka ms),
+a gdy to niemożliwe - jak dotąd, jako osobny proces z "executable" z plugin.json.
+
+Dodatek, któremu brakuje wymagań z plugin.json (programy w PATH, platforma), nie jest uruchamiany
+wcale - launch() zgłasza PluginUnavailable z listą braków.
+
+Użycie z kodu:    launch("/ścieżka/DLC/pixeldrain_integration", ["--stylesheet-b64", qss_b64])
+                  run_headless("/ścieżka/DLC/Sprawdzacz czcionek", ["napisy.ass"])
+Z wiersza poleceń: python DLC/dlc_common/launcher.py pixeldrain_integration [--no-host] [argumenty dodatku]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # katalog DLC z dlc_common
+
+from PyQt6.QtNetwork import QLocalSocket
+
+from dlc_common.host import SERVER_NAME
+from dlc_common.manifest import PluginUnavailable, load_manifest, missing_requirements
+
+HOST_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "host.py")
+CONNECT_TIMEOUT_MS = 200
+REPLY_TIMEOUT_MS = 15000  # pierwsze otwarcie dodatku obejmuje import jego modułu
+HOST_START_TIMEOUT = 10.0  # s na wystartowanie gospodarza
+
+
+def send_to_host(request, name=SERVER_NAME, timeout_ms=REPLY_TIMEOUT_MS):
+    """Wysyła zapytanie do gospodarza; zwraca odpowiedź albo None, gdy gospodarz nie działa."""
+    sock = QLocalSocket()
+    sock.connectToServer(name)
+    if not sock.waitForConnected(CONNECT_TIMEOUT_MS):
+        return None
+    try:
+        sock.write(json.dumps(request).encode("utf-8") + b"\n")
+        sock.waitForBytesWritten(timeout_ms)
+        data = b""
+        deadline = time.monotonic() + timeout_ms / 1000
+        while b"\n" not in data:
+            remaining = int((deadline - time.monotonic()) * 1000)
+            if remaining <= 0 or not sock.waitForReadyRead(remaining):
+                return None
+            data += bytes(sock.readAll())
+        return json.loads(data.split(b"\n", 1)[0])
+    finally:
+        sock.disconnectFromServer()
+
+
+def start_host(args=()):
+    """Uruchamia gospodarza w tle, z motywem z args, i czeka, aż zacznie odpowiadać."""
+    subprocess.Popen([sys.executable, HOST_SCRIPT, *args], cwd=os.path.dirname(HOST_SCRIPT),
+                     stdin=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.monotonic() + HOST_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if send_to_host({"cmd": "ping"}) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def check_plugin(plugin_dir):
+    """Zwraca manifest dodatku albo zgłasza PluginUnavailable, gdy dodatek nie może tu działać."""
+    manifest = load_manifest(plugin_dir)
+    missing = missing_requirements(manifest)
+    if missing:
+        raise PluginUnavailable(os.path.basename(plugin_dir), missing)
+    return manifest
+
+
+def launch_process(plugin_dir, args=()):
+    """Dotychczasowy tryb: dodatek jako osobny proces."""
+    executable = check_plugin(plugin_dir)["executable"]
+    return subprocess.Popen([sys.executable, executable, *args], cwd=plugin_dir)
+
+
+def run_headless(plugin_dir, args=(), **kwargs):
+    """Uruchamia tryb bez okna zadeklarowany w "capabilities"."headless" i czeka na wynik (CompletedProcess)."""
+    manifest = check_plugin(plugin_dir)
+    headless = manifest["capabilities"]["headless"]
+    if headless is None:
+        raise ValueError(f"{os.path.basename(plugin_dir)}: dodatek nie ma trybu bez okna")
+    return subprocess.run([sys.executable, manifest["executable"], *headless, *args], cwd=plugin_dir, **kwargs)
+
+
+def launch(plugin_dir, args=(), use_host=True, spawn_host=True):
+    """
+    Otwiera dodatek i zwraca "host" albo obiekt Popen osobnego procesu.
+    Gospodarz obsługuje tylko dodatki z katalogu DLC, w którym sam leży.
+    """
+    plugin_dir = os.path.abspath(plugin_dir)
+    request = {"cmd": "open", "plugin": os.path.basename(plugin_dir), "args": list(args)}
+    in_host_dir = os.path.dirname(plugin_dir) == os.path.dirname(os.path.dirname(HOST_SCRIPT))
+    if use_host and in_host_dir:
+        reply = send_to_host(request)
+        if reply is None and spawn_host and start_host(args):
+            reply = send_to_host(request)
+        if reply is not None and reply.get("ok"):
+            return "host"
+        if reply is not None and reply.get("missing"):
+            raise PluginUnavailable(request["plugin"], reply["missing"])
+        if reply is not None and reply.get("hostable", True):
+            print(f"Gospodarz nie otworzył dodatku ({reply.get('error')}), uruchamiam osobny proces.")
+    return launch_process(plugin_dir, args)
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv:
+        print(__doc__)
+        return 2
+    use_host = "--no-host" not in argv
+    plugin, args = argv[0], [a for a in argv[1:] if a != "--no-host"]
+    if not os.path.isdir(plugin):
+        plugin = os.path.join(os.path.dirname(os.path.dirname(HOST_SCRIPT)), plugin)
+    try:
+        result = launch(plugin, args, use_host=use_host)
+    except PluginUnavailable as e:
+        print(e)
+        return 1
+    print("Otwarto w gospodarzu." if result == "host" else f"Uruchomiono proces {result.pid}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
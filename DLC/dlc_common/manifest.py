@@ -0,0 +1,114 @@
+# manifest.py
+"""
+plugin.json dodatku. Poza name/author/version/description/executable może deklarować:
+
+  "capabilities": {
+      "window": "create_window",   funkcja modułu zwracająca okno - dodatek otwiera się w gospodarzu (host.py)
+      "headless": ["--check"],     argumenty "executable" uruchamiające tryb bez okna (CLI)
+      "max_concurrency": 8         najwięcej równoległych transferów, jakie dodatek uruchamia
+  },
+  "requires": {
+      "binaries": ["mega-put"],    programy, które muszą być w PATH
+      "platforms": ["linux"]       wartości sys.platform, na których dodatek działa
+  }
+
+Brakujące pola dostają wartości z DEFAULTS (dodatek tylko jako osobny proces, bez wymagań).
+"""
+import json
+import os
+import shutil
+import sys
+
+MANIFEST_FILE = "plugin.json"
+DEFAULTS = {
+    "capabilities": {"window": None, "headless": None, "max_concurrency": 1},
+    "requires": {"binaries": [], "platforms": []},
+}
+
+
+class PluginUnavailable(Exception):
+    """Dodatek nie może działać na tym komputerze (brak programów albo zła platforma)."""
+
+    def __init__(self, plugin, missing):
+        super().__init__(f"{plugin}: brak wymagań: {', '.join(missing)}")
+        self.plugin = plugin
+        self.missing = missing
+
+
+def load_manifest(plugin_dir):
+    """Wczytuje plugin.json i uzupełnia brakujące pola domyślnymi; błędy pliku przechodzą dalej."""
+    with open(os.path.join(plugin_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for section, defaults in DEFAULTS.items():
+        manifest[section] = dict(defaults, **(manifest.get(section) or {}))
+    return manifest
+
+
+def missing_requirements(manifest, which=shutil.which, platform=sys.platform):
+    """Lista niespełnionych wymagań ("platforma: ...", nazwy programów); pusta, gdy dodatek może działać."""
+    requires = manifest["requires"]
+    missing = []
+    if requires["platforms"] and not any(platform.startswith(p) for p in requires["platforms"]):
+        missing.append(f"platforma {'/'.join(requires['platforms'])}")
+    missing.extend(b for b in requires["binaries"] if which(b) is None)
+    return missing
+
+
+class ManifestIndex:
+    """
+    Manifesty wszystkich dodatków z katalogu DLC z wynikiem sprawdzenia wymagań. plugin.json jest
+    wczytywany ponownie tylko po zmianie, a wymagania sprawdzane przy wczytaniu - dostępnych dodatków
+    nie trzeba już sprawdzać przy każdym otwarciu, a niedostępne (np. bez mega-cmd) sprawdza recheck.
+    """
+
+    def __init__(self, dlc_dir, which=shutil.which, platform=sys.platform):
+        self.dlc_dir = dlc_dir
+        self.which = which
+        self.platform = platform
+        self.entries = {}  # katalog dodatku -> (mtime plugin.json, manifest, brakujące wymagania)
+
+    def refresh(self):
+        """Wczytuje nowe i zmienione manifesty, usuwa te, których już nie ma."""
+        found = set()
+        for name in os.listdir(self.dlc_dir):
+            if os.path.isfile(os.path.join(self.dlc_dir, name, MANIFEST_FILE)):
+                found.add(name)
+                self._load(name)
+        for name in set(self.entries) - found:
+            del self.entries[name]
+
+    def _load(self, plugin):
+        plugin_dir = os.path.join(self.dlc_dir, plugin)
+        mtime = os.stat(os.path.join(plugin_dir, MANIFEST_FILE)).st_mtime_ns
+        entry = self.entries.get(plugin)
+        if entry is None or entry[0] != mtime:
+            manifest = load_manifest(plugin_dir)
+            entry = self.entries[plugin] = (mtime, manifest, self._check(manifest))
+        return entry
+
+    def _check(self, manifest):
+        return missing_requirements(manifest, self.which, self.platform)
+
+    def get(self, plugin):
+        """Manifest dodatku (wczytany ponownie, jeśli plugin.json się zmienił)."""
+        return self._load(plugin)[1]
+
+    def missing(self, plugin, recheck=False):
+        """Niespełnione wymagania; recheck sprawdza je ponownie, jeśli wcześniej czegoś brakowało."""
+        mtime, manifest, missing = self._load(plugin)
+        if missing and recheck:
+            missing = self._check(manifest)
+            self.entries[plugin] = (mtime, manifest, missing)
+        return missing
+
+    def summary(self):
+        """Stan wszystkich dodatków dla automatyzera: {katalog: {name, version, capabilities, missing}}."""
+        return {
+            plugin: {
+                "name": manifest.get("name", plugin),
+                "version": manifest.get("version"),
+                "capabilities": manifest["capabilities"],
+                "missing": missing,
+            }
+            for plugin, (_, manifest, missing) in sorted(self.entries.items())
+        }
@@ -0,0 +1,156 @@
+# metrics_view.py
+from PyQt6.QtCore import Qt, QTimer, QRectF
+from PyQt6.QtGui import QPainter
+from PyQt6.QtWidgets import (
+    QDialog, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton, QHBoxLayout, QVBoxLayout,
+    QLabel, QWidget, QFileDialog, QMessageBox, QAbstractItemView
+)
+
+from dlc_common.progress import format_size
+from dlc_common.tracing import HISTOGRAM_BOUNDS_MS, get_tracer
+
+REFRESH_MS = 1000
+COLUMNS = ["Etap", "Warstwa", "Liczba", "p50", "p95", "Maks.", "Suma", "Przepustowość"]
+
+
+def format_seconds(seconds):
+    if seconds < 1:
+        return f"{seconds * 1000:.1f} ms"
+    return f"{seconds:.2f} s"
+
+
+def bucket_label(i):
+    if i == len(HISTOGRAM_BOUNDS_MS):
+        return f">{HISTOGRAM_BOUNDS_MS[-1] // 1000}s"
+    bound = HISTOGRAM_BOUNDS_MS[i]
+    return f"≤{bound // 1000}s" if bound >= 1000 else f"≤{bound}ms"
+
+
+class HistogramWidget(QWidget):
+    """Słupki rozkładu czasu wybranego etapu w przedziałach HISTOGRAM_BOUNDS_MS."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.counts = []
+        self.setMinimumHeight(140)
+
+    def set_counts(self, counts):
+        self.counts = counts
+        self.update()
+
+    def paintEvent(self, event):
+        if not self.counts or not any(self.counts):
+            return
+        painter = QPainter(self)
+        metrics = painter.fontMetrics()
+        label_h = metrics.height() + 2
+        area = self.rect().adjusted(4, label_h, -4, -label_h)
+        width = area.width() / len(self.counts)
+        peak = max(self.counts)
+        color = self.palette().highlight().color()
+        for i, count in enumerate(self.counts):
+            x = area.left() + i * width
+            height = area.height() * count / peak
+            if count:
+                painter.fillRect(QRectF(x + 2, area.bottom() - height, width - 4, height), color)
+                painter.drawText(QRectF(x, area.bottom() - height - label_h, width, label_h),
+                                 Qt.AlignmentFlag.AlignCenter, str(count))
+            painter.drawText(QRectF(x, area.bottom() + 2, width, label_h), Qt.AlignmentFlag.AlignCenter, bucket_label(i))
+        painter.end()
+
+
+class MetricsDialog(QDialog):
+    """Czasy etapów transferów ze śladu (dlc_common.tracing), odświeżane co sekundę, z eksportem do Chrome trace."""
+
+    def __init__(self, parent=None, tracer=None):
+        super().__init__(parent)
+        self.setWindowTitle("Metryki transferów")
+        self.resize(820, 480)
+        self.tracer = tracer or get_tracer()
+        self.stats = {}
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.itemSelectionChanged.connect(self.show_histogram)
+        self.histogram_label = QLabel("Wybierz etap, aby zobaczyć rozkład czasów.")
+        self.histogram = HistogramWidget()
+
+        export_btn = QPushButton("Eksportuj ślad (Chrome)…")
+        export_btn.clicked.connect(self.export_trace)
+        clear_btn = QPushButton("Wyczyść")
+        clear_btn.clicked.connect(self.clear)
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(clear_btn)
+        buttons.addWidget(export_btn)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.table, 1)
+        layout.addWidget(self.histogram_label)
+        layout.addWidget(self.histogram)
+        layout.addLayout(buttons)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        self.timer.start(REFRESH_MS)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def selected_stage(self):
+        row = self.table.currentRow()
+        item = self.table.item(row, 0) if row >= 0 else None
+        return item.text() if item else None
+
+    def refresh(self):
+        selected = self.selected_stage()
+        self.stats = self.tracer.stats()
+        self.table.setRowCount(len(self.stats))
+        for row, (name, s) in enumerate(sorted(self.stats.items(), key=lambda kv: -kv[1]["total"])):
+            rate = f"{format_size(s['rate'])}/s" if s["rate"] else ""
+            count = f"{s['count']} ({s['errors']} bł.)" if s["errors"] else str(s["count"])
+            values = [name, s["cat"], count, format_seconds(s["p50"]), format_seconds(s["p95"]),
+                      format_seconds(s["max"]), format_seconds(s["total"]), rate]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column >= 2:
+                        item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+            if name == selected:
+                self.table.selectRow(row)
+        self.show_histogram()
+
+    def show_histogram(self):
+        name = self.selected_stage()
+        s = self.stats.get(name)
+        if not s:
+            self.histogram.set_counts([])
+            return
+        self.histogram_label.setText(f"Rozkład czasów: {name} ({s['count']})")
+        self.histogram.set_counts(s["histogram"])
+
+    def clear(self):
+        self.tracer.clear()
+        self.refresh()
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Zapisz ślad", "transfer_trace.json", "Chrome trace (*.json)")
+        if not path:
+            return
+        try:
+            self.tracer.export_chrome(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Błąd", f"Nie udało się zapisać śladu: {e}")
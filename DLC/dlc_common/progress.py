@@ -0,0 +1,44 @@
+# progress.py
+import time
+
+PROGRESS_MAX_RATE = 10  # maks. liczba sygnałów postępu na sekundę
+
+
+def format_size(size, precision=2):
+    """Rozmiar w bajtach jako tekst (B, KB, ... PB); None daje "N/A"."""
+    if size is None:
+        return "N/A"
+    if size == 0:
+        return "0 B"
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
+        if size < 1024:
+            return f"{size:.{precision}f} {unit}"
+        size /= 1024
+    return f"{size:.{precision}f} PB"
+
+
+class ProgressThrottle:
+    """Przepuszcza postęp tylko przy zmianie procentu i nie częściej niż max_rate razy na sekundę."""
+
+    def __init__(self, emit, total, max_rate=PROGRESS_MAX_RATE, clock=time.monotonic):
+        self.emit = emit
+        self.total = total
+        self.interval = 1.0 / max_rate if max_rate else 0
+        self.clock = clock
+        self.done = 0
+        self.emitted = 0
+        self.last_percent = -1
+        self.last_time = None
+
+    def add(self, count):
+        self.done += count
+        percent = int(self.done * 100 / self.total) if self.total else 100
+        if percent == self.last_percent:
+            return
+        now = self.clock()
+        if percent < 100 and self.last_time is not None and now - self.last_time < self.interval:
+            return
+        self.last_percent = percent
+        self.last_time = now
+        self.emitted += 1
+        self.emit(percent)
@@ -0,0 +1,213 @@
+# scheduler.py
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from dlc_common.tracing import get_tracer, span
+
+DEFAULT_MAX_PARALLEL = 2
+UPLOAD_ORDERS = [
+    ("fifo", "Kolejność wyboru"),
+    ("smallest", "Najmniejsze najpierw"),
+    ("largest", "Największe najpierw"),
+]
+
+
+class BandwidthLimiter:
+    """Wspólny dla wszystkich workerów kubełek żetonów ograniczający łączną prędkość wysyłania."""
+
+    def __init__(self, rate=0, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.rate = 0
+        self.tokens = 0.0
+        self.last = clock()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """Ustawia limit w B/s; 0 wyłącza ograniczenie."""
+        with self.lock:
+            self.rate = max(0, int(rate))
+            self.tokens = min(self.tokens, self.rate)
+            self.last = self.clock()
+
+    def acquire(self, count):
+        # Pobieramy żetony porcjami nie większymi niż pojemność kubełka (1 s ruchu),
+        # żeby duże kawałki nie blokowały innych workerów na długo.
+        while count > 0:
+            with self.lock:
+                if not self.rate:
+                    return
+                now = self.clock()
+                self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                portion = min(count, self.rate)
+                if self.tokens >= portion:
+                    self.tokens -= portion
+                    count -= portion
+                    continue
+                wait = (portion - self.tokens) / self.rate
+            self.sleep(min(wait, 0.5))
+
+
+class UploadCancelled(Exception):
+    pass
+
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int)
+    started = pyqtSignal()
+    finished = pyqtSignal(dict)
+
+
+class TransferWorker(QRunnable):
+    """
+    Baza workerów wysyłania: sygnały, pauza, anulowanie i limit prędkości między kawałkami.
+
+    Podklasa implementuje transfer() zwracające słownik wyniku (emitowany jako finished);
+    _before_chunk przekazuje się do transportu jako before_chunk.
+    group to konto/klucz, między którymi UploadScheduler dzieli sloty po równo.
+    trace_name to nazwa spanu całego transferu w śladzie (dlc_common.tracing), a "<trace_name>.queue"
+    to czas oczekiwania w kolejce.
+    """
+    trace_name = "transfer"
+
+    def __init__(self, file_path, group=None, limiter=None):
+        super().__init__()
+        self.file_path = file_path
+        self.group = group
+        self.limiter = limiter
+        self.size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        self.signals = WorkerSignals()
+        self.cancelled = False
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+        self.queued_at = time.perf_counter_ns()
+
+    def pause(self):
+        self.resume_event.clear()
+
+    def resume(self):
+        self.resume_event.set()
+
+    def cancel(self):
+        self.cancelled = True
+        self.resume_event.set()
+
+    def _before_chunk(self, size):
+        self.resume_event.wait()
+        if self.cancelled:
+            raise UploadCancelled()
+        if self.limiter:
+            self.limiter.acquire(size)
+
+    def find_duplicate(self, dedup, service, account):
+        """(skrót pliku, wpis już wysłanej tej samej zawartości lub None) z indeksu duplikatów."""
+        with span("dedup.hash", "disk", bytes=self.size):
+            digest = dedup.file_digest(self.file_path, cancelled=lambda: self.cancelled)
+        if self.cancelled:
+            raise UploadCancelled()
+        return digest, dedup.lookup(service, account, digest)
+
+    def record_upload(self, dedup, service, account, digest, remote_id, links):
+        try:
+            dedup.record(service, account, digest, remote_id, links)
+        except Exception as e:
+            print(f"Nie udało się zapisać indeksu duplikatów: {e}")
+
+    def transfer(self):
+        raise NotImplementedError
+
+    def error_result(self, error):
+        """Wynik dla wyjątku z transfer(); podklasy mogą np. oznaczyć błędy przejściowe."""
+        return {"error": str(error)}
+
+    def run(self):
+        if self.cancelled:
+            self.signals.finished.emit({"error": "Anulowano", "cancelled": True})
+            return
+        tracer = get_tracer()
+        tracer.record(f"{self.trace_name}.queue", "queue", self.queued_at, time.perf_counter_ns() - self.queued_at)
+        self.signals.started.emit()
+        stage = tracer.begin(self.trace_name, "transfer", bytes=self.size)
+        try:
+            result = self.transfer()
+        except Exception as e:
+            result = {"error": "Anulowano", "cancelled": True} if self.cancelled else self.error_result(e)
+        if "error" in result:
+            stage.args = {"error": str(result["error"])[:200]}
+        elif result.get("dedup"):
+            stage.args = {"dedup": True}  # nic nie zostało wysłane
+        stage.end()
+        self.signals.finished.emit(result)
+
+
+class UploadScheduler(QObject):
+    """Kolejka wysyłania: ogranicza liczbę równoległych transferów i ustala ich kolejność."""
+
+    def __init__(self, max_parallel=DEFAULT_MAX_PARALLEL, order="fifo", parent=None):
+        super().__init__(parent)
+        self.threadpool = QThreadPool(self)
+        self.pending = []
+        self.running = []
+        self.order = order
+        self.set_max_parallel(max_parallel)
+
+    def set_max_parallel(self, value):
+        self.max_parallel = max(1, int(value))
+        self.threadpool.setMaxThreadCount(max(self.max_parallel, self.threadpool.maxThreadCount()))
+        self._pump()
+
+    def add(self, workers):
+        """Dodaje całą partię naraz, żeby kolejność rozmiarów objęła wszystkie pliki."""
+        for worker in workers:
+            worker.signals.finished.connect(lambda _res, w=worker: self._on_finished(w))
+            self.pending.append(worker)
+        if self.order == "smallest":
+            self.pending.sort(key=lambda w: w.size)
+        elif self.order == "largest":
+            self.pending.sort(key=lambda w: w.size, reverse=True)
+        self._pump()
+
+    def pause(self, worker):
+        worker.pause()
+
+    def resume(self, worker):
+        worker.resume()
+        self._pump()
+
+    def cancel(self, worker):
+        worker.cancel()
+        if worker in self.pending:
+            # Zadanie jeszcze nie wystartowało - kończymy je od razu, bez zajmowania wątku.
+            self.pending.remove(worker)
+            worker.signals.finished.emit({"error": "Anulowano", "cancelled": True})
+
+    def cancel_all(self):
+        for worker in self.pending[:] + self.running[:]:
+            self.cancel(worker)
+
+    def is_busy(self):
+        return bool(self.pending or self.running)
+
+    def _on_finished(self, worker):
+        if worker in self.running:
+            self.running.remove(worker)
+        self._pump()
+
+    def _pump(self):
+        # Wstrzymane zadania z kolejki nie zajmują slotów - przepuszczamy kolejne.
+        ready = [w for w in self.pending if w.resume_event.is_set()]
+        while ready and len(self.running) < self.max_parallel:
+            # Przy kilku kontach sloty dzielimy po równo: najpierw konto z najmniejszą liczbą transferów.
+            busy = {}
+            for w in self.running:
+                busy[w.group] = busy.get(w.group, 0) + 1
+            worker = min(ready, key=lambda w: busy.get(w.group, 0))
+            ready.remove(worker)
+            self.pending.remove(worker)
+            self.running.append(worker)
+            self.threadpool.start(worker)
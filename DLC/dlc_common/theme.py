@@ -0,0 +1,34 @@
+# theme.py
+import argparse
+import base64
+
+from PyQt6.QtWidgets import QApplication, QStyleFactory
+
+# (styl, arkusz w Base64) ostatnio nałożonego motywu - gospodarz dodatków (host.py) dostaje motyw
+# przy każdym otwarciu okna, a ponowne setStyleSheet przelicza style wszystkich widżetów.
+_applied = (None, None)
+
+
+def apply_theme(app, argv=None):
+    """
+    Parsuje argumenty wiersza poleceń (albo argv) i aplikuje motyw przekazany z aplikacji głównej.
+    Motyw identyczny z już nałożonym jest pomijany.
+    """
+    global _applied
+    parser = argparse.ArgumentParser(description="Uruchomienie dodatku DLC z motywem.")
+    parser.add_argument('--style-name', type=str, help='Nazwa stylu Qt do zastosowania.')
+    parser.add_argument('--stylesheet-b64', type=str, help='Arkusz stylów QSS zakodowany w Base64.')
+    args, _ = parser.parse_known_args(argv)
+
+    if args.style_name and args.style_name != _applied[0]:
+        QApplication.setStyle(QStyleFactory.create(args.style_name))
+
+    if args.stylesheet_b64 and args.stylesheet_b64 != _applied[1]:
+        try:
+            decoded_bytes = base64.b64decode(args.stylesheet_b64)
+            stylesheet = decoded_bytes.decode('utf-8')
+            app.setStyleSheet(stylesheet)
+        except Exception as e:
+            print(f"Nie udało się zastosować motywu: {e}")
+
+    _applied = (args.style_name or _applied[0], args.stylesheet_b64 or _applied[1])
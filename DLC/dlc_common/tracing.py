@@ -0,0 +1,171 @@
+# tracing.py
+"""
+Lekki ślad etapów transferu: spany z monotonicznym znacznikiem czasu (perf_counter_ns) zapisywane
+do ograniczonego bufora w pamięci, z dowolnego wątku. Z bufora powstają statystyki dla okna metryk
+(metrics_view.py) i plik w formacie Chrome trace (chrome://tracing, ui.perfetto.dev).
+
+Warstwa (cat) mówi, gdzie idzie czas: "network", "cli" (polecenia MEGAcmd), "disk", "gui",
+"queue" (oczekiwanie w kolejce) albo "transfer" (cały transfer pliku, suma pozostałych).
+Spany z argumentem "bytes" dają też przepustowość (B/s) - w statystykach i jako licznik w śladzie.
+
+    with span("earnvids.post", "network", bytes=size):
+        ...
+    stage = begin("mega-put", "cli")   # etap kończony w innym slocie/wywołaniu
+    stage.end(bytes=size)
+
+    @traced("pixeldrain.finish", "gui")  # cały slot jako span
+    def upload_finished(self, result, transfer):
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+MAX_SPANS = 50000
+# Górne granice przedziałów histogramu czasu etapu w ms (ostatni przedział: powyżej).
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+
+class Span:
+    __slots__ = ("tracer", "name", "cat", "start", "args")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = time.perf_counter_ns()
+
+    def end(self, **args):
+        """Zamyka span; kolejne wywołania nic nie robią."""
+        if self.start is None:
+            return
+        if args:
+            self.args = dict(self.args, **args)
+        self.tracer.record(self.name, self.cat, self.start, time.perf_counter_ns() - self.start, self.args)
+        self.start = None
+
+
+class Tracer:
+    def __init__(self, max_spans=MAX_SPANS):
+        self.enabled = True
+        # deque.append jest atomowe - wątki robocze zapisują spany bez blokady.
+        self.spans = deque(maxlen=max_spans)  # (nazwa, warstwa, start ns, czas ns, id wątku, argumenty)
+        self.origin = time.perf_counter_ns()
+
+    def record(self, name, cat, start, duration, args=None):
+        if self.enabled:
+            self.spans.append((name, cat, start, duration, threading.get_ident(), args or {}))
+
+    def begin(self, name, cat="", **args):
+        return Span(self, name, cat, args)
+
+    @contextmanager
+    def span(self, name, cat="", **args):
+        stage = Span(self, name, cat, args)
+        try:
+            yield stage
+        except BaseException as e:
+            stage.end(error=type(e).__name__)
+            raise
+        stage.end()
+
+    def chunks(self, name, cat="network", on_chunk=None):
+        """
+        Zwraca callback on_chunk(liczba_bajtów) zapisujący span na każdy kawałek: od poprzedniego
+        kawałka (albo utworzenia) do bieżącego - czyli tempo wysyłania kawałek po kawałku.
+        on_chunk, jeśli podany, jest wołany dalej (np. ProgressThrottle.add).
+        """
+        last = [time.perf_counter_ns()]
+
+        def chunk(count):
+            now = time.perf_counter_ns()
+            self.record(name, cat, last[0], now - last[0], {"bytes": count})
+            last[0] = now
+            if on_chunk:
+                on_chunk(count)
+        return chunk
+
+    def clear(self):
+        self.spans.clear()
+
+    def snapshot(self):
+        return list(self.spans)
+
+    def stats(self):
+        """{nazwa: {cat, count, total, p50, p95, max (s), bytes, rate (B/s), histogram}} dla okna metryk."""
+        grouped = {}
+        for name, cat, _, duration, _, args in self.snapshot():
+            entry = grouped.setdefault(name, {"cat": cat, "durations": [], "bytes": 0, "errors": 0})
+            entry["durations"].append(duration / 1e9)
+            entry["bytes"] += args.get("bytes", 0)
+            entry["errors"] += "error" in args
+        stats = {}
+        for name, entry in grouped.items():
+            durations = sorted(entry.pop("durations"))
+            total = sum(durations)
+            histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+            for d in durations:
+                histogram[_bucket(d * 1000)] += 1
+            stats[name] = dict(
+                entry, count=len(durations), total=total, max=durations[-1],
+                p50=durations[len(durations) // 2], p95=durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                rate=entry["bytes"] / total if entry["bytes"] and total else None, histogram=histogram,
+            )
+        return stats
+
+    def chrome_trace(self):
+        """Zdarzenia w formacie Chrome trace (czasy w mikrosekundach od utworzenia śladu)."""
+        pid = os.getpid()
+        events = []
+        for name, cat, start, duration, tid, args in self.snapshot():
+            ts = (start - self.origin) / 1000
+            events.append({"name": name, "cat": cat or "other", "ph": "X", "ts": ts, "dur": duration / 1000,
+                           "pid": pid, "tid": tid, "args": args})
+            if args.get("bytes") and duration:
+                # Licznik przepustowości rysowany przez przeglądarkę śladu jako wykres.
+                events.append({"name": f"{name} B/s", "ph": "C", "ts": ts + duration / 1000, "pid": pid,
+                               "args": {"B/s": round(args["bytes"] * 1e9 / duration)}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, path):
+        """Zapisuje ślad do pliku JSON; błędy zapisu (OSError) przechodzą dalej."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def _bucket(ms):
+    for i, bound in enumerate(HISTOGRAM_BOUNDS_MS):
+        if ms <= bound:
+            return i
+    return len(HISTOGRAM_BOUNDS_MS)
+
+
+_tracer = Tracer()
+
+
+def get_tracer():
+    """Wspólny ślad procesu (w gospodarzu dodatków - wszystkich otwartych dodatków)."""
+    return _tracer
+
+
+def span(name, cat="", **args):
+    return _tracer.span(name, cat, **args)
+
+
+def begin(name, cat="", **args):
+    return _tracer.begin(name, cat, **args)
+
+
+def traced(name, cat=""):
+    """Dekorator: każde wywołanie funkcji (np. slotu w wątku GUI) jako span."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,223 @@
+# transfer_list.py
+import os
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QFontMetrics, QPalette
+from PyQt6.QtWidgets import (
+    QApplication, QListView, QStyle, QStyledItemDelegate, QStyleOptionButton, QStyleOptionProgressBar,
+    QStyleOptionViewItem
+)
+
+
+class TransferItem:
+    """
+    Stan jednego transferu na liście: tytuł, postęp i przyciski akcji.
+
+    Zmiany przez set_* odświeżają tylko wiersz tego transferu w modelu,
+    zamiast utrzymywać osobny widżet (etykieta, pasek, przyciski) dla każdego pliku.
+    """
+
+    def __init__(self, file_path, icon, actions):
+        self.file_path = file_path
+        self.name = os.path.basename(file_path)
+        self.title = f"{icon} {self.name}"
+        self.progress = 0
+        # [klucz, etykieta, włączona, widoczna] w kolejności rysowania
+        self.actions = [[key, label, True, True] for key, label in actions]
+        self.model = None
+
+    def _changed(self):
+        if self.model is not None:
+            self.model.item_changed(self)
+
+    def set_status(self, icon, text=""):
+        self.title = f"{icon} {self.name}" + (f" — {text}" if text else "")
+        self._changed()
+
+    def set_progress(self, percent):
+        if percent != self.progress:
+            self.progress = percent
+            self._changed()
+
+    def set_action(self, key, label=None, enabled=None, visible=None):
+        for action in self.actions:
+            if action[0] == key:
+                if label is not None:
+                    action[1] = label
+                if enabled is not None:
+                    action[2] = enabled
+                if visible is not None:
+                    action[3] = visible
+        self._changed()
+
+    def visible_actions(self):
+        return [a for a in self.actions if a[3]]
+
+
+class TransferListModel(QAbstractListModel):
+    """Lista transferów bez widżetów; wiersze rysuje TransferDelegate."""
+    ItemRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []
+        self.rows = {}  # transfer -> numer wiersza
+
+    def add(self, items):
+        if not items:
+            return
+        first = len(self.items)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        for row, item in enumerate(items, first):
+            item.model = self
+            self.items.append(item)
+            self.rows[item] = row
+        self.endInsertRows()
+
+    def remove(self, items):
+        """Usuwa podane transfery (np. zakończone) jednym przebudowaniem listy."""
+        gone = set(items)
+        if not gone:
+            return
+        self.beginResetModel()
+        for item in gone:
+            item.model = None
+        self.items = [i for i in self.items if i not in gone]
+        self.rows = {item: row for row, item in enumerate(self.items)}
+        self.endResetModel()
+
+    def clear(self):
+        self.remove(self.items)
+
+    def item_changed(self, item):
+        row = self.rows.get(item)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return item.title
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return item.file_path
+        if role == self.ItemRole:
+            return item
+        return None
+
+
+class TransferDelegate(QStyledItemDelegate):
+    """Rysuje wiersz transferu (tytuł, pasek postępu, przyciski) i obsługuje kliknięcia w przyciski."""
+    action_triggered = pyqtSignal(object, str)  # transfer, klucz akcji
+
+    PADDING = 5
+    SPACING = 4
+    BAR_HEIGHT = 18
+    BUTTON_HEIGHT = 26
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pressed = None  # (wiersz, akcja) wciśniętego przycisku
+
+    def _button_rects(self, item, rect, font):
+        fm = QFontMetrics(font)
+        x = rect.left() + self.PADDING
+        y = rect.bottom() - self.PADDING - self.BUTTON_HEIGHT
+        rects = []
+        for key, label, enabled, _ in item.visible_actions():
+            width = fm.horizontalAdvance(label) + 24
+            rects.append((key, label, enabled, QRect(x, y, width, self.BUTTON_HEIGHT)))
+            x += width + self.SPACING
+        return rects
+
+    def sizeHint(self, option, index):
+        height = (QFontMetrics(option.font).height() + self.BAR_HEIGHT + self.BUTTON_HEIGHT
+                  + 2 * self.PADDING + 2 * self.SPACING)
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter, option, index):
+        item = index.data(TransferListModel.ItemRole)
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        rect = option.rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+        fm = QFontMetrics(option.font)
+
+        painter.save()
+        painter.setFont(option.font)
+        painter.setPen(option.palette.highlightedText().color() if selected else option.palette.text().color())
+        title_rect = QRect(rect.left(), rect.top(), rect.width(), fm.height())
+        painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                         fm.elidedText(item.title, Qt.TextElideMode.ElideMiddle, title_rect.width()))
+        painter.restore()
+
+        bar = QStyleOptionProgressBar()
+        bar.rect = QRect(rect.left(), title_rect.bottom() + self.SPACING, rect.width(), self.BAR_HEIGHT)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = item.progress
+        bar.text = f"{item.progress}%"
+        bar.textVisible = True
+        bar.state = QStyle.StateFlag.State_Enabled | QStyle.StateFlag.State_Horizontal
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, bar, painter, widget)
+
+        for key, label, enabled, button_rect in self._button_rects(item, option.rect, option.font):
+            button = QStyleOptionButton()
+            button.rect = button_rect
+            button.text = label
+            button.palette = QPalette(option.palette)
+            if enabled:
+                button.state = QStyle.StateFlag.State_Enabled
+            else:
+                button.state = QStyle.StateFlag.State_None
+                button.palette.setCurrentColorGroup(QPalette.ColorGroup.Disabled)
+            if self.pressed == (index.row(), key):
+                button.state |= QStyle.StateFlag.State_Sunken
+            else:
+                button.state |= QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+        item = index.data(TransferListModel.ItemRole)
+        pos = event.position().toPoint()
+        hit = next((key for key, _, enabled, r in self._button_rects(item, option.rect, option.font)
+                    if enabled and r.contains(pos)), None)
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.pressed = (index.row(), hit) if hit else None
+            return hit is not None
+        pressed, self.pressed = self.pressed, None
+        if hit and pressed == (index.row(), hit):
+            self.action_triggered.emit(item, hit)
+            return True
+        return False
+
+
+class TransferListView(QListView):
+    """QListView z modelem i delegatem listy transferów; kliknięcia przycisków idą sygnałem action_triggered."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.transfers = TransferListModel(self)
+        self.delegate = TransferDelegate(self)
+        self.action_triggered = self.delegate.action_triggered
+        self.setModel(self.transfers)
+        self.setItemDelegate(self.delegate)
+        # Wszystkie wiersze mają tę samą wysokość - widok nie mierzy każdego z osobna.
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
@@ -0,0 +1,332 @@
+# transport.py
+import base64
+import json
+import mmap
+import os
+import select
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit
+
+MIN_SEGMENT_SIZE = 1024 * 1024
+MAX_SEGMENT_SIZE = 16 * 1024 * 1024
+TARGET_SEGMENT_SECONDS = 0.25
+SOCKET_TIMEOUT = 60
+POOL_SIZE = 16  # połączeń na host: w ConnectionPool i w puli sesji requests
+USER_AGENT = "DLC-uploader/1.0"
+
+# requests i http.client (z ssl) są importowane dopiero przy pierwszym zapytaniu,
+# żeby nie wydłużały startu okien dodatków.
+
+_sessions = {}
+_session_lock = threading.Lock()
+
+
+def get_session(retry=True):
+    """
+    Zwraca wspólną sesję HTTP (pula połączeń keep-alive + ponawianie) używaną przez wszystkie dodatki.
+    retry=False daje osobną sesję bez ponawiania - dla zapytań GET, które zmieniają stan konta
+    (np. tworzenie folderu), gdzie powtórzenie po odpowiedzi 5xx mogłoby zrobić to drugi raz.
+    """
+    with _session_lock:
+        session = _sessions.get(retry)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Ponawiamy tylko idempotentne zapytania - strumienia z PUT/POST nie da się odtworzyć.
+            retries = Retry(
+                total=3, backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET", "HEAD"]),
+            ) if retry else 0
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=POOL_SIZE, max_retries=retries, pool_block=True)
+            session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[retry] = session
+    return session
+
+
+def adapt_chunk_size(sent, elapsed, min_size=MIN_SEGMENT_SIZE, max_size=MAX_SEGMENT_SIZE,
+                     target=TARGET_SEGMENT_SECONDS):
+    """Rozmiar następnego kawałka tak, żeby jego wysłanie trwało około target sekund."""
+    if elapsed <= 0:
+        return max_size
+    wanted = int(sent / elapsed * target)
+    return max(min_size, min(max_size, wanted - wanted % 65536))
+
+
+def read_adaptive_chunks(f, on_chunk=None, min_size=MIN_SEGMENT_SIZE, max_size=MAX_SEGMENT_SIZE,
+                         target=TARGET_SEGMENT_SECONDS, clock=time.monotonic, before_chunk=None):
+    """Czyta plik kawałkami, których rozmiar dopasowuje się do zmierzonej przepustowości wysyłania."""
+    size = min_size
+    last = clock()
+    while True:
+        if before_chunk:
+            # Miejsce na pauzę, anulowanie i limit prędkości (może blokować lub rzucić wyjątek).
+            before_chunk(size)
+        data = f.read(size)
+        if not data:
+            break
+        yield data
+        # Czas do wznowienia generatora to czas, w którym kawałek został wysłany.
+        now = clock()
+        elapsed = now - last
+        last = now
+        if on_chunk:
+            on_chunk(len(data))
+        if elapsed > 0:
+            size = adapt_chunk_size(len(data), elapsed, min_size, max_size, target)
+
+
+class TransportResponse:
+    """Minimalna odpowiedź zgodna z tym, czego workery używają z requests.Response."""
+
+    def __init__(self, status_code, content, headers):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ConnectionPool:
+    """Pula połączeń keep-alive per (schemat, host, port), współdzielona przez wątki wysyłające."""
+
+    def __init__(self, maxsize=POOL_SIZE, timeout=SOCKET_TIMEOUT):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.idle = {}
+
+    def get(self, scheme, host, port):
+        import http.client
+
+        while True:
+            with self.lock:
+                conns = self.idle.get((scheme, host, port))
+                conn = conns.pop() if conns else None
+            if conn is None:
+                break
+            if not _is_dropped(conn):
+                return conn
+            conn.close()
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def put(self, scheme, host, port, conn):
+        with self.lock:
+            conns = self.idle.setdefault((scheme, host, port), [])
+            if len(conns) < self.maxsize:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def clear(self):
+        with self.lock:
+            conns = [c for group in self.idle.values() for c in group]
+            self.idle.clear()
+        for conn in conns:
+            conn.close()
+
+
+def _is_dropped(conn):
+    # Bezczynne połączenie, na którym da się coś odczytać, zostało zamknięte przez serwer.
+    if conn.sock is None:
+        return True
+    try:
+        return bool(select.select([conn.sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
+
+
+_pool = ConnectionPool()
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(account=None):
+    """Wspólna pula albo osobna pula dla danego konta (każde konto ma własne połączenia)."""
+    if account is None:
+        return _pool
+    with _pools_lock:
+        pool = _pools.get(account)
+        if pool is None:
+            pool = _pools[account] = ConnectionPool()
+        return pool
+
+
+def uses_proxy(url):
+    """Przy ustawionym proxy (HTTP(S)_PROXY) zostajemy przy requests, który je obsługuje."""
+    import requests.utils
+
+    return bool(requests.utils.get_environ_proxies(url))
+
+
+def multipart_envelope(fields, file_field, file_name, content_type="application/octet-stream"):
+    """
+    Zwraca (nagłówek Content-Type, prefix, suffix) formularza multipart/form-data z jednym plikiem.
+
+    Zawartość pliku nie jest częścią wyniku - wysyła się ją między prefix a suffix,
+    więc zużycie pamięci nie zależy od rozmiaru pliku.
+    """
+    boundary = "----DLCFormBoundary" + uuid.uuid4().hex
+    # Jak przeglądarki i urllib3 (HTML5): cudzysłów jako %22, nowe linie też kodowane.
+    quoted = file_name.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n')
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{quoted}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n')
+    prefix = "".join(parts).encode("utf-8")
+    suffix = f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return f"multipart/form-data; boundary={boundary}", prefix, suffix
+
+
+class FileBodyStream:
+    """
+    Ciało zapytania prefix + plik + suffix jako iterowalny obiekt ze znaną długością.
+
+    Dla requests (np. przy proxy): Content-Length zamiast kodowania chunked,
+    plik czytany adaptacyjnymi kawałkami, stała ilość pamięci.
+    """
+
+    def __init__(self, path, prefix=b"", suffix=b"", before_chunk=None, on_chunk=None):
+        self.path = path
+        self.prefix = prefix
+        self.suffix = suffix
+        self.before_chunk = before_chunk
+        self.on_chunk = on_chunk
+        self.size = os.path.getsize(path)
+
+    def __len__(self):
+        return len(self.prefix) + self.size + len(self.suffix)
+
+    def __iter__(self):
+        if self.prefix:
+            yield self.prefix
+        with open(self.path, "rb") as f:
+            yield from read_adaptive_chunks(f, self.on_chunk, before_chunk=self.before_chunk)
+        if self.suffix:
+            yield self.suffix
+
+
+def _send_plain(sock, f, offset, count):
+    # Jądro kopiuje dane z pamięci podręcznej pliku prosto do gniazda.
+    sent = sock.sendfile(f, offset, count)
+    if sent != count:
+        raise ConnectionError(f"Wysłano {sent} z {count} bajtów")
+
+
+def _send_mapped(sock, view, offset, count):
+    # TLS musi szyfrować w przestrzeni użytkownika, ale bez kopiowania pliku do obiektów bytes.
+    with view[offset:offset + count] as part:
+        sock.sendall(part)
+
+
+def send_file(method, url, path, headers=None, auth=None, prefix=b"", suffix=b"",
+              before_chunk=None, on_chunk=None, pool=None, mapped=None):
+    """
+    Wysyła plik jako ciało zapytania bez kopiowania go do obiektów bytes.
+
+    Po HTTP używa socket.sendfile(), po HTTPS widoków memoryview na mmap pliku
+    (mapped=True/False wymusza jeden ze sposobów, np. w benchmarku).
+    prefix/suffix (np. nagłówki multipart) są dopisywane przed i po zawartości pliku.
+    before_chunk(rozmiar) może blokować (pauza, limit) lub rzucić wyjątek (anulowanie),
+    on_chunk(bajty) dostaje liczbę bajtów pliku faktycznie oddanych do gniazda.
+    Błędy sieci są zgłaszane jako requests.exceptions.ConnectionError, a niepoprawny adres
+    jako requests.exceptions.InvalidURL (tego nie warto ponawiać).
+    """
+    import http.client
+    from requests.utils import requote_uri
+
+    pool = pool or _pool
+    parts = urlsplit(url)
+    scheme = parts.scheme
+    host = parts.hostname
+    port = parts.port or (443 if scheme == "https" else 80)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    # Jak requests: spacje i znaki spoza ASCII kodujemy procentowo, już zakodowanych nie ruszamy.
+    target = requote_uri(target)
+
+    size = os.path.getsize(path)
+    all_headers = {"User-Agent": USER_AGENT, "Content-Length": str(len(prefix) + size + len(suffix))}
+    if auth:
+        token = base64.b64encode(f"{auth[0]}:{auth[1]}".encode("utf-8")).decode("ascii")
+        all_headers["Authorization"] = "Basic " + token
+    all_headers.update(headers or {})
+
+    conn = pool.get(scheme, host, port)
+    try:
+        with open(path, "rb") as f:
+            conn.putrequest(method, target, skip_accept_encoding=True)
+            for name, value in all_headers.items():
+                conn.putheader(name, value)
+            conn.endheaders()
+            sock = conn.sock
+            if prefix:
+                sock.sendall(prefix)
+
+            if mapped is None:
+                mapped = scheme == "https"
+            mapping = view = None
+            if mapped and size:
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                view = memoryview(mapping)
+            try:
+                offset = 0
+                chunk = MIN_SEGMENT_SIZE
+                while offset < size:
+                    if before_chunk:
+                        before_chunk(chunk)
+                    count = min(chunk, size - offset)
+                    start = time.monotonic()
+                    if view is not None:
+                        _send_mapped(sock, view, offset, count)
+                    else:
+                        _send_plain(sock, f, offset, count)
+                    offset += count
+                    if on_chunk:
+                        on_chunk(count)
+                    chunk = adapt_chunk_size(count, time.monotonic() - start)
+            finally:
+                if view is not None:
+                    view.release()
+                    mapping.close()
+
+            if suffix:
+                sock.sendall(suffix)
+
+        resp = conn.getresponse()
+        content = resp.read()
+        result = TransportResponse(resp.status, content, dict(resp.getheaders()))
+        if resp.will_close:
+            conn.close()
+        else:
+            pool.put(scheme, host, port, conn)
+        return result
+    except (OSError, http.client.HTTPException) as e:
+        conn.close()
+        if isinstance(e, (FileNotFoundError, PermissionError)):
+            raise
+        import requests
+
+        if isinstance(e, http.client.InvalidURL):
+            raise requests.exceptions.InvalidURL(str(e)) from e
+        raise requests.exceptions.ConnectionError(str(e) or type(e).__name__) from e
+    except BaseException:
+        conn.close()
+        raise
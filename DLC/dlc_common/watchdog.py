@@ -0,0 +1,125 @@
+# watchdog.py
+"""
+Strażnik pętli zdarzeń: puls QTimer w wątku GUI mierzy opóźnienie pętli, a osobny wątek,
+gdy puls nie przychodzi dłużej niż próg, pobiera stos Pythona wątku GUI (sys._current_frames)
+i zapisuje go do rotowanego logu. Stos jest zapisywany w trakcie blokady, więc zostaje w logu
+także wtedy, gdy użytkownik zamknie "zawieszony" dodatek.
+
+    app = QApplication(sys.argv)
+    apply_theme(app)
+    install_watchdog(app, os.path.join(plugin_data_dir(PLUGIN_DIR), "watchdog.log"))
+
+Blokady trafiają też do śladu (dlc_common.tracing) jako span "gui.stall" - widać je w oknie metryk.
+"""
+import logging
+import logging.handlers
+import sys
+import threading
+import time
+import traceback
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+from dlc_common.tracing import get_tracer
+
+HEARTBEAT_MS = 50
+STALL_THRESHOLD_MS = 250
+SAMPLE_INTERVAL_MS = 1000  # kolejne próbki stosu w czasie długiej blokady
+MAX_SAMPLES = 10  # próbek na jedną blokadę
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUPS = 3
+
+
+class EventLoopWatchdog(QObject):
+    """
+    Puls co interval_ms; opóźnienie to czas między tyknięciami ponad interwał. Wątek nadzorcy
+    sprawdza wiek ostatniego tyknięcia i przy blokadzie ponad threshold_ms zapisuje stos wątku GUI
+    (pierwszą próbkę od razu, kolejne co SAMPLE_INTERVAL_MS). Po odblokowaniu loguje czas blokady.
+    Obiekt tworzy się w wątku GUI.
+    """
+
+    def __init__(self, logger, interval_ms=HEARTBEAT_MS, threshold_ms=STALL_THRESHOLD_MS, parent=None):
+        super().__init__(parent)
+        self.logger = logger
+        self.interval = interval_ms / 1000
+        self.threshold = threshold_ms / 1000
+        self.gui_thread = threading.get_ident()
+        self.last_beat = time.perf_counter()
+        self.stall_samples = 0  # próbki stosu pobrane w bieżącej blokadzie
+        self.beats = 0
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.stopped = threading.Event()
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+        self.monitor = threading.Thread(target=self.watch, name="dlc-watchdog", daemon=True)
+
+    def start(self):
+        self.last_beat = time.perf_counter()
+        self.timer.start(int(self.interval * 1000))
+        self.monitor.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.stopped.set()
+        self.logger.info("Puls: %d tyknięć, blokad ponad %d ms: %d, największe opóźnienie %.0f ms",
+                         self.beats, self.threshold * 1000, self.stalls, self.max_lag * 1000)
+
+    def beat(self):
+        now = time.perf_counter()
+        lag = now - self.last_beat - self.interval
+        self.beats += 1
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.threshold:
+            self.stalls += 1
+            start_ns = int((self.last_beat + self.interval) * 1e9)
+            get_tracer().record("gui.stall", "gui", start_ns, int(lag * 1e9), {"samples": self.stall_samples})
+            self.logger.warning("Pętla zdarzeń była zablokowana przez %.0f ms (próbek stosu: %d)",
+                                lag * 1000, self.stall_samples)
+        self.stall_samples = 0
+        self.last_beat = now
+
+    def watch(self):
+        # Wątek nadzorcy czyta tylko last_beat i stall_samples; przy wyścigu z beat() najwyżej
+        # pobierze jedną próbkę za dużo.
+        next_sample = self.threshold
+        while not self.stopped.wait(min(self.threshold, SAMPLE_INTERVAL_MS / 1000) / 4):
+            stalled = time.perf_counter() - self.last_beat - self.interval
+            if stalled < self.threshold:
+                next_sample = self.threshold
+                continue
+            if stalled >= next_sample and self.stall_samples < MAX_SAMPLES:
+                self.stall_samples += 1
+                self.sample(stalled)
+                next_sample = stalled + SAMPLE_INTERVAL_MS / 1000
+
+    def sample(self, stalled):
+        frame = sys._current_frames().get(self.gui_thread)
+        stack = "".join(traceback.format_stack(frame)) if frame else "(brak ramki wątku GUI)\n"
+        self.logger.warning("Blokada pętli zdarzeń od %.0f ms, stos wątku GUI (próbka %d):\n%s",
+                            stalled * 1000, self.stall_samples, stack.rstrip())
+
+
+def install_watchdog(app, log_path, interval_ms=HEARTBEAT_MS, threshold_ms=STALL_THRESHOLD_MS):
+    """
+    Uruchamia strażnika dla aplikacji (wołać w wątku GUI, po utworzeniu QApplication) z logiem
+    rotowanym w log_path. Zwraca strażnika albo None, gdy logu nie da się otworzyć.
+    """
+    logger = logging.getLogger("dlc.watchdog")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    try:
+        handler = logging.handlers.RotatingFileHandler(
+            log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8")
+    except OSError as e:
+        print(f"Nie udało się otworzyć logu strażnika pętli zdarzeń: {e}")
+        return None
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(process)d] %(levelname)s %(message)s"))
+    logger.addHandler(handler)
+
+    watchdog = EventLoopWatchdog(logger, interval_ms, threshold_ms, parent=app)
+    app.aboutToQuit.connect(watchdog.stop)
+    watchdog.start()
+    return watchdog
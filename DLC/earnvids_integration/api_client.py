@@ -0,0 +1,182 @@
+# api_client.py
+import os
+import threading
+import time
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from dlc_common.transport import get_session
+
+# Adres API można podmienić (np. na lokalny serwer testowy) zmienną EARNVIDS_API_URL.
+API_URL = os.environ.get("EARNVIDS_API_URL", "https://earnvidsapi.com/api").rstrip("/")
+INFO_URL = API_URL + "/account/info"
+SERVER_URL = API_URL + "/upload/server"
+FOLDERS_URL = API_URL + "/folder/list"
+FILES_URL = API_URL + "/file/list"
+FOLDER_CREATE_URL = API_URL + "/folder/create"
+API_TIMEOUT = (5, 30)  # (połączenie, odczyt) w sekundach
+
+# Jak długo (s) odpowiedź danego endpointu jest aktualna.
+DEFAULT_TTL = {
+    INFO_URL: 30,
+    SERVER_URL: 600,
+    FOLDERS_URL: 120,
+    FILES_URL: 30,
+}
+
+
+class _Pending:
+    """Trwające pobranie: wynik (albo wyjątek) trafia do wszystkich wątków, które na nie czekały."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.data = None
+        self.error = None
+
+
+class _CallSignals(QObject):
+    finished = pyqtSignal(dict)
+
+
+class _FetchTask(QRunnable):
+    def __init__(self, client, url, params, max_age):
+        super().__init__()
+        self.client = client
+        self.url = url
+        self.params = params
+        self.max_age = max_age
+        self.signals = _CallSignals()
+
+    def run(self):
+        try:
+            result = {"data": self.client.fetch(self.url, self.params, self.max_age)}
+        except Exception as e:
+            result = {"error": str(e)}
+        self.signals.finished.emit(result)
+
+
+class ApiClient(QObject):
+    """
+    Klient endpointów earnvidsapi.com: wspólna sesja HTTP dodatków (dlc_common), cache odpowiedzi z TTL per endpoint
+    i łączenie identycznych zapytań w locie (drugie kliknięcie czeka na pierwsze zapytanie).
+
+    fetch() jest blokujące i bezpieczne wątkowo (dla workerów), request() jest asynchroniczne
+    i woła callback w wątku GUI z {"data": ...} albo {"error": ...}.
+    """
+
+    def __init__(self, ttl=None, clock=time.monotonic, parent=None):
+        super().__init__(parent)
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.cache = {}  # klucz -> (dane, czas pobrania)
+        self.inflight = {}  # klucz -> _Pending trwającego pobrania
+        self.calls = {}  # klucz -> lista callbacków czekających na zapytanie asynchroniczne
+        self.pool = QThreadPool(self)
+
+    @property
+    def session(self):
+        # Sesja (i import requests) dopiero przy pierwszym zapytaniu, już poza startem okna.
+        return get_session()
+
+    @staticmethod
+    def _key(url, params):
+        return url, tuple(sorted((k, str(v)) for k, v in params.items() if v is not None))
+
+    def _fresh(self, key, max_age):
+        entry = self.cache.get(key)
+        if entry and self.clock() - entry[1] < max_age:
+            return entry[0]
+        return None
+
+    def _max_age(self, url, max_age):
+        return self.ttl.get(url, 0) if max_age is None else max_age
+
+    def cached(self, url, params, max_age=None):
+        with self.lock:
+            return self._fresh(self._key(url, params), self._max_age(url, max_age))
+
+    def fetch(self, url, params, max_age=None):
+        """
+        Zwraca JSON odpowiedzi, z cache jeśli jest świeży; równoległe wywołania robią jedno zapytanie
+        i dostają jego wynik - także odpowiedź z błędem albo wyjątek. Nowe zapytanie wysyła dopiero
+        wywołanie, które przyszło po jego zakończeniu.
+        """
+        key = self._key(url, params)
+        max_age = self._max_age(url, max_age)
+        with self.lock:
+            data = self._fresh(key, max_age)
+            if data is not None:
+                return data
+            pending = self.inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self.inflight[key] = _Pending()
+        if not owner:
+            # Odpowiedź sprzed chwili jest dobra nawet przy max_age=0 (np. wymuszone odświeżenie).
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.data
+        try:
+            r = self.session.get(url, params=params, timeout=API_TIMEOUT)
+            data = pending.data = r.json()
+            if data.get("status") == 200:
+                with self.lock:
+                    self.cache[key] = (data, self.clock())
+            return data
+        except Exception as e:
+            pending.error = e
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+            pending.event.set()
+
+    def request(self, url, params, callback, max_age=None):
+        """Asynchroniczne fetch(); identyczne zapytania w locie dostają wspólną odpowiedź."""
+        key = self._key(url, params)
+        data = self.cached(url, params, max_age)
+        if data is not None:
+            QTimer.singleShot(0, lambda: callback({"data": data, "cached": True}))
+            return
+        waiting = self.calls.get(key)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+        self.calls[key] = [callback]
+        task = _FetchTask(self, url, params, max_age)
+        task.signals.finished.connect(lambda result, k=key: self._deliver(k, result))
+        self.pool.start(task)
+
+    def _deliver(self, key, result):
+        for callback in self.calls.pop(key, []):
+            callback(result)
+
+    def prefetch(self, url, params, margin=0):
+        """Pobiera odpowiedź w tle, jeśli jej nie ma albo wygaśnie w ciągu margin sekund."""
+        key = self._key(url, params)
+        with self.lock:
+            if key in self.inflight or self._fresh(key, self._max_age(url, None) - margin) is not None:
+                return
+        # Zwykły wątek, bo prefetch bywa wołany z workerów wysyłania (bez pętli zdarzeń Qt).
+        threading.Thread(target=self._prefetch, args=(url, params, margin), daemon=True).start()
+
+    def _prefetch(self, url, params, margin):
+        try:
+            self.fetch(url, params, max(0, self._max_age(url, None) - margin))
+        except Exception as e:
+            print(f"Nie udało się pobrać {url}: {e}")
+
+    def call(self, url, params):
+        """Zapytanie zmieniające stan konta (np. tworzenie folderu) - bez cache, łączenia i ponawiania."""
+        r = get_session(retry=False).get(url, params=params, timeout=API_TIMEOUT)
+        return r.json()
+
+    def invalidate(self, url, params=None):
+        """Usuwa z cache odpowiedzi endpointu (wszystkie albo tylko dla podanych parametrów)."""
+        with self.lock:
+            if params is not None:
+                self.cache.pop(self._key(url, params), None)
+            else:
+                for key in [k for k in self.cache if k[0] == url]:
+                    del self.cache[key]
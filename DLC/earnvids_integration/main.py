@@ -1,113 +1,360 @@
-import sys, requests, webbrowser, os, time, json, argparse, base64
+import sys, webbrowser, os, time, threading
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QTextEdit, QMessageBox, QFileDialog, QComboBox,
-    QListWidget, QListWidgetItem, QProgressBar, QSplitter, QStyleFactory
+    QPushButton, QTextEdit, QMessageBox, QFileDialog, QSplitter, QCheckBox,
+    QSpinBox, QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView,
+    QTreeWidget, QTreeWidgetItem, QListView
 )
-from PyQt6.QtCore import Qt, QRunnable, QThreadPool, pyqtSignal, QObject
-
-INFO_URL = "https://earnvidsapi.com/api/account/info"
-SERVER_URL = "https://earnvidsapi.com/api/upload/server"
-FOLDERS_URL = "https://earnvidsapi.com/api/folder/list"
-FILES_URL = "https://earnvidsapi.com/api/file/list"
-CONFIG_FILE = "config.json"
-
-def apply_theme(app):
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QAbstractListModel, QModelIndex
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # katalog DLC z dlc_common
+from dlc_common.theme import apply_theme
+from dlc_common.config import load_config, save_config, plugin_data_dir
+from dlc_common.progress import ProgressThrottle, format_size
+from dlc_common.transport import get_session, send_file, multipart_envelope, uses_proxy, FileBodyStream
+from dlc_common.scheduler import TransferWorker, UploadScheduler, DEFAULT_MAX_PARALLEL
+from dlc_common.transfer_list import TransferItem, TransferListView
+from dlc_common.dedup import DedupIndex
+from dlc_common.manifest import load_manifest
+from dlc_common.tracing import span, traced
+from api_client import ApiClient, INFO_URL, SERVER_URL, FOLDERS_URL, FILES_URL, FOLDER_CREATE_URL
+
+# Pliki danych obok dodatku, nie w katalogu roboczym - w gospodarzu dodatków (host.py) jest on wspólny.
+# DLC_DATA_DIR przenosi je gdzie indziej (benchmarki), zob. dlc_common.config.plugin_data_dir.
+PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = plugin_data_dir(PLUGIN_DIR)
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+DEDUP_FILE = os.path.join(DATA_DIR, "dedup_index.db")
+# Górna granica "Równolegle" - deklarowana w plugin.json, żeby gospodarz znał ją bez uruchamiania dodatku.
+MAX_PARALLEL = load_manifest(PLUGIN_DIR)["capabilities"]["max_concurrency"]
+DEDUP_SERVICE = "earnvids"
+FILE_LINK_URL = "https://vidhideplus.com/file/{}"
+EMBED_LINK_URL = "https://vidhideplus.com/embed/{}"
+SERVER_URL_REFRESH = 60  # s przed wygaśnięciem adres serwera upload jest odświeżany w tle
+UPLOAD_ACTIONS = [("cancel", "✖ Anuluj"), ("retry", "🔁 Ponów"),
+                  ("open", "🔗 Otwórz link"), ("embed", "📎 Kopiuj embed")]
+FILES_PER_PAGE = 100
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv")
+MIRROR_WORKERS = 4  # ile katalogów jest przetwarzanych (i folderów tworzonych) naraz
+
+class UploadServerCache:
     """
-    Parsuje argumenty wiersza poleceń i aplikuje motyw przekazany z aplikacji głównej.
+    Adresy serwerów upload (per klucz API) współdzielone przez workery - odpowiedzi SERVER_URL
+    z cache klienta API. Równoczesne zapytania czekają na jedno pobranie, a adres, który
+    zawiódł przy wysyłaniu, jest unieważniany i pobierany ponownie.
     """
-    parser = argparse.ArgumentParser(description="Uruchomienie dodatku DLC z motywem.")
-    parser.add_argument('--style-name', type=str, help='Nazwa stylu Qt do zastosowania.')
-    parser.add_argument('--stylesheet-b64', type=str, help='Arkusz stylów QSS zakodowany w Base64.')
-    args, _ = parser.parse_known_args()
+    def __init__(self, client, refresh=SERVER_URL_REFRESH):
+        self.client = client
+        self.refresh = refresh
 
-    if args.style_name:
-        QApplication.setStyle(QStyleFactory.create(args.style_name))
+    def get(self, key):
+        return self.client.fetch(SERVER_URL, {"key": key}).get("result")
 
-    if args.stylesheet_b64:
-        try:
-            decoded_bytes = base64.b64decode(args.stylesheet_b64)
-            stylesheet = decoded_bytes.decode('utf-8')
-            app.setStyleSheet(stylesheet)
-        except Exception as e:
-            print(f"Nie udało się zastosować motywu: {e}")
+    def prefetch(self, key):
+        """Odświeża adres w tle, jeśli go nie ma albo zaraz wygaśnie - np. w czasie trwającego transferu."""
+        self.client.prefetch(SERVER_URL, {"key": key}, margin=self.refresh)
 
-class WorkerSignals(QObject):
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(dict)
+    def invalidate(self, key, url):
+        if self.get_cached(key) == url:
+            self.client.invalidate(SERVER_URL, {"key": key})
 
-class UploadWorker(QRunnable):
-    def __init__(self, key, fld_id, file_path):
-        super().__init__()
+    def get_cached(self, key):
+        data = self.client.cached(SERVER_URL, {"key": key})
+        return data.get("result") if data else None
+
+class UploadWorker(TransferWorker):
+    trace_name = "earnvids.upload"
+
+    def __init__(self, key, fld_id, file_path, dedup=None, servers=None):
+        super().__init__(file_path, group=key)
         self.key = key
         self.fld_id = fld_id
-        self.file_path = file_path
-        self.signals = WorkerSignals()
-
-    def run(self):
-        try:
-            r = requests.get(SERVER_URL, params={"key": self.key})
-            upload_url = r.json().get("result")
+        self.dedup = dedup
+        self.servers = servers or UploadServerCache(ApiClient())
+
+    def _upload(self, upload_url):
+        # Multipart składany strumieniowo: plik idzie prosto z dysku do gniazda, a postęp
+        # liczy bajty faktycznie oddane do wysłania (99% do czasu odpowiedzi serwera).
+        fields = {'key': self.key}
+        if self.fld_id is not None:
+            fields['fld_id'] = self.fld_id
+        content_type, prefix, suffix = multipart_envelope(fields, 'file', os.path.basename(self.file_path))
+        size = os.path.getsize(self.file_path)
+        throttle = ProgressThrottle(lambda p: self.signals.progress.emit(min(p, 99)), size)
+        headers = {'Content-Type': content_type}
+        with span("earnvids.post", "network", bytes=size):
+            if uses_proxy(upload_url):
+                body = FileBodyStream(self.file_path, prefix, suffix, before_chunk=self._before_chunk, on_chunk=throttle.add)
+                resp = get_session().post(upload_url, data=body, headers=headers)
+            else:
+                resp = send_file('POST', upload_url, self.file_path, headers=headers, prefix=prefix, suffix=suffix,
+                                 before_chunk=self._before_chunk, on_chunk=throttle.add)
+        return resp
+
+    def transfer(self):
+        import requests
+
+        digest = None
+        if self.dedup:
+            # Ta sama zawartość jest już na koncie - zwracamy istniejący filecode bez wysyłania.
+            digest, known = self.find_duplicate(self.dedup, DEDUP_SERVICE, self.key)
+            if known:
+                self.signals.progress.emit(100)
+                return {"status": 200, "files": [{"filecode": known["remote_id"]}], "dedup": True}
+
+        # Adres serwera jest współdzielony przez workery. Gdy serwer upload jest nieosiągalny albo odpowiada
+        # błędem 5xx, pobieramy nowy i próbujemy raz jeszcze; odrzucenie przez API (zły klucz, folder,
+        # limit) zwracamy od razu - serwer dostał już cały plik, ponowne wysłanie nic nie zmieni.
+        for attempt in range(2):
+            with span("earnvids.server", "network"):
+                upload_url = self.servers.get(self.key)
             if not upload_url:
-                self.signals.finished.emit({"error": "Brak serwera upload."})
-                return
+                return {"error": "Brak serwera upload."}
+            # Następny plik dostanie świeży adres pobrany w trakcie tego transferu.
+            self.servers.prefetch(self.key)
+            try:
+                resp = self._upload(upload_url)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if self.cancelled:
+                    raise
+                result, retry = {"error": str(e)}, True
+            else:
+                retry = resp.status_code >= 500
+                try:
+                    result = resp.json()
+                except ValueError:
+                    result = None
+                if retry or not isinstance(result, dict):
+                    result = {"error": f"Niepoprawna odpowiedź serwera upload (HTTP {resp.status_code})"}
+            if not retry or attempt:
+                break
+            self.servers.invalidate(self.key, upload_url)
+            self.signals.progress.emit(0)
+
+        uploaded = result.get("files") or [{}]
+        file_code = uploaded[0].get("filecode")
+        if digest and result.get("status") == 200 and file_code:
+            links = {"link": FILE_LINK_URL.format(file_code), "embed": EMBED_LINK_URL.format(file_code)}
+            self.record_upload(self.dedup, DEDUP_SERVICE, self.key, digest, file_code, links)
 
-            with open(self.file_path, 'rb') as f:
-                files = {'file': f}
-                data = {'key': self.key, 'fld_id': self.fld_id}
+        if result.get("status") == 200:
+            self.signals.progress.emit(100)
+        return result
 
-                # symulacja progresu przed uploadem
-                timer = 0
-                while timer < 80:
-                    time.sleep(0.05)
-                    timer += 2
-                    self.signals.progress.emit(timer)
+class MirrorSignals(QObject):
+    file_ready = pyqtSignal(str, str)  # ścieżka lokalna, fld_id docelowego folderu
+    folder_created = pyqtSignal(str)
+    error = pyqtSignal(str)
+    finished = pyqtSignal(dict)
 
-                resp = requests.post(upload_url, files=files, data=data)
-                result = resp.json()
+class FolderMirror:
+    """
+    Odwzorowuje drzewo katalogów lokalnych na foldery EarnVids, tworząc brakujące.
 
-            self.signals.progress.emit(100)
-            self.signals.finished.emit(result)
+    Każdy katalog jest osobnym zadaniem w puli wątków: po ustaleniu jego folderu
+    od razu zgłasza swoje pliki (file_ready), które mogą się już wysyłać, a podkatalogi
+    trafiają do puli jako kolejne zadania - przeglądanie, tworzenie folderów i wysyłanie
+    nakładają się na siebie zamiast iść kolejnymi fazami.
+    """
+    def __init__(self, client, key, local_root, remote_parent, workers=MIRROR_WORKERS, parent=None):
+        self.client = client
+        self.key = key
+        self.local_root = local_root
+        self.remote_parent = remote_parent
+        self.workers = workers
+        # Sygnały żyją tyle co okno, więc po jego usunięciu nie trafią do podłączonych lambd.
+        self.signals = MirrorSignals(parent)
+        self.cancelled = False
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.stats = {"folders": 0, "created": 0, "files": 0, "errors": 0}
+
+    def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._submit(self.local_root, self.remote_parent)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _submit(self, path, parent_id):
+        with self.lock:
+            self.pending += 1
+        self.executor.submit(self._process, path, parent_id)
+
+    def _done(self):
+        with self.lock:
+            self.pending -= 1
+            last = self.pending == 0
+        if last:
+            self.executor.shutdown(wait=False)
+            self.signals.finished.emit(dict(self.stats, cancelled=self.cancelled))
+
+    def ensure_folder(self, parent_id, name):
+        """fld_id podfolderu name w parent_id; tworzy go, jeśli nie istnieje."""
+        fld_id = self.find_folder(parent_id, name)
+        if fld_id:
+            return fld_id
+        try:
+            data = self.client.call(FOLDER_CREATE_URL, {"key": self.key, "parent_id": parent_id, "name": name})
+        except Exception as e:
+            data = {"error": str(e)}
+        fld_id = (data.get("result") or {}).get("fld_id") if data.get("status") == 200 else None
+        self.client.invalidate(FOLDERS_URL, {"key": self.key, "fld_id": parent_id})
+        if not fld_id:
+            # Serwer mógł utworzyć folder mimo błędu (np. 5xx po zapisie) - sprawdzamy, zanim zgłosimy błąd.
+            fld_id = self.find_folder(parent_id, name)
+            if not fld_id:
+                raise RuntimeError(f"Nie można utworzyć folderu {name}: {data}")
+        with self.lock:
+            self.stats["created"] += 1
+        self.signals.folder_created.emit(name)
+        return str(fld_id)
+
+    def find_folder(self, parent_id, name):
+        """fld_id podfolderu name w parent_id albo None."""
+        # Świeża lista (max_age=0), żeby nieaktualny cache nie skończył się duplikatem folderu.
+        data = self.client.fetch(FOLDERS_URL, {"key": self.key, "fld_id": parent_id}, max_age=0)
+        if data.get("status") != 200:
+            raise RuntimeError(f"Nie można pobrać folderów: {data}")
+        for f in data["result"].get("folders", []):
+            if f.get("name") == name:
+                return str(f["fld_id"])
+        return None
+
+    def _process(self, path, parent_id):
+        try:
+            if self.cancelled:
+                return
+            fld_id = self.ensure_folder(parent_id, os.path.basename(os.path.normpath(path)))
+            with self.lock:
+                self.stats["folders"] += 1
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name.lower())
+            for entry in entries:
+                if self.cancelled:
+                    return
+                if entry.is_dir(follow_symlinks=False):
+                    self._submit(entry.path, fld_id)
+                elif entry.is_file() and entry.name.lower().endswith(VIDEO_EXTENSIONS):
+                    with self.lock:
+                        self.stats["files"] += 1
+                    self.signals.file_ready.emit(entry.path, fld_id)
         except Exception as e:
-            self.signals.finished.emit({"error": str(e)})
+            with self.lock:
+                self.stats["errors"] += 1
+            self.signals.error.emit(f"{path}: {e}")
+        finally:
+            self._done()
 
-class FileUploadWidget(QWidget):
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
-        self.link = ""
-        self.embed = ""
-        self.setup_ui()
+class RemoteFileListModel(QAbstractListModel):
+    """
+    Pliki folderu ładowane stronami, gdy widok dojdzie do końca listy (canFetchMore/fetchMore).
 
-    def setup_ui(self):
-        layout = QVBoxLayout()
-        layout.setContentsMargins(5,5,5,5)
-
-        self.title_label = QLabel(f"⏳ {self.file_path.split('/')[-1]}")
-        self.progress = QProgressBar()
-        self.progress.setValue(0)
-        layout.addWidget(self.title_label)
-        layout.addWidget(self.progress)
-
-        hl = QHBoxLayout()
-        self.link_btn = QPushButton("🔗 Otwórz link")
-        self.link_btn.setEnabled(False)
-        self.link_btn.clicked.connect(self.open_link)
-        self.embed_btn = QPushButton("📎 Kopiuj embed")
-        self.embed_btn.setEnabled(False)
-        self.embed_btn.clicked.connect(self.copy_embed)
-        hl.addWidget(self.link_btn)
-        hl.addWidget(self.embed_btn)
-        layout.addLayout(hl)
-        self.setLayout(layout)
-
-    def open_link(self):
-        if self.link:
-            webbrowser.open(self.link)
-
-    def copy_embed(self):
-        if self.embed:
-            QApplication.clipboard().setText(self.embed)
+    Po dołączeniu strony następna jest od razu pobierana w tle, więc przewijanie zwykle
+    nie czeka na sieć.
+    """
+    FileRole = Qt.ItemDataRole.UserRole + 1
+    status_changed = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, request_page, per_page=FILES_PER_PAGE, parent=None):
+        super().__init__(parent)
+        self.request_page = request_page  # request_page(fld_id, strona, per_page, callback)
+        self.per_page = per_page
+        self.fld_id = None
+        self.generation = 0
+        self._clear()
+
+    def _clear(self):
+        self.files = []
+        self.next_page = 1
+        self.last_page = None
+        self.total = None
+        self.prefetched = {}
+        self.loading = set()
+        self.wanted = False
+
+    def reset(self, fld_id):
+        self.beginResetModel()
+        self.generation += 1
+        self.fld_id = fld_id
+        self._clear()
+        self.endResetModel()
+        self.wanted = True
+        self._request(1)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.files)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        f = self.files[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"📄 {f.get('title') or '(brak nazwy)'}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return FILE_LINK_URL.format(f.get("file_code"))
+        if role == self.FileRole:
+            return f
+        return None
+
+    def _has_more(self):
+        return self.fld_id is not None and (self.last_page is None or self.next_page <= self.last_page)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._has_more():
+            return
+        if self.next_page in self.prefetched:
+            self._append(self.prefetched.pop(self.next_page))
+        else:
+            self.wanted = True
+            self._request(self.next_page)
+
+    def _request(self, page):
+        if page in self.loading or page in self.prefetched:
+            return
+        self.loading.add(page)
+        generation = self.generation
+        self.request_page(self.fld_id, page, self.per_page,
+                          lambda result, g=generation, p=page: self._on_page(g, p, result))
+
+    def _on_page(self, generation, page, result):
+        if generation != self.generation:
+            return  # odpowiedź dla folderu, który nie jest już wyświetlany
+        self.loading.discard(page)
+        data = result.get("data") or {}
+        if "error" in result or data.get("status") != 200:
+            self.error.emit(result.get("error") or str(data))
+            return
+        res = data.get("result") or {}
+        files = res.get("files", [])
+        if res.get("pages"):
+            self.last_page = int(res["pages"])
+        elif len(files) < self.per_page:
+            self.last_page = page
+        if res.get("results_total") is not None:
+            self.total = int(res["results_total"])
+        self.prefetched[page] = files
+        if page == self.next_page and self.wanted:
+            self.wanted = False
+            self._append(self.prefetched.pop(page))
+
+    def _append(self, files):
+        if files:
+            first = len(self.files)
+            self.beginInsertRows(QModelIndex(), first, first + len(files) - 1)
+            self.files.extend(files)
+            self.endInsertRows()
+        self.next_page += 1
+        total = self.total if self.total is not None else "?"
+        self.status_changed.emit(f"Plików: {len(self.files)} z {total}" if self.files else "📂 Ten folder jest pusty.")
+        if self._has_more():
+            # Następna strona w tle, zanim użytkownik do niej przewinie.
+            self._request(self.next_page)
 
 class EarnVidsApp(QWidget):
     def __init__(self):
@@ -115,27 +362,34 @@ class EarnVidsApp(QWidget):
         self.setWindowTitle("EarnVids API Panel v1.0")
         self.setGeometry(150, 150, 950, 750)
         self.selected_files = []
-        self.folders = []
-        self.threadpool = QThreadPool()
-        self.upload_widgets = []
+        self.client = ApiClient(parent=self)
+        self.upload_queue = UploadScheduler(parent=self)
+        self.batch = []  # transfery bieżącej partii (do podsumowania)
+        self.mirror = None
+        self.servers = UploadServerCache(self.client)
+        try:
+            self.dedup = DedupIndex(DEDUP_FILE)
+        except Exception as e:
+            print(f"Nie udało się otworzyć indeksu duplikatów: {e}")
+            self.dedup = None
+        self.metrics_dialog = None
         self.setup_ui()
         self.load_api_key()
 
     def load_api_key(self):
-        if os.path.exists(CONFIG_FILE):
-            try:
-                with open(CONFIG_FILE, "r") as f:
-                    data = json.load(f)
-                    api_key = data.get("api_key", "")
-                    self.api_key_input.setText(api_key)
-            except:
-                pass
+        data = load_config(CONFIG_FILE)
+        self.api_key_input.setText(data.get("api_key", ""))
+        self.dedup_check.setChecked(data.get("dedup", True))
+        self.parallel_spin.setValue(data.get("max_parallel", DEFAULT_MAX_PARALLEL))
 
     def save_api_key(self):
         key = self.api_key_input.text().strip()
         try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump({"api_key": key}, f)
+            save_config(CONFIG_FILE, {
+                "api_key": key,
+                "dedup": self.dedup_check.isChecked(),
+                "max_parallel": self.parallel_spin.value(),
+            })
         except Exception as e:
             self.output.append(f"⚠️ Nie udało się zapisać API key: {e}")
 
@@ -162,7 +416,11 @@ class EarnVidsApp(QWidget):
         self.info_btn = QPushButton("Pobierz info o koncie")
         self.info_btn.clicked.connect(self.get_account_info)
 
-        self.folder_combo = QComboBox()
+        # Drzewo folderów - podfoldery są pobierane dopiero przy rozwinięciu gałęzi.
+        self.folder_tree = QTreeWidget()
+        self.folder_tree.setHeaderHidden(True)
+        self.folder_tree.itemExpanded.connect(self.load_subfolders)
+        self.folder_tree.itemDoubleClicked.connect(lambda *_: self.show_files_in_folder())
         self.load_folders_btn = QPushButton("Załaduj foldery")
         self.load_folders_btn.clicked.connect(self.load_folders)
         self.show_files_btn = QPushButton("Pokaż pliki w folderze")
@@ -170,8 +428,22 @@ class EarnVidsApp(QWidget):
 
         self.choose_btn = QPushButton("Wybierz pliki…")
         self.choose_btn.clicked.connect(self.choose_files)
+        self.upload_dir_btn = QPushButton("Wyślij folder…")
+        self.upload_dir_btn.setToolTip("Wysyła katalog z podkatalogami, odtwarzając jego strukturę w folderach EarnVids.")
+        self.upload_dir_btn.clicked.connect(self.upload_directory)
         self.upload_btn = QPushButton("Wyślij pliki")
         self.upload_btn.clicked.connect(self.upload_files)
+        self.dedup_check = QCheckBox("Nie wysyłaj ponownie identycznych plików")
+        self.dedup_check.setChecked(True)
+        self.dedup_check.setToolTip("Porównuje zawartość pliku (BLAKE2b) z plikami już wysłanymi na to konto.")
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, MAX_PARALLEL)
+        self.parallel_spin.setValue(DEFAULT_MAX_PARALLEL)
+        self.parallel_spin.valueChanged.connect(self.upload_queue.set_max_parallel)
+        hl_parallel = QHBoxLayout()
+        hl_parallel.addWidget(QLabel("Równolegle:"))
+        hl_parallel.addWidget(self.parallel_spin)
+        hl_parallel.addStretch()
 
         left_panel = QVBoxLayout()
         left_panel.addWidget(QLabel("API Key:"))
@@ -180,16 +452,22 @@ class EarnVidsApp(QWidget):
         left_panel.addSpacing(20)
         left_panel.addWidget(QLabel("Foldery:"))
         hl_folders = QHBoxLayout()
-        hl_folders.addWidget(self.folder_combo)
         hl_folders.addWidget(self.load_folders_btn)
+        hl_folders.addWidget(self.show_files_btn)
         left_panel.addLayout(hl_folders)
-        left_panel.addWidget(self.show_files_btn)
+        left_panel.addWidget(self.folder_tree, 1)
         left_panel.addSpacing(20)
         left_panel.addWidget(QLabel("Upload:"))
         hl_upload = QHBoxLayout()
         hl_upload.addWidget(self.choose_btn)
         hl_upload.addWidget(self.upload_btn)
         left_panel.addLayout(hl_upload)
+        left_panel.addWidget(self.upload_dir_btn)
+        left_panel.addWidget(self.dedup_check)
+        left_panel.addLayout(hl_parallel)
+        metrics_btn = QPushButton("Metryki transferów…")
+        metrics_btn.clicked.connect(self.show_metrics)
+        left_panel.addWidget(metrics_btn)
         left_panel.addStretch()
 
 
@@ -203,17 +481,68 @@ class EarnVidsApp(QWidget):
         log_layout.addWidget(self.output)
         log_widget.setLayout(log_layout)
 
+        # Pliki w folderze i wysyłane pliki mają osobne listy, żeby przeglądanie folderu
+        # nie niszczyło widżetów trwających transferów.
+        files_widget = QWidget()
+        files_layout = QVBoxLayout()
+        files_layout.setContentsMargins(0,0,0,0)
+        self.files_status = QLabel("Wybierz folder i kliknij 'Pokaż pliki w folderze'.")
+        self.file_model = RemoteFileListModel(self.request_file_page, parent=self)
+        self.file_model.status_changed.connect(self.files_status.setText)
+        self.file_model.error.connect(lambda err: self.output.append(f"Błąd: {err}"))
+        self.file_view = QListView()
+        self.file_view.setModel(self.file_model)
+        self.file_view.setUniformItemSizes(True)
+        self.file_view.doubleClicked.connect(self.open_selected_file)
+        self.open_file_btn = QPushButton("🔗 Otwórz link")
+        self.open_file_btn.clicked.connect(self.open_selected_file)
+        self.copy_embed_btn = QPushButton("📎 Kopiuj embed")
+        self.copy_embed_btn.clicked.connect(self.copy_selected_embed)
+        hl_file_actions = QHBoxLayout()
+        hl_file_actions.addWidget(self.files_status, 1)
+        hl_file_actions.addWidget(self.open_file_btn)
+        hl_file_actions.addWidget(self.copy_embed_btn)
+        files_layout.addLayout(hl_file_actions)
+        files_layout.addWidget(self.file_view)
+        files_widget.setLayout(files_layout)
+
         upload_widget = QWidget()
         upload_layout = QVBoxLayout()
         upload_layout.setContentsMargins(0,0,0,0)
-        upload_layout.addWidget(QLabel("Upload plików:"))
-        self.file_list = QListWidget()
-        upload_layout.addWidget(self.file_list)
+        self.upload_list = TransferListView()
+        self.upload_list.action_triggered.connect(self.on_upload_action)
+        self.cancel_all_btn = QPushButton("⛔ Anuluj wszystkie")
+        self.cancel_all_btn.clicked.connect(self.cancel_all_uploads)
+        self.clear_done_btn = QPushButton("🧹 Wyczyść zakończone")
+        self.clear_done_btn.clicked.connect(self.clear_finished_uploads)
+        hl_queue = QHBoxLayout()
+        hl_queue.addWidget(self.cancel_all_btn)
+        hl_queue.addWidget(self.clear_done_btn)
+        hl_queue.addStretch()
+        upload_layout.addLayout(hl_queue)
+        upload_layout.addWidget(self.upload_list)
         upload_widget.setLayout(upload_layout)
 
+        summary_widget = QWidget()
+        summary_layout = QVBoxLayout()
+        summary_layout.setContentsMargins(0,0,0,0)
+        self.summary_label = QLabel("Brak wysłanych plików.")
+        self.summary_table = QTableWidget(0, 5)
+        self.summary_table.setHorizontalHeaderLabels(["Plik", "Rozmiar", "Status", "Czas", "Prędkość"])
+        self.summary_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.summary_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        summary_layout.addWidget(self.summary_label)
+        summary_layout.addWidget(self.summary_table)
+        summary_widget.setLayout(summary_layout)
+
+        self.list_tabs = QTabWidget()
+        self.list_tabs.addTab(files_widget, "Pliki w folderze")
+        self.list_tabs.addTab(upload_widget, "Wysyłanie")
+        self.list_tabs.addTab(summary_widget, "Podsumowanie")
+
         splitter = QSplitter(Qt.Orientation.Vertical)
         splitter.addWidget(log_widget)
-        splitter.addWidget(upload_widget)
+        splitter.addWidget(self.list_tabs)
         splitter.setSizes([200, 500])
 
         right_panel = QVBoxLayout()
@@ -231,141 +560,347 @@ class EarnVidsApp(QWidget):
             QMessageBox.warning(self, "Błąd", "Podaj API key!")
             return
         self.save_api_key()
-        try:
-            r = requests.get(INFO_URL, params={"key": key})
-            data = r.json()
-            if data.get("status") == 200:
-                res = data["result"]
-                self.output.setText(
-                    f"Login: {res.get('login')}\n"
-                    f"Email: {res.get('email')}\n"
-                    f"Premium do: {res.get('premium_expire')}\n"
-                    f"Saldo: {res.get('balance')}\n"
-                    f"Liczba plików: {res.get('files_total')}\n"
-                )
-            else:
-                self.output.setText(f"Błąd API: {data}")
-        except Exception as e:
-            self.output.setText(f"Błąd: {e}")
+        self.client.request(INFO_URL, {"key": key}, self.on_account_info)
+
+    def on_account_info(self, result):
+        if "error" in result:
+            self.output.setText(f"Błąd: {result['error']}")
+            return
+        data = result["data"]
+        if data.get("status") == 200:
+            res = data["result"]
+            self.output.setText(
+                f"Login: {res.get('login')}\n"
+                f"Email: {res.get('email')}\n"
+                f"Premium do: {res.get('premium_expire')}\n"
+                f"Saldo: {res.get('balance')}\n"
+                f"Liczba plików: {res.get('files_total')}\n"
+            )
+        else:
+            self.output.setText(f"Błąd API: {data}")
+
+    def current_folder_id(self):
+        item = self.folder_tree.currentItem()
+        return item.data(0, Qt.ItemDataRole.UserRole) if item else "0"
+
+    def _add_folder_item(self, parent, name, fld_id):
+        item = QTreeWidgetItem(parent, [f"📁 {name}"])
+        item.setData(0, Qt.ItemDataRole.UserRole, fld_id)
+        item.setData(0, Qt.ItemDataRole.UserRole + 1, False)  # czy podfoldery są już pobrane
+        item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        return item
 
     def load_folders(self):
         key = self.api_key_input.text().strip()
         if not key:
             QMessageBox.warning(self, "Błąd", "Podaj API key!")
             return
+        self.folder_tree.clear()
+        root = self._add_folder_item(self.folder_tree, "Brak folderu (root)", "0")
+        self.folder_tree.setCurrentItem(root)
+        root.setExpanded(True)
+
+    def load_subfolders(self, item):
+        if item.data(0, Qt.ItemDataRole.UserRole + 1):
+            return
+        key = self.api_key_input.text().strip()
+        if not key:
+            return
+        item.setData(0, Qt.ItemDataRole.UserRole + 1, True)
+        loading = QTreeWidgetItem(item, ["Ładowanie…"])
+        loading.setFlags(Qt.ItemFlag.NoItemFlags)
+        fld_id = item.data(0, Qt.ItemDataRole.UserRole)
+        self.client.request(FOLDERS_URL, {"key": key, "fld_id": fld_id},
+                            lambda res, it=item: self.on_subfolders(it, res))
+
+    def on_subfolders(self, item, result):
         try:
-            r = requests.get(FOLDERS_URL, params={"key": key, "fld_id": 0})
-            data = r.json()
-            if data.get("status") == 200:
-                self.folders = data["result"].get("folders", [])
-                self.folder_combo.clear()
-                self.folder_combo.addItem("Brak folderu (root)", "0")
-                for f in self.folders:
-                    self.folder_combo.addItem(f["name"], f["fld_id"])
-                self.output.append("📁 Foldery załadowane.")
-            else:
-                self.output.append(f"Błąd: {data}")
-        except Exception as e:
-            self.output.setText(f"Błąd: {e}")
+            item.takeChildren()
+        except RuntimeError:
+            return  # drzewo zostało w międzyczasie przeładowane
+        data = result.get("data") or {}
+        if "error" in result or data.get("status") != 200:
+            item.setData(0, Qt.ItemDataRole.UserRole + 1, False)
+            self.output.append(f"Błąd: {result.get('error') or data}")
+            return
+        folders = data["result"].get("folders", [])
+        for f in folders:
+            self._add_folder_item(item, f["name"], f["fld_id"])
+        if not folders:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicator)
+        if item.parent() is None:
+            self.output.append("📁 Foldery załadowane.")
+
+    def show_metrics(self):
+        # Okno metryk ładowane dopiero przy pierwszym użyciu, potem tylko pokazywane.
+        if self.metrics_dialog is None:
+            from dlc_common.metrics_view import MetricsDialog
+            self.metrics_dialog = MetricsDialog(self)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
 
     def show_files_in_folder(self):
         key = self.api_key_input.text().strip()
-        fld_id = self.folder_combo.currentData()
         if not key:
             QMessageBox.warning(self, "Błąd", "Podaj API key!")
             return
-        try:
-            r = requests.get(FILES_URL, params={"key": key, "fld_id": fld_id})
-            data = r.json()
-            if data.get("status") == 200:
-                files = data["result"].get("files", [])
-                self.file_list.clear()
-                if not files:
-                    self.output.append("📂 Ten folder jest pusty.")
-                    return
-                for f in files:
-                    self.add_file_to_list(f)
-                self.output.append(f"📄 Załadowano {len(files)} plików.")
-            else:
-                self.output.append(f"Błąd: {data}")
-        except Exception as e:
-            self.output.setText(f"Błąd: {e}")
-
-    def add_file_to_list(self, f):
-        file_code = f.get("file_code")
-        title = f.get("title") or "(brak nazwy)"
-        link = f"https://vidhideplus.com/file/{file_code}"
-        embed = f'https://vidhideplus.com/embed/{file_code}'
-
-        item_widget = QWidget()
-        item_layout = QVBoxLayout()
-        item_layout.setContentsMargins(5, 5, 5, 5)
-        title_label = QLabel(f"📄 {title}")
-        hl = QHBoxLayout()
-        hl.setSpacing(10)
-        link_btn = QPushButton("🔗 Otwórz link")
-        link_btn.clicked.connect(lambda _, l=link: webbrowser.open(l))
-        copy_btn = QPushButton("📎 Kopiuj embed")
-        copy_btn.clicked.connect(lambda _, e=embed: QApplication.clipboard().setText(e))
-        hl.addWidget(link_btn)
-        hl.addWidget(copy_btn)
-        item_layout.addWidget(title_label)
-        item_layout.addLayout(hl)
-        item_widget.setLayout(item_layout)
-
-        list_item = QListWidgetItem()
-        list_item.setSizeHint(item_widget.sizeHint())
-        self.file_list.addItem(list_item)
-        self.file_list.setItemWidget(list_item, item_widget)
+        self.list_tabs.setCurrentIndex(0)
+        self.files_status.setText("Ładowanie listy plików...")
+        self.file_model.reset(self.current_folder_id())
+
+    def request_file_page(self, fld_id, page, per_page, callback):
+        key = self.api_key_input.text().strip()
+        self.client.request(FILES_URL, {"key": key, "fld_id": fld_id, "page": page, "per_page": per_page}, callback)
+
+    def _selected_file(self):
+        index = self.file_view.currentIndex()
+        return index.data(RemoteFileListModel.FileRole) if index.isValid() else None
+
+    def open_selected_file(self, *_):
+        f = self._selected_file()
+        if f:
+            webbrowser.open(FILE_LINK_URL.format(f.get("file_code")))
+
+    def copy_selected_embed(self):
+        f = self._selected_file()
+        if f:
+            QApplication.clipboard().setText(EMBED_LINK_URL.format(f.get("file_code")))
 
     def choose_files(self):
         paths, _ = QFileDialog.getOpenFileNames(self, "Wybierz pliki wideo", "", "Video Files (*.mp4 *.avi *.mkv)")
         if paths:
             self.selected_files = paths
             self.output.append(f"Wybrano {len(paths)} plików.")
+            key = self.api_key_input.text().strip()
+            if key:
+                # Serwer upload pobieramy już teraz, zanim użytkownik kliknie "Wyślij".
+                self.servers.prefetch(key)
 
     def upload_files(self):
         key = self.api_key_input.text().strip()
         if not key or not self.selected_files:
             QMessageBox.warning(self, "Błąd", "Podaj API key i wybierz pliki!")
             return
-        fld_id = self.folder_combo.currentData()
-        self.file_list.clear()
-        for file_path in self.selected_files:
-            widget = FileUploadWidget(file_path)
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(widget.sizeHint())
-            self.file_list.addItem(list_item)
-            self.file_list.setItemWidget(list_item, widget)
-            self.upload_widgets.append(widget)
-
-            worker = UploadWorker(key, fld_id, file_path)
-            worker.signals.progress.connect(widget.progress.setValue)
-            worker.signals.finished.connect(lambda res, w=widget: self.upload_finished(res, w))
-            self.threadpool.start(worker)
-
-    def upload_finished(self, result, widget):
+        self.save_api_key()
+        fld_id = self.current_folder_id()
+        self.enqueue_uploads([(file_path, fld_id) for file_path in self.selected_files], key)
+
+    def upload_directory(self):
+        key = self.api_key_input.text().strip()
+        if not key:
+            QMessageBox.warning(self, "Błąd", "Podaj API key!")
+            return
+        if self.mirror:
+            QMessageBox.information(self, "Wysyłanie folderu", "Poprzedni folder jest jeszcze przeglądany.")
+            return
+        path = QFileDialog.getExistingDirectory(self, "Wybierz folder do wysłania")
+        if not path:
+            return
+        self.save_api_key()
+        self.servers.prefetch(key)
+        self.start_new_batch()
+        self.list_tabs.setCurrentIndex(1)
+        self.output.append(f"📂 Odwzorowywanie folderu {path}...")
+        mirror = FolderMirror(self.client, key, path, self.current_folder_id(), parent=self)
+        mirror.signals.file_ready.connect(lambda file_path, fld_id: self.enqueue_uploads([(file_path, fld_id)], key))
+        mirror.signals.folder_created.connect(lambda name: self.output.append(f"📁 Utworzono folder: {name}"))
+        mirror.signals.error.connect(lambda err: self.output.append(f"❌ {err}"))
+        mirror.signals.finished.connect(self.on_mirror_finished)
+        self.mirror = mirror
+        mirror.start()
+
+    def on_mirror_finished(self, stats):
+        self.mirror = None
+        self.output.append(
+            f"📂 Struktura folderów gotowa: katalogi {stats['folders']} (nowe foldery: {stats['created']}), "
+            f"pliki w kolejce: {stats['files']}" + (f", błędy: {stats['errors']}" if stats["errors"] else ""))
+        # Drzewo folderów pokaże nowe gałęzie przy następnym rozwinięciu.
+        self.client.invalidate(FOLDERS_URL)
+
+    def start_new_batch(self):
+        if not self.upload_queue.is_busy() and not self.mirror:
+            # Poprzednia partia się skończyła - czyścimy jej listę i zaczynamy nowe podsumowanie.
+            self.clear_finished_uploads()
+            self.batch = []
+            self.summary_table.setRowCount(0)
+
+    def enqueue_uploads(self, jobs, key):
+        """jobs: lista (ścieżka, fld_id folderu docelowego)."""
+        self.start_new_batch()
+        self.list_tabs.setCurrentIndex(1)
+        workers = []
+        items = []
+        for file_path, fld_id in jobs:
+            transfer = TransferItem(file_path, "⏳", UPLOAD_ACTIONS)
+            transfer.set_action("retry", visible=False)
+            transfer.set_action("open", enabled=False)
+            transfer.set_action("embed", enabled=False)
+            transfer.key = key
+            transfer.fld_id = fld_id
+            transfer.link = transfer.embed = ""
+            transfer.finished = False
+            transfer.summary_item = None
+            items.append(transfer)
+            self.batch.append(transfer)
+            self.add_summary_row(transfer)
+            workers.append(self._create_upload_worker(transfer))
+        self.upload_list.transfers.add(items)
+        self.upload_queue.add(workers)
+        self.update_summary()
+
+    def _create_upload_worker(self, transfer):
+        dedup = self.dedup if self.dedup_check.isChecked() else None
+        worker = UploadWorker(transfer.key, transfer.fld_id, transfer.file_path, dedup, self.servers)
+        worker.signals.progress.connect(transfer.set_progress)
+        worker.signals.started.connect(lambda w=transfer: self.upload_started(w))
+        worker.signals.finished.connect(lambda res, w=transfer: self.upload_finished(res, w))
+        transfer.worker = worker
+        transfer.size = worker.size
+        transfer.started_at = transfer.finished_at = None
+        transfer.status = "Oczekuje"
+        transfer.dedup_hit = False
+        return worker
+
+    def on_upload_action(self, transfer, action):
+        if action == "cancel":
+            self.upload_queue.cancel(transfer.worker)
+        elif action == "retry":
+            self.retry_upload(transfer)
+        elif action == "open" and transfer.link:
+            webbrowser.open(transfer.link)
+        elif action == "embed" and transfer.embed:
+            QApplication.clipboard().setText(transfer.embed)
+
+    def retry_upload(self, transfer):
+        transfer.set_action("retry", visible=False)
+        transfer.set_action("cancel", enabled=True)
+        transfer.finished = False
+        transfer.set_progress(0)
+        transfer.set_status("⏳")
+        if transfer not in self.batch:
+            self.batch.append(transfer)
+            self.add_summary_row(transfer)
+        worker = self._create_upload_worker(transfer)
+        self.update_summary_row(transfer)
+        self.upload_queue.add([worker])
+        self.update_summary()
+
+    def clear_finished_uploads(self):
+        """Usuwa z listy zakończone zadania (zostają tylko w podsumowaniu)."""
+        done = [t for t in self.upload_list.transfers.items if t.finished]
+        for transfer in done:
+            transfer.worker = None
+        self.upload_list.transfers.remove(done)
+
+    def upload_started(self, transfer):
+        transfer.started_at = time.monotonic()
+        transfer.status = "Wysyłanie"
+        transfer.set_status("⬆️")
+        self.update_summary_row(transfer)
+
+    def add_summary_row(self, transfer):
+        row = self.summary_table.rowCount()
+        self.summary_table.insertRow(row)
+        transfer.summary_item = QTableWidgetItem(os.path.basename(transfer.file_path))
+        self.summary_table.setItem(row, 0, transfer.summary_item)
+        for col in range(1, 5):
+            self.summary_table.setItem(row, col, QTableWidgetItem(""))
+
+    def update_summary_row(self, transfer):
+        row = self.summary_table.row(transfer.summary_item)
+        if row < 0:
+            return
+        elapsed = None
+        if transfer.started_at is not None:
+            elapsed = (transfer.finished_at or time.monotonic()) - transfer.started_at
+        rate = ""
+        if transfer.finished_at and elapsed and not transfer.dedup_hit and transfer.status == "Wysłano":
+            rate = f"{format_size(transfer.size / elapsed)}/s"
+        self.summary_table.item(row, 1).setText(format_size(getattr(transfer, "size", 0)))
+        self.summary_table.item(row, 2).setText(transfer.status)
+        self.summary_table.item(row, 3).setText(f"{elapsed:.1f} s" if transfer.finished_at and elapsed is not None else "")
+        self.summary_table.item(row, 4).setText(rate)
+
+    def update_summary(self):
+        """Łączna przepustowość partii: bajty wysłanych plików przez czas od pierwszego startu do ostatniego końca."""
+        done = [w for w in self.batch if w.finished]
+        sent = [w for w in done if w.status == "Wysłano" and not w.dedup_hit]
+        failed = sum(1 for w in done if w.status not in ("Wysłano", "Duplikat"))
+        starts = [w.started_at for w in sent if w.started_at is not None]
+        text = f"Zakończone: {len(done)}/{len(self.batch)}"
+        if failed:
+            text += f" (błędy/anulowane: {failed})"
+        if sent and starts:
+            total = sum(w.size for w in sent)
+            span = max(w.finished_at for w in sent) - min(starts)
+            text += f" • wysłano {format_size(total)}"
+            if span > 0:
+                text += f" • łączna przepustowość {format_size(total / span)}/s"
+        self.summary_label.setText(text)
+
+    @traced("earnvids.finish", "gui")
+    def upload_finished(self, result, transfer):
+        transfer.finished = True
+        transfer.finished_at = time.monotonic()
+        transfer.set_action("cancel", enabled=False)
+        name = transfer.name
         if result.get("status") == 200:
             uploaded = result.get("files", [])[0]
             file_code = uploaded.get("filecode")
-            link = f"https://vidhideplus.com/file/{file_code}"
-            embed = f'https://vidhideplus.com/embed/{file_code}'
-            widget.title_label.setText(f"✅ {widget.file_path.split('/')[-1]}")
-            widget.progress.setValue(100)
-            widget.link = link
-            widget.embed = embed
-            widget.link_btn.setEnabled(True)
-            widget.embed_btn.setEnabled(True)
-            self.output.append(f"✅ Wysłano: {widget.file_path.split('/')[-1]}")
+            link = FILE_LINK_URL.format(file_code)
+            embed = EMBED_LINK_URL.format(file_code)
+            transfer.set_status("✅")
+            transfer.set_progress(100)
+            transfer.link = link
+            transfer.embed = embed
+            transfer.set_action("open", enabled=True)
+            transfer.set_action("embed", enabled=True)
+            if result.get("dedup"):
+                transfer.dedup_hit = True
+                transfer.status = "Duplikat"
+                self.output.append(f"♻️ Już wysłany wcześniej (ta sama zawartość): {name}")
+            else:
+                transfer.status = "Wysłano"
+                self.output.append(f"✅ Wysłano: {name}")
+                # Lista plików w cache jest już nieaktualna.
+                self.client.invalidate(FILES_URL)
+        elif result.get("cancelled"):
+            transfer.status = "Anulowano"
+            transfer.set_status("⛔")
+            transfer.set_action("retry", visible=True)
+            self.output.append(f"⛔ Anulowano: {name}")
         else:
             err = result.get("error") or str(result)
-            widget.title_label.setText(f"❌ {widget.file_path.split('/')[-1]}")
-            self.output.append(f"❌ Błąd przy wysyłaniu {widget.file_path.split('/')[-1]}: {err}")
-            widget.progress.setValue(100)
+            transfer.status = "Błąd"
+            transfer.set_status("❌")
+            transfer.set_action("retry", visible=True)
+            self.output.append(f"❌ Błąd przy wysyłaniu {name}: {err}")
+            transfer.set_progress(100)
+        self.update_summary_row(transfer)
+        self.update_summary()
+
+    def cancel_all_uploads(self):
+        if self.mirror:
+            self.mirror.cancel()
+        self.upload_queue.cancel_all()
+
+    def has_background_work(self):
+        """Odwzorowanie folderów działa w ThreadPoolExecutor, którego gospodarz nie widzi jako QThreadPool."""
+        return self.mirror is not None
+
+    def closeEvent(self, event):
+        self.cancel_all_uploads()
+        super().closeEvent(event)
+
+def create_window():
+    """Punkt wejścia dla gospodarza dodatków (dlc_common/host.py)."""
+    return EarnVidsApp()
 
 if __name__ == "__main__":
+    from dlc_common.watchdog import install_watchdog
     app = QApplication(sys.argv)
     apply_theme(app)
-    window = EarnVidsApp()
+    install_watchdog(app, os.path.join(DATA_DIR, "watchdog.log"))
+    window = create_window()
     window.show()
     sys.exit(app.exec())
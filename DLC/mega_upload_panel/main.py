@@ -1,36 +1,22 @@
-import base64
-import argparse
 import sys
 import json
 import os
 import re
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QProgressBar, QMenuBar,
-    QVBoxLayout, QComboBox, QListWidget, QFileDialog, QTextEdit, QMessageBox, QStyleFactory, QGroupBox, QHBoxLayout,
+    QVBoxLayout, QComboBox, QListWidget, QFileDialog, QTextEdit, QMessageBox, QGroupBox, QHBoxLayout,
     QTreeWidget, QTreeWidgetItem, QTabWidget, QMenu
 )
 from PyQt6.QtCore import QProcess, Qt
 from PyQt6.QtGui import QTextCursor, QIcon
-from account_manager_dialog import AccountManagerDialog
-
-
 
-def apply_theme(app):
-    parser = argparse.ArgumentParser(description="Uruchomienie dodatku DLC z motywem.")
-    parser.add_argument('--style-name', type=str, help='Nazwa stylu Qt do zastosowania.')
-    parser.add_argument('--stylesheet-b64', type=str, help='Arkusz stylów QSS zakodowany w Base64.')
-    args, _ = parser.parse_known_args()
-
-    if args.style_name:
-        QApplication.setStyle(QStyleFactory.create(args.style_name))
-
-    if args.stylesheet_b64:
-        try:
-            decoded_bytes = base64.b64decode(args.stylesheet_b64)
-            stylesheet = decoded_bytes.decode('utf-8')
-            app.setStyleSheet(stylesheet)
-        except Exception as e:
-            print(f"Nie udało się zastosować motywu: {e}")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # katalog DLC z dlc_common
+from dlc_common.theme import apply_theme
+from dlc_common.config import plugin_data_dir
+from dlc_common.progress import format_size
+from dlc_common.tracing import begin, traced
+from account_manager_dialog import AccountManagerDialog
+from transfer_progress import TransferProgress, TransferHistory, format_duration
 
 
 class MegaUploader(QWidget):
@@ -60,6 +46,11 @@ class MegaUploader(QWidget):
         self.process = None
         self.ls_output = ""
         self.link_output = ""
+        self.transfer = None
+        self.upload_stage = None  # span całego wysyłania (login, put, export, logout)
+        self.metrics_dialog = None
+        self.current_mail = ""
+        self.history = TransferHistory(os.path.join(plugin_data_dir(self.base_path), 'historia_transferow.json'))
 
         main_layout = QVBoxLayout(self)
         main_layout.setMenuBar(self._create_menu())
@@ -68,13 +59,15 @@ class MegaUploader(QWidget):
         main_layout.addWidget(self.tabs)
 
         uploader_tab = QWidget()
-        browser_tab = QWidget()
+        self.browser_tab = QWidget()
+        self.browser_tab_built = False
 
         self.tabs.addTab(uploader_tab, "Uploader")
-        self.tabs.addTab(browser_tab, "Podgląd konta")
+        self.tabs.addTab(self.browser_tab, "Podgląd konta")
 
         self._create_uploader_tab(uploader_tab)
-        self._create_browser_tab(browser_tab)
+        # Zakładka "Podgląd konta" jest budowana dopiero przy pierwszym otwarciu.
+        self.tabs.currentChanged.connect(self._on_tab_changed)
 
         self._load_data()
 
@@ -121,6 +114,12 @@ class MegaUploader(QWidget):
         log_layout.addWidget(self.log_output)
         main_layout.addWidget(log_group)
 
+    def _on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.browser_tab and not self.browser_tab_built:
+            self.browser_tab_built = True
+            self._create_browser_tab(self.browser_tab)
+            self._fill_browser_sezon_box()
+
     def _create_browser_tab(self, tab):
         layout = QVBoxLayout(tab)
         control_group = QGroupBox("Wybierz konto i odśwież listę")
@@ -214,6 +213,12 @@ class MegaUploader(QWidget):
 
         self.is_busy_with_context_action = False
 
+    def _fill_browser_sezon_box(self):
+        self.browser_sezon_box.clear()
+        if self.dane:
+            self.browser_sezon_box.addItems(self.dane.keys())
+        self._update_browser_series_list()
+
     def _update_browser_series_list(self):
         self.browser_seria_box.clear()
         sezon = self.browser_sezon_box.currentText()
@@ -260,6 +265,7 @@ class MegaUploader(QWidget):
         error_output = self.process.readAllStandardError().data().decode('utf-8', errors='ignore')
         self.ls_output += output + error_output
 
+    @traced("mega.ls.parse", "gui")
     def _parse_ls_and_logout(self, exit_code, exit_status):
         try:
             self.process.readyReadStandardOutput.disconnect()
@@ -305,6 +311,12 @@ class MegaUploader(QWidget):
         open_action = file_menu.addAction("Otwórz plik z danymi...")
         open_action.triggered.connect(lambda: self._load_data(manual_selection=True))
 
+        history_action = file_menu.addAction("Historia transferów...")
+        history_action.triggered.connect(self._show_transfer_history)
+
+        metrics_action = file_menu.addAction("Metryki transferów...")
+        metrics_action.triggered.connect(self._show_metrics)
+
         file_menu.addSeparator()
         close_action = file_menu.addAction("Zamknij")
         close_action.triggered.connect(self.close)
@@ -352,12 +364,11 @@ class MegaUploader(QWidget):
             error_msg = "Nie znaleziono pliku `dane.json`." if isinstance(e, FileNotFoundError) else "Plik z danymi jest uszkodzony."
             self.log_output.setText(f"BŁĄD: {error_msg}\n\nUżyj menu 'Plik -> Otwórz plik z danymi...', aby wczytać poprawny plik.")
         self.sezon_box.clear()
-        self.browser_sezon_box.clear()
         if self.dane:
             self.sezon_box.addItems(self.dane.keys())
-            self.browser_sezon_box.addItems(self.dane.keys())
         self.update_series_list()
-        self._update_browser_series_list()
+        if self.browser_tab_built:
+            self._fill_browser_sezon_box()
         self._update_ui_state()
 
     def _update_ui_state(self):
@@ -394,6 +405,37 @@ class MegaUploader(QWidget):
         """
         QMessageBox.information(self, "Pomoc - Struktura Pliku", help_text)
 
+    def _show_metrics(self):
+        # Okno metryk ładowane dopiero przy pierwszym użyciu, potem tylko pokazywane.
+        if self.metrics_dialog is None:
+            from dlc_common.metrics_view import MetricsDialog
+            self.metrics_dialog = MetricsDialog(self)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
+
+    def _show_transfer_history(self):
+        """Pokazuje ostatnie transfery z prędkościami, aby łatwo wychwycić dławione konta."""
+        entries = self.history.load()
+        if not entries:
+            QMessageBox.information(self, "Historia transferów", "Brak zapisanych transferów.")
+            return
+        rows = []
+        for e in reversed(entries[-30:]):
+            median = self.history.median_rate(e.get("account"))
+            mark = " ⚠️" if median and e.get("avg_rate", 0) < median * 0.5 else ""
+            rows.append(
+                f"<tr><td>{e.get('finished', '')}</td><td>{e.get('account', '')}</td>"
+                f"<td>{e.get('file', '')}</td><td>{self._format_bytes(e.get('bytes'))}</td>"
+                f"<td>{self._format_bytes(e.get('avg_rate'))}/s{mark}</td>"
+                f"<td>{format_duration(e.get('duration'))}</td></tr>"
+            )
+        html = (
+            "<table cellpadding='3'><tr><th>Zakończono</th><th>Konto</th><th>Plik</th>"
+            "<th>Rozmiar</th><th>Średnio</th><th>Czas</th></tr>" + "".join(rows) + "</table>"
+            "<p>⚠️ = prędkość poniżej połowy mediany dla konta (możliwe dławienie).</p>"
+        )
+        QMessageBox.information(self, "Historia transferów", html)
+
     def _show_about_dialog(self):
         QMessageBox.about(self, "O programie", f"MEGA Uploader\n\nWersja: {self.plugin_version}\n\nDodatek do Automatyzera by kacper12gry.")
 
@@ -437,6 +479,7 @@ class MegaUploader(QWidget):
         self.log_output.clear()
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
+        self.upload_stage = begin("mega.upload", "transfer", bytes=os.path.getsize(self.file_path))
         self.run_logout()
 
     def run_command(self, command, args, on_finished_slot):
@@ -449,6 +492,9 @@ class MegaUploader(QWidget):
             self.process.finished.disconnect()
         except TypeError:
             pass
+        # Czas polecenia MEGAcmd do śladu; podłączone przed slotem, więc span kończy się przed jego kodem.
+        stage = begin(command, "cli", bytes=os.path.getsize(args[-1])) if command == 'mega-put' else begin(command, "cli")
+        self.process.finished.connect(lambda code, status, s=stage: s.end(exit_code=code))
         self.process.finished.connect(on_finished_slot)
         self.process.start(command, args)
 
@@ -464,6 +510,7 @@ class MegaUploader(QWidget):
             return
         mail = seria_obj["Mail"]
         haslo = seria_obj["Haslo"]
+        self.current_mail = mail
         self.status_label.setText(f"Logowanie na konto: {mail}...")
         self.run_command('mega-login', [mail, haslo], self.run_put)
 
@@ -474,20 +521,29 @@ class MegaUploader(QWidget):
         self.status_label.setText(f"Wysyłanie pliku: {os.path.basename(self.file_path)}...")
         try:
             self.process.readyReadStandardOutput.disconnect()
+            self.process.readyReadStandardError.disconnect()
         except TypeError:
             pass
+        # Pasek postępu MEGAcmd może trafić na stdout albo stderr, więc parsujemy oba.
         self.process.readyReadStandardOutput.connect(self.update_progress)
+        self.process.readyReadStandardError.connect(self.update_progress)
+        self.transfer = TransferProgress(os.path.basename(self.file_path))
         self.run_command('mega-put', [self.file_path], self.run_export)
 
     def run_export(self, exit_code, exit_status):
         try:
             self.process.readyReadStandardOutput.disconnect()
+            self.process.readyReadStandardError.disconnect()
         except TypeError:
             pass
         self.process.readyReadStandardOutput.connect(self.handle_process_output)
+        self.process.readyReadStandardError.connect(self.handle_process_output)
         if exit_code != 0:
             self.on_upload_finished(error="Wysyłanie pliku nie powiodło się.")
             return
+        if self.transfer:
+            self.transfer.finish()
+            self.progress_bar.setValue(100)
         self.status_label.setText("Generowanie linku publicznego...")
         filename = os.path.basename(self.file_path)
         self.run_command('mega-export', ['-a', filename], self.run_final_logout)
@@ -500,6 +556,9 @@ class MegaUploader(QWidget):
         self.run_command('mega-logout', [], self.on_upload_finished)
 
     def on_upload_finished(self, exit_code=0, exit_status=None, error=None):
+        if self.upload_stage:
+            self.upload_stage.end(**({"error": error} if error else {}))
+            self.upload_stage = None
         if error:
             self.status_label.setText(f"Błąd: {error}")
             self.log_output.append(f"\n--- BŁĄD ---\n{error}")
@@ -514,6 +573,8 @@ class MegaUploader(QWidget):
                 self.log_output.append(f"Link do osadzenia (embed): {link}")
             else:
                 self.log_output.append("\nNie udało się odnaleźć linku w logach.")
+            self._record_transfer()
+        self.transfer = None
         self.is_uploading = False
         self.upload_btn.setEnabled(True)
         self.choose_file_btn.setEnabled(True)
@@ -530,12 +591,32 @@ class MegaUploader(QWidget):
 
     def update_progress(self):
         output = self.process.readAllStandardOutput().data().decode('utf-8', errors='ignore')
+        output += self.process.readAllStandardError().data().decode('utf-8', errors='ignore')
         self.log_output.append(output.strip())
         self.log_output.moveCursor(QTextCursor.MoveOperation.End)
-        match = re.search(r'(\d+)/\d+ %\s*\((\d+)', output)
-        if match:
-            progress_percent = int(match.group(2))
-            self.progress_bar.setValue(progress_percent)
+        if self.transfer and self.transfer.feed(output):
+            self.progress_bar.setValue(int(self.transfer.percent))
+            self.status_label.setText(
+                f"Wysyłanie pliku: {self.transfer.name} — {self.transfer.summary(self._format_bytes)}"
+            )
+
+    def _record_transfer(self):
+        """Zapisuje prędkość zakończonego transferu do historii i ostrzega o wyraźnym spowolnieniu."""
+        if not self.transfer:
+            return
+        if not self.transfer.bytes_total and os.path.exists(self.file_path):
+            self.transfer.bytes_done = self.transfer.bytes_total = os.path.getsize(self.file_path)
+        median = self.history.median_rate(self.current_mail)
+        record = self.transfer.to_record(account=self.current_mail, seria=self.current_seria_name)
+        self.history.append(record)
+        self.log_output.append(
+            f"Średnia prędkość: {self._format_bytes(record['avg_rate'])}/s "
+            f"(czas: {format_duration(record['duration'])})"
+        )
+        if median and record["avg_rate"] < median * 0.5:
+            self.log_output.append(
+                f"⚠️ Prędkość poniżej połowy typowej dla tego konta ({self._format_bytes(median)}/s) — możliwe dławienie."
+            )
 
     def handle_error(self, error):
         error_map = {
@@ -549,20 +630,17 @@ class MegaUploader(QWidget):
         self.on_upload_finished(error=error_map.get(error, "Nieznany błąd procesu."))
 
     def _format_bytes(self, size_bytes):
-        if size_bytes is None:
-            return "N/A"
-        if size_bytes == 0:
-            return "0 B"
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        return format_size(size_bytes, precision=1)
 
+def create_window():
+    """Punkt wejścia dla gospodarza dodatków (dlc_common/host.py)."""
+    return MegaUploader()
 
 if __name__ == "__main__":
+    from dlc_common.watchdog import install_watchdog
     app = QApplication(sys.argv)
     apply_theme(app)
-    window = MegaUploader()
+    install_watchdog(app, os.path.join(plugin_data_dir(os.path.dirname(os.path.abspath(__file__))), "watchdog.log"))
+    window = create_window()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,187 @@
+# transfer_progress.py
+import json
+import os
+import re
+import time
+
+# Przykładowa linia postępu z mega-put:
+#   TRANSFERRING ||##########..........||(512/1024 MB:  50.00 %)
+PROGRESS_RE = re.compile(
+    r'\((\d+(?:[.,]\d+)?)\s*/\s*(\d+(?:[.,]\d+)?)\s*([KMGTP]?B)\s*:\s*(\d+(?:[.,]\d+)?)\s*%\)'
+)
+# Niektóre wersje MEGAcmd dopisują też chwilową prędkość, np. "12.5 MB/s".
+RATE_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*([KMGTP]?B)/s')
+# Stary format, obsługiwany wcześniej przez update_progress.
+LEGACY_RE = re.compile(r'(\d+)/\d+ %\s*\((\d+)')
+
+UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3, 'TB': 1024 ** 4, 'PB': 1024 ** 5}
+
+HISTORY_LIMIT = 200
+
+
+def _to_float(text):
+    return float(text.replace(',', '.'))
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+class TransferProgress:
+    """Model postępu pojedynczego transferu: bajty, wygładzona prędkość i ETA."""
+
+    def __init__(self, name="", alpha=0.3, min_interval=0.5, clock=time.monotonic):
+        self.name = name
+        self.alpha = alpha
+        self.min_interval = min_interval
+        self.clock = clock
+        self.started_at = clock()
+        self.bytes_done = 0
+        self.bytes_total = 0
+        self.percent = 0.0
+        self.reported_rate = None
+        self.smoothed_rate = None
+        self.peak_rate = 0.0
+        self.samples = []  # (sekundy od startu, bajty/s)
+        self.finished_at = None
+        self._last_time = self.started_at
+        self._last_bytes = 0
+
+    def feed(self, text):
+        """Parsuje fragment wyjścia mega-put. Zwraca True, jeśli stan się zmienił."""
+        matches = PROGRESS_RE.findall(text)
+        if matches:
+            done, total, unit, percent = matches[-1]
+            multiplier = UNITS.get(unit.upper(), 1)
+            total_bytes = int(_to_float(total) * multiplier)
+            percent = _to_float(percent)
+            # Procent ma dwa miejsca po przecinku, więc jest dokładniejszy niż licznik w MB.
+            done_bytes = int(total_bytes * percent / 100) if total_bytes else int(_to_float(done) * multiplier)
+            rate = RATE_RE.findall(text)
+            if rate:
+                value, rate_unit = rate[-1]
+                self.reported_rate = _to_float(value) * UNITS.get(rate_unit.upper(), 1)
+            self.update(done_bytes, total_bytes, percent)
+            return True
+
+        legacy = LEGACY_RE.search(text)
+        if legacy:
+            self.percent = float(legacy.group(2))
+            return True
+        return False
+
+    def update(self, bytes_done, bytes_total, percent=None):
+        now = self.clock()
+        self.bytes_total = bytes_total
+        self.bytes_done = bytes_done
+        if percent is None:
+            percent = (bytes_done / bytes_total * 100) if bytes_total else 0.0
+        self.percent = percent
+
+        elapsed = now - self._last_time
+        if elapsed < self.min_interval:
+            return
+        instant = max(0, bytes_done - self._last_bytes) / elapsed
+        if self.smoothed_rate is None:
+            self.smoothed_rate = instant
+        else:
+            self.smoothed_rate = self.alpha * instant + (1 - self.alpha) * self.smoothed_rate
+        self.peak_rate = max(self.peak_rate, instant)
+        self.samples.append((round(now - self.started_at, 2), round(instant)))
+        self._last_time = now
+        self._last_bytes = bytes_done
+
+    def finish(self):
+        """Zamraża czas transferu (logowanie i eksport linku nie wliczają się do prędkości)."""
+        self.finished_at = self.clock()
+        if self.bytes_total:
+            self.bytes_done = self.bytes_total
+            self.percent = 100.0
+
+    @property
+    def rate(self):
+        """Wygładzona prędkość w B/s (lub prędkość zgłoszona przez MEGAcmd, gdy brak próbek)."""
+        if self.smoothed_rate is not None:
+            return self.smoothed_rate
+        return self.reported_rate
+
+    @property
+    def eta(self):
+        rate = self.rate
+        if not rate or not self.bytes_total:
+            return None
+        return max(0, self.bytes_total - self.bytes_done) / rate
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or self.clock()) - self.started_at
+
+    @property
+    def average_rate(self):
+        elapsed = self.elapsed
+        return self.bytes_done / elapsed if elapsed > 0 else 0.0
+
+    def summary(self, format_bytes):
+        """Krótki opis stanu do etykiety statusu."""
+        parts = [f"{self.percent:.1f}%"]
+        if self.bytes_total:
+            parts.append(f"{format_bytes(self.bytes_done)} / {format_bytes(self.bytes_total)}")
+        if self.rate:
+            parts.append(f"{format_bytes(self.rate)}/s")
+            parts.append(f"pozostało ~{format_duration(self.eta)}")
+        return ", ".join(parts)
+
+    def to_record(self, **extra):
+        record = {
+            "file": self.name,
+            "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "duration": round(self.elapsed, 2),
+            "bytes": self.bytes_total or self.bytes_done,
+            "avg_rate": round(self.average_rate),
+            "peak_rate": round(self.peak_rate),
+            "samples": self.samples[-120:],
+        }
+        record.update(extra)
+        return record
+
+
+class TransferHistory:
+    """Historia prędkości transferów zapisywana w pliku JSON obok dodatku."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def load(self):
+        if not os.path.exists(self.filepath):
+            return []
+        try:
+            with open(self.filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    def append(self, record):
+        entries = self.load()
+        entries.append(record)
+        entries = entries[-HISTORY_LIMIT:]
+        try:
+            with open(self.filepath, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2, ensure_ascii=False)
+        except OSError as e:
+            print(f"Nie udało się zapisać historii transferów: {e}")
+
+    def median_rate(self, account):
+        """Mediana średnich prędkości dla konta — punkt odniesienia do wykrywania dławienia."""
+        rates = sorted(e["avg_rate"] for e in self.load() if e.get("account") == account and e.get("avg_rate"))
+        if not rates:
+            return None
+        mid = len(rates) // 2
+        return rates[mid] if len(rates) % 2 else (rates[mid - 1] + rates[mid]) / 2
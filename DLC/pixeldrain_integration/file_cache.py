@@ -0,0 +1,72 @@
+# file_cache.py
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+
+
+class RemoteFileCache:
+    """Lokalna kopia listy plików z konta (sqlite), synchronizowana przez porównanie ID."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " account TEXT NOT NULL, id TEXT NOT NULL, position INTEGER NOT NULL, data TEXT NOT NULL,"
+                " PRIMARY KEY (account, id))"
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS sync (account TEXT PRIMARY KEY, synced_at REAL NOT NULL)")
+
+    @contextmanager
+    def _connect(self):
+        # Osobne połączenie na każde wywołanie - cache jest używany z wątków roboczych.
+        db = sqlite3.connect(self.path, timeout=10)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def load(self, account):
+        with self._connect() as db:
+            rows = db.execute("SELECT data FROM files WHERE account = ? ORDER BY position", (account,)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def synced_at(self, account):
+        with self._connect() as db:
+            row = db.execute("SELECT synced_at FROM sync WHERE account = ?", (account,)).fetchone()
+        return row[0] if row else None
+
+    def apply(self, account, files):
+        """Zapisuje świeżą listę z API, zmieniając tylko różnice. Zwraca (nowe, ID usuniętych, zmienione)."""
+        with self._connect() as db:
+            cached = {
+                file_id: (position, data)
+                for file_id, position, data in db.execute(
+                    "SELECT id, position, data FROM files WHERE account = ?", (account,))
+            }
+            fresh_ids = set()
+            upserts = []
+            added = changed = 0
+            for position, f in enumerate(files):
+                file_id = f.get("id")
+                if not file_id:
+                    continue
+                fresh_ids.add(file_id)
+                data = json.dumps(f, sort_keys=True, ensure_ascii=False)
+                old = cached.get(file_id)
+                if old is None:
+                    added += 1
+                elif old == (position, data):
+                    continue
+                elif old[1] != data:
+                    changed += 1
+                upserts.append((account, file_id, position, data))
+            removed = [(account, file_id) for file_id in cached.keys() - fresh_ids]
+
+            db.executemany("DELETE FROM files WHERE account = ? AND id = ?", removed)
+            db.executemany(
+                "INSERT OR REPLACE INTO files (account, id, position, data) VALUES (?, ?, ?, ?)", upserts)
+            db.execute("INSERT OR REPLACE INTO sync (account, synced_at) VALUES (?, ?)", (account, time.time()))
+        return added, [file_id for _, file_id in removed], changed
@@ -0,0 +1,167 @@
+# file_index.py
+import datetime
+import re
+from collections import defaultdict
+from operator import attrgetter
+
+SORT_KEYS = [
+    ("default", "Kolejność z API"),
+    ("name", "Nazwa"),
+    ("size", "Rozmiar"),
+    ("views", "Wyświetlenia"),
+    ("downloads", "Pobrania"),
+    ("date", "Data wysłania"),
+]
+
+# Filtry wpisywane w pole wyszukiwania, np. "odcinek rozmiar>1GB data>=2024-01-01".
+FILTER_FIELDS = {
+    "rozmiar": "size", "size": "size",
+    "wyświetlenia": "views", "views": "views",
+    "pobrania": "downloads", "downloads": "downloads",
+    "data": "date", "date": "date",
+}
+FILTER_RE = re.compile(r'^(\w+)(>=|<=|>|<|=)(\S+)$')
+SIZE_RE = re.compile(r'^(\d+(?:[.,]\d+)?)\s*([kmgt]?i?b?)$')
+SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+def parse_upload_date(date_upload):
+    """Zwraca (znacznik czasu, tekst do wyświetlenia) dla daty z API Pixeldrain (zazwyczaj ISO)."""
+    try:
+        dt = datetime.datetime.fromisoformat(date_upload.replace("Z", "+00:00"))
+        return dt.timestamp(), dt.strftime("%Y-%m-%d %H:%M")
+    except (AttributeError, ValueError):
+        return 0.0, date_upload or ""
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class FileEntry:
+    """Plik z konta z wartościami policzonymi raz, przy budowie indeksu."""
+    __slots__ = ("file", "order", "name", "name_lower", "size", "views", "downloads",
+                 "timestamp", "date_str")
+
+    def __init__(self, f, order):
+        self.file = f
+        self.order = order
+        self.name = f.get("name") or "(brak nazwy)"
+        self.name_lower = self.name.lower()
+        self.size = f.get("size") or 0
+        self.views = f.get("views") or 0
+        self.downloads = f.get("downloads") or 0
+        self.timestamp, self.date_str = parse_upload_date(f.get("date_upload", ""))
+
+
+class RemoteFileIndex:
+    """Indeks trigramowy nazw plików z filtrowaniem i sortowaniem po metadanych."""
+
+    SORT_ATTRS = {"default": "order", "name": "name_lower", "size": "size", "views": "views",
+                  "downloads": "downloads", "date": "timestamp"}
+
+    def __init__(self, files=()):
+        self.build(files)
+
+    def build(self, files):
+        self.entries = [FileEntry(f, i) for i, f in enumerate(files)]
+        self.names = [e.name_lower for e in self.entries]
+        self.trigrams = defaultdict(list)
+        for i, name in enumerate(self.names):
+            for gram in _trigrams(name):
+                self.trigrams[gram].append(i)
+        self._sorted = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _sorted_entries(self, sort_key, descending):
+        cache_key = (sort_key, descending)
+        if cache_key not in self._sorted:
+            attr = self.SORT_ATTRS.get(sort_key, "order")
+            self._sorted[cache_key] = sorted(self.entries, key=attrgetter(attr), reverse=descending)
+        return self._sorted[cache_key]
+
+    def _match_text(self, text):
+        """Indeksy wpisów, których nazwa zawiera text (listy postingów są posortowane)."""
+        names = self.names
+        if len(text) < 3:
+            return [i for i, name in enumerate(names) if text in name]
+        postings = []
+        for gram in _trigrams(text):
+            posting = self.trigrams.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        # Weryfikujemy tylko kandydatów z najkrótszej listy - reszta trigramów nie musi być przecinana.
+        shortest = min(postings, key=len)
+        return [i for i in shortest if text in names[i]]
+
+    def search(self, query="", sort_key="default", descending=False):
+        text, filters = parse_query(query)
+        if not text and not filters:
+            return list(self._sorted_entries(sort_key, descending))
+
+        entries = self.entries
+        if text:
+            candidates = [entries[i] for i in self._match_text(text)]
+        else:
+            candidates = entries
+        for attr, op, value in filters:
+            get = attrgetter(attr)
+            candidates = [e for e in candidates if op(get(e), value)]
+
+        if len(candidates) == len(entries):
+            return list(self._sorted_entries(sort_key, descending))
+        if sort_key == "default" and not descending:
+            return candidates
+        return sorted(candidates, key=attrgetter(self.SORT_ATTRS.get(sort_key, "order")), reverse=descending)
+
+
+OPERATORS = {
+    ">": lambda a, b: a > b, "<": lambda a, b: a < b,
+    ">=": lambda a, b: a >= b, "<=": lambda a, b: a <= b, "=": lambda a, b: a == b,
+}
+
+
+def _parse_filter_value(field, raw):
+    raw = raw.lower()
+    if field == "size":
+        m = SIZE_RE.match(raw)
+        if not m:
+            return None
+        return float(m.group(1).replace(",", ".")) * SIZE_UNITS[m.group(2)[:1]]
+    if field == "date":
+        try:
+            return datetime.datetime.fromisoformat(raw).replace(tzinfo=datetime.timezone.utc).timestamp()
+        except ValueError:
+            return None
+    try:
+        return int(raw)
+    except ValueError:
+        return None
+
+
+def parse_query(query):
+    """Rozdziela zapytanie na tekst do wyszukania i listę filtrów (atrybut, operator, wartość)."""
+    words, filters = [], []
+    for token in query.lower().split():
+        m = FILTER_RE.match(token)
+        if m and m.group(1) in FILTER_FIELDS:
+            field = FILTER_FIELDS[m.group(1)]
+            value = _parse_filter_value(field, m.group(3))
+            if value is not None:
+                op = m.group(2)
+                if field == "date" and op == "=":
+                    # "data=2024-01-02" oznacza cały dzień.
+                    filters.append(("timestamp", OPERATORS[">="], value))
+                    filters.append(("timestamp", OPERATORS["<"], value + 86400))
+                elif field == "date" and op in (">", "<="):
+                    # Tak samo dla "data>" i "data<=": granicą jest koniec dnia, nie jego początek.
+                    filters.append(("timestamp", OPERATORS[{">": ">=", "<=": "<"}[op]], value + 86400))
+                else:
+                    attr = "timestamp" if field == "date" else field
+                    filters.append((attr, OPERATORS[op], value))
+                continue
+        words.append(token)
+    return " ".join(words), filters
@@ -0,0 +1,113 @@
+# key_profiles.py
+import fnmatch
+import os
+import time
+
+DEFAULT_PROFILE = "Domyślne"
+
+
+def load_profiles(config):
+    """Zwraca (profile, reguły, aktywny profil) z konfiguracji; stary pojedynczy api_key staje się profilem."""
+    profiles = [p for p in config.get("profiles", []) if p.get("name")]
+    if not profiles and config.get("api_key"):
+        profiles = [{"name": DEFAULT_PROFILE, "api_key": config["api_key"]}]
+    rules = [r for r in config.get("routes", []) if r.get("pattern") and r.get("profile")]
+    active = config.get("active_profile")
+    if not any(p["name"] == active for p in profiles):
+        active = profiles[0]["name"] if profiles else None
+    return profiles, rules, active
+
+
+def rule_matches(pattern, path):
+    """
+    Reguła pasuje, gdy wzorzec (bez rozróżniania wielkości liter) jest:
+    folderem, w którym leży plik; fragmentem nazwy folderu lub pliku; wzorcem glob dla pełnej
+    ścieżki lub nazwy pliku.
+    """
+    pattern = os.path.expanduser(pattern.strip()).lower()
+    path = path.lower()
+    if not pattern:
+        return False
+    if not any(c in pattern for c in "*?["):
+        folder = pattern.rstrip("/\\") + os.sep
+        if path.startswith(folder):
+            return True
+        # Sam fragment, np. nazwa serii - szukamy go wewnątrz nazw folderów i pliku.
+        return any(pattern in part for part in path.split(os.sep))
+    return fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern)
+
+
+def route_file(path, rules, default):
+    """Nazwa profilu dla pliku: pierwsza pasująca reguła, a gdy żadna nie pasuje - profil domyślny."""
+    for rule in rules:
+        if rule_matches(rule["pattern"], path):
+            return rule["profile"]
+    return default
+
+
+class AccountProgress:
+    """Sumuje postęp wysyłania wszystkich plików danego konta (bajty, pliki, prędkość)."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.accounts = {}
+
+    def _account(self, name):
+        acc = self.accounts.get(name)
+        if acc is None:
+            acc = self.accounts[name] = {
+                "jobs": {}, "done_files": 0, "failed_files": 0, "started": None, "finished": None,
+            }
+        return acc
+
+    def add(self, name, job, size):
+        acc = self._account(name)
+        acc["jobs"][job] = [size, 0]
+        acc["finished"] = None
+
+    def update(self, name, job, percent):
+        acc = self._account(name)
+        entry = acc["jobs"].get(job)
+        if entry is None:
+            return
+        if acc["started"] is None:
+            acc["started"] = self.clock()
+        entry[1] = entry[0] * percent // 100
+
+    def finish(self, name, job, ok):
+        acc = self._account(name)
+        entry = acc["jobs"].get(job)
+        if entry is None:
+            return
+        if ok:
+            entry[1] = entry[0]
+            acc["done_files"] += 1
+        else:
+            acc["failed_files"] += 1
+        if acc["done_files"] + acc["failed_files"] >= len(acc["jobs"]):
+            acc["finished"] = self.clock()
+
+    def clear_finished(self):
+        """Zapomina konta, których wszystkie pliki są już zakończone (przed nową partią)."""
+        self.accounts = {n: a for n, a in self.accounts.items() if a["finished"] is None}
+
+    def rows(self):
+        """Lista słowników: konto, pliki, bajty, procent i średnia prędkość w B/s."""
+        now = self.clock()
+        result = []
+        for name, acc in self.accounts.items():
+            total = sum(size for size, _ in acc["jobs"].values())
+            done = sum(sent for _, sent in acc["jobs"].values())
+            elapsed = ((acc["finished"] or now) - acc["started"]) if acc["started"] else 0
+            result.append({
+                "name": name,
+                "files": len(acc["jobs"]),
+                "done_files": acc["done_files"],
+                "failed_files": acc["failed_files"],
+                "total": total,
+                "done": done,
+                "percent": int(done * 100 / total) if total else 100,
+                "rate": done / elapsed if elapsed > 0 else 0,
+                "finished": acc["finished"] is not None,
+            })
+        return result
@@ -0,0 +1,134 @@
+# key_profiles_dialog.py
+import copy
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QComboBox, QDialogButtonBox, QMessageBox, QAbstractItemView
+)
+
+
+class KeyProfilesDialog(QDialog):
+    """Edycja profili kluczy API Pixeldrain i reguł kierujących pliki na konta."""
+
+    def __init__(self, profiles, rules, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Konta i reguły wysyłania")
+        self.setMinimumSize(700, 500)
+        self.profiles = copy.deepcopy(profiles)
+        self.rules = copy.deepcopy(rules)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("<b>Profile (konta Pixeldrain):</b>"))
+        self.profile_table = QTableWidget(0, 2)
+        self.profile_table.setHorizontalHeaderLabels(["Nazwa", "API key"])
+        self.profile_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.profile_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.profile_table.itemChanged.connect(self.refresh_rule_profiles)
+        layout.addWidget(self.profile_table)
+        hl = QHBoxLayout()
+        add_profile_btn = QPushButton("Dodaj profil")
+        add_profile_btn.clicked.connect(lambda: self.add_profile_row("", ""))
+        del_profile_btn = QPushButton("Usuń zaznaczony")
+        del_profile_btn.clicked.connect(lambda: self.remove_selected(self.profile_table))
+        hl.addWidget(add_profile_btn)
+        hl.addWidget(del_profile_btn)
+        hl.addStretch()
+        layout.addLayout(hl)
+
+        layout.addWidget(QLabel(
+            "<b>Reguły (od góry, pierwsza pasująca wygrywa):</b><br>"
+            "Wzorzec to folder (np. /filmy/Naruto), fragment nazwy (np. naruto) "
+            "albo glob (np. *S01E*.mkv). Pliki bez pasującej reguły idą na wybrany profil."))
+        self.rule_table = QTableWidget(0, 2)
+        self.rule_table.setHorizontalHeaderLabels(["Wzorzec", "Profil"])
+        self.rule_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.rule_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        layout.addWidget(self.rule_table)
+        hl = QHBoxLayout()
+        add_rule_btn = QPushButton("Dodaj regułę")
+        add_rule_btn.clicked.connect(lambda: self.add_rule_row("", ""))
+        del_rule_btn = QPushButton("Usuń zaznaczoną")
+        del_rule_btn.clicked.connect(lambda: self.remove_selected(self.rule_table))
+        hl.addWidget(add_rule_btn)
+        hl.addWidget(del_rule_btn)
+        hl.addStretch()
+        layout.addLayout(hl)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        for p in self.profiles:
+            self.add_profile_row(p["name"], p.get("api_key", ""))
+        for r in self.rules:
+            self.add_rule_row(r["pattern"], r["profile"])
+
+    def profile_names(self):
+        names = []
+        for row in range(self.profile_table.rowCount()):
+            item = self.profile_table.item(row, 0)
+            if item and item.text().strip():
+                names.append(item.text().strip())
+        return names
+
+    def add_profile_row(self, name, key):
+        row = self.profile_table.rowCount()
+        self.profile_table.insertRow(row)
+        self.profile_table.setItem(row, 0, QTableWidgetItem(name))
+        self.profile_table.setItem(row, 1, QTableWidgetItem(key))
+
+    def add_rule_row(self, pattern, profile):
+        row = self.rule_table.rowCount()
+        self.rule_table.insertRow(row)
+        self.rule_table.setItem(row, 0, QTableWidgetItem(pattern))
+        combo = QComboBox()
+        combo.addItems(self.profile_names())
+        combo.setCurrentText(profile)
+        self.rule_table.setCellWidget(row, 1, combo)
+
+    def refresh_rule_profiles(self):
+        names = self.profile_names()
+        for row in range(self.rule_table.rowCount()):
+            combo = self.rule_table.cellWidget(row, 1)
+            current = combo.currentText()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItems(names)
+            combo.setCurrentText(current)
+            combo.blockSignals(False)
+
+    def remove_selected(self, table):
+        for row in sorted({i.row() for i in table.selectedIndexes()}, reverse=True):
+            table.removeRow(row)
+        self.refresh_rule_profiles()
+
+    def accept(self):
+        profiles = []
+        for row in range(self.profile_table.rowCount()):
+            name = (self.profile_table.item(row, 0) or QTableWidgetItem()).text().strip()
+            key = (self.profile_table.item(row, 1) or QTableWidgetItem()).text().strip()
+            if not name and not key:
+                continue
+            if not name or not key:
+                QMessageBox.warning(self, "Błąd", f"Profil w wierszu {row + 1} musi mieć nazwę i API key.")
+                return
+            if any(p["name"] == name for p in profiles):
+                QMessageBox.warning(self, "Błąd", f"Nazwa profilu '{name}' się powtarza.")
+                return
+            profiles.append({"name": name, "api_key": key})
+
+        names = {p["name"] for p in profiles}
+        rules = []
+        for row in range(self.rule_table.rowCount()):
+            pattern = (self.rule_table.item(row, 0) or QTableWidgetItem()).text().strip()
+            profile = self.rule_table.cellWidget(row, 1).currentText()
+            if not pattern:
+                continue
+            if profile not in names:
+                QMessageBox.warning(self, "Błąd", f"Reguła '{pattern}' wskazuje nieistniejący profil.")
+                return
+            rules.append({"pattern": pattern, "profile": profile})
+
+        self.profiles = profiles
+        self.rules = rules
+        super().accept()
@@ -1,116 +1,307 @@
-import sys, os, requests, webbrowser, json, time, argparse, base64, datetime
+import sys, os, webbrowser, json, time, random, sqlite3
+from urllib.parse import quote
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QTextEdit, QMessageBox, QFileDialog,
-    QListWidget, QListWidgetItem, QProgressBar, QStyleFactory, QSplitter,
-    QFrame
+    QPushButton, QTextEdit, QMessageBox, QFileDialog, QSplitter,
+    QFrame, QSpinBox, QComboBox, QFormLayout, QListView, QTabWidget,
+    QStyledItemDelegate, QStyle, QStyleOptionButton, QStyleOptionViewItem, QCheckBox,
+    QTreeWidget, QTreeWidgetItem, QHeaderView
 )
-from PyQt6.QtCore import Qt, QRunnable, QThreadPool, pyqtSignal, QObject
-
-CONFIG_FILE = "pixeldrain_config.json"
-USER_INFO_URL = "https://pixeldrain.com/api/user"
-FILES_URL = "https://pixeldrain.com/api/user/files"
-UPLOAD_URL = "https://pixeldrain.com/api/file/{}"
+from PyQt6.QtCore import (
+    Qt, QRunnable, QThreadPool, pyqtSignal, QObject, QAbstractListModel, QModelIndex,
+    QRect, QSize, QEvent, QTimer
+)
+from PyQt6.QtGui import QFont, QFontMetrics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # katalog DLC z dlc_common
+from dlc_common.theme import apply_theme
+from dlc_common.config import load_config, save_config, plugin_data_dir
+from dlc_common.progress import ProgressThrottle, format_size
+from dlc_common.transport import get_session, read_adaptive_chunks, send_file, uses_proxy, get_pool
+from dlc_common.scheduler import (
+    BandwidthLimiter, TransferWorker, UploadScheduler, DEFAULT_MAX_PARALLEL, UPLOAD_ORDERS
+)
+from dlc_common.transfer_list import TransferItem, TransferListView
+from dlc_common.dedup import DedupIndex, account_id
+from dlc_common.manifest import load_manifest
+from dlc_common.tracing import get_tracer, span, traced
+from file_index import RemoteFileIndex, SORT_KEYS
+from file_cache import RemoteFileCache
+from upload_journal import UploadJournal
+from key_profiles import load_profiles, route_file, AccountProgress, DEFAULT_PROFILE
+from key_profiles_dialog import KeyProfilesDialog
+
+# Pliki danych obok dodatku, nie w katalogu roboczym - w gospodarzu dodatków (host.py) jest on wspólny.
+# DLC_DATA_DIR przenosi je gdzie indziej (benchmarki), zob. dlc_common.config.plugin_data_dir.
+PLUGIN_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = plugin_data_dir(PLUGIN_DIR)
+CONFIG_FILE = os.path.join(DATA_DIR, "pixeldrain_config.json")
+CACHE_FILE = os.path.join(DATA_DIR, "pixeldrain_cache.db")
+JOURNAL_FILE = os.path.join(DATA_DIR, "pixeldrain_journal.db")
+DEDUP_FILE = os.path.join(DATA_DIR, "dedup_index.db")
+# Górna granica "Równolegle" - deklarowana w plugin.json, żeby gospodarz znał ją bez uruchamiania dodatku.
+MAX_PARALLEL = load_manifest(PLUGIN_DIR)["capabilities"]["max_concurrency"]
+DEDUP_SERVICE = "pixeldrain"
+# Adres API można podmienić (np. na lokalny serwer testowy) zmienną PIXELDRAIN_API_URL.
+API_URL = os.environ.get("PIXELDRAIN_API_URL", "https://pixeldrain.com/api").rstrip("/")
+USER_INFO_URL = API_URL + "/user"
+FILES_URL = API_URL + "/user/files"
+UPLOAD_URL = API_URL + "/file/{}"
 VIEW_URL = "https://pixeldrain.com/u/{}"
 EMBED_URL = "https://pixeldrain.com/u/{}"
-
-def format_size(size):
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024:
-            return f"{size:.2f} {unit}"
-        size /= 1024
-    return f"{size:.2f} PB"
-
-def apply_theme(app):
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--style-name', type=str)
-    parser.add_argument('--stylesheet-b64', type=str)
-    args, _ = parser.parse_known_args()
-    if args.style_name:
-        QApplication.setStyle(QStyleFactory.create(args.style_name))
-    if args.stylesheet_b64:
-        try:
-            decoded_bytes = base64.b64decode(args.stylesheet_b64)
-            stylesheet = decoded_bytes.decode('utf-8')
-            app.setStyleSheet(stylesheet)
-        except Exception as e:
-            print(f"Nie udało się zastosować motywu: {e}")
-
-class WorkerSignals(QObject):
-    progress = pyqtSignal(int)
+API_TIMEOUT = (5, 30)  # (połączenie, odczyt) w sekundach dla zapytań innych niż wysyłanie
+SEARCH_DEBOUNCE_MS = 150
+MAX_UPLOAD_RETRIES = 5
+RETRY_BASE_DELAY = 5  # sekundy; kolejne próby czekają 5, 10, 20, 40... s (maks. RETRY_MAX_DELAY)
+RETRY_MAX_DELAY = 300
+TRANSIENT_HTTP_STATUSES = (408, 429, 500, 502, 503, 504)
+UPLOAD_ACTIONS = [("pause", "⏸ Wstrzymaj"), ("cancel", "✖ Anuluj"),
+                  ("open", "🔗 Otwórz link"), ("copy", "📋 Kopiuj link file")]
+
+class UploadWorker(TransferWorker):
+    trace_name = "pixeldrain.upload"
+
+    def __init__(self, file_path, api_key, limiter=None, dedup=None, pool=None):
+        super().__init__(file_path, group=api_key, limiter=limiter)
+        self.api_key = api_key
+        self.dedup = dedup
+        self.pool = pool
+
+    def error_result(self, error):
+        import requests
+
+        # Zerwane połączenia i przekroczone limity czasu warto ponowić, resztę nie.
+        transient = isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                                       requests.exceptions.ChunkedEncodingError))
+        return {"error": str(error), "transient": transient}
+
+    def transfer(self):
+        digest = None
+        if self.dedup:
+            # Ta sama zawartość była już wysłana na to konto - oddajemy istniejące linki.
+            digest, known = self.find_duplicate(self.dedup, DEDUP_SERVICE, self.api_key)
+            if known:
+                self.signals.progress.emit(100)
+                return dict(known["links"], status=200, file_id=known["remote_id"], dedup=True)
+
+        file_name = os.path.basename(self.file_path)
+        url = UPLOAD_URL.format(quote(file_name))
+        total_size = os.path.getsize(self.file_path)
+        throttle = ProgressThrottle(self.signals.progress.emit, total_size)
+        # Każdy kawałek trafia do śladu jako span - tempo wysyłania kawałek po kawałku.
+        on_chunk = get_tracer().chunks("pixeldrain.chunk", on_chunk=throttle.add)
+        headers = {'Content-Type': 'application/octet-stream'}
+        with span("pixeldrain.put", "network", bytes=total_size):
+            if uses_proxy(url):
+                with open(self.file_path, 'rb') as f:
+                    body = read_adaptive_chunks(f, on_chunk, before_chunk=self._before_chunk)
+                    resp = get_session().put(url, data=body, auth=('', self.api_key), headers=headers)
+            else:
+                # Plik idzie do gniazda bez kopiowania do obiektów bytes (sendfile / mmap).
+                resp = send_file('PUT', url, self.file_path, headers=headers, auth=('', self.api_key),
+                                 before_chunk=self._before_chunk, on_chunk=on_chunk, pool=self.pool)
+
+        if resp.status_code not in (201, 200):
+            return {
+                "error": resp.text or f"HTTP Error {resp.status_code}",
+                "transient": resp.status_code in TRANSIENT_HTTP_STATUSES,
+            }
+
+        rj = resp.json()
+        file_id = rj.get('id')
+        if not file_id:
+            return {"error": f"Brak ID w odpowiedzi: {rj}"}
+
+        links = {"viewer_url": VIEW_URL.format(file_id), "direct_url": EMBED_URL.format(file_id)}
+        if digest:
+            self.record_upload(self.dedup, DEDUP_SERVICE, self.api_key, digest, file_id, links)
+        self.signals.progress.emit(100)
+        return dict(links, status=200, file_id=file_id)
+
+class ApiSignals(QObject):
     finished = pyqtSignal(dict)
 
-class UploadWorker(QRunnable):
-    def __init__(self, file_path, api_key):
+class ApiWorker(QRunnable):
+    """Wykonuje zapytanie GET do API poza wątkiem GUI i oddaje wynik sygnałem."""
+    def __init__(self, url, api_key, timeout=API_TIMEOUT, postprocess=None):
         super().__init__()
-        self.file_path = file_path
+        self.url = url
         self.api_key = api_key
-        self.signals = WorkerSignals()
+        self.timeout = timeout
+        self.postprocess = postprocess  # dodatkowa obróbka odpowiedzi, też poza wątkiem GUI
+        self.cancelled = False
+        self.signals = ApiSignals()
+
+    def cancel(self):
+        # Zapytania requests nie da się przerwać w locie - po anulowaniu wynik jest po prostu porzucany.
+        self.cancelled = True
+
     def run(self):
         try:
-            file_name = os.path.basename(self.file_path)
-            url = UPLOAD_URL.format(file_name)
-            with open(self.file_path, 'rb') as f:
-                total_size = os.path.getsize(self.file_path)
-                uploaded_size = 0
-                chunk_size = 8192
-                def gen():
-                    nonlocal uploaded_size
-                    while True:
-                        data = f.read(chunk_size)
-                        if not data: break
-                        uploaded_size += len(data)
-                        prog = int((uploaded_size / total_size) * 100)
-                        self.signals.progress.emit(prog)
-                        yield data
-                
-                headers = {'Content-Type': 'application/octet-stream'}
-                resp = requests.put(url, data=gen(), auth=('', self.api_key), headers=headers)
-
-            if resp.status_code not in (201, 200):
-                self.signals.finished.emit({"error": resp.text or f"HTTP Error {resp.status_code}"})
-                return
+            r = get_session().get(self.url, auth=('', self.api_key), timeout=self.timeout)
+            try:
+                data = r.json()
+            except ValueError:
+                data = {"message": r.text}
+            result = {"status": r.status_code, "data": data}
+            if self.postprocess and r.status_code == 200:
+                result.update(self.postprocess(data))
+        except Exception as e:
+            result = {"error": str(e)}
+        if not self.cancelled:
+            self.signals.finished.emit(result)
 
-            rj = resp.json()
-            file_id = rj.get('id')
-            if not file_id:
-                self.signals.finished.emit({"error": f"Brak ID w odpowiedzi: {rj}"})
-                return
+class TaskWorker(QRunnable):
+    """Uruchamia funkcję (np. odczyt cache z dysku) poza wątkiem GUI; wynik (dict) oddaje sygnałem."""
+    def __init__(self, fn):
+        super().__init__()
+        self.fn = fn
+        self.cancelled = False
+        self.signals = ApiSignals()
 
-            self.signals.progress.emit(100)
-            self.signals.finished.emit({
-                "status": 200, "file_id": file_id,
-                "viewer_url": VIEW_URL.format(file_id),
-                "direct_url": EMBED_URL.format(file_id)
-            })
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            result = self.fn()
         except Exception as e:
-            self.signals.finished.emit({"error": str(e)})
+            result = {"error": str(e)}
+        if not self.cancelled:
+            self.signals.finished.emit(result)
+
+class RemoteFileModel(QAbstractListModel):
+    """Lista plików z konta - same dane, bez widżetów; wiersze rysuje RemoteFileDelegate."""
+    EntryRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = entries
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return entry.name
+        if role == self.EntryRole:
+            return entry
+        return None
+
+class RemoteFileDelegate(QStyledItemDelegate):
+    """Rysuje wiersz pliku (nazwa, data, statystyki, przyciski) i obsługuje kliknięcia w przyciski."""
+    action_triggered = pyqtSignal(str, dict)
+
+    PADDING = 6
+    SPACING = 4
+    BUTTON_HEIGHT = 26
+    BUTTONS = [("open", "🔗 Otwórz"), ("copy", "📋 Kopiuj Link")]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pressed = None  # (wiersz, akcja) wciśniętego przycisku
+
+    def _fonts(self, base):
+        name_font = QFont(base)
+        name_font.setBold(True)
+        name_font.setPixelSize(14)
+        small_font = QFont(base)
+        small_font.setPixelSize(10)
+        stats_font = QFont(base)
+        stats_font.setPixelSize(11)
+        return name_font, small_font, stats_font
+
+    def _button_rects(self, rect, font):
+        fm = QFontMetrics(font)
+        x = rect.left() + self.PADDING
+        y = rect.bottom() - self.PADDING - self.BUTTON_HEIGHT
+        rects = []
+        for action, label in self.BUTTONS:
+            width = fm.horizontalAdvance(label) + 24
+            rects.append((action, label, QRect(x, y, width, self.BUTTON_HEIGHT)))
+            x += width + self.SPACING
+        return rects
+
+    def sizeHint(self, option, index):
+        name_font, _, stats_font = self._fonts(option.font)
+        height = (QFontMetrics(name_font).height() + QFontMetrics(stats_font).height()
+                  + self.BUTTON_HEIGHT + 2 * self.PADDING + 2 * self.SPACING)
+        return QSize(option.rect.width(), height)
+
+    def paint(self, painter, option, index):
+        entry = index.data(RemoteFileModel.EntryRole)
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+
+        # Tło i zaznaczenie rysuje styl, tekst rysujemy sami.
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, widget)
+
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        text_color = option.palette.highlightedText().color() if selected else option.palette.text().color()
+        name_font, small_font, stats_font = self._fonts(option.font)
+        rect = option.rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+
+        painter.save()
+        # Górny wiersz: Nazwa i Data
+        date_str = entry.date_str
+        painter.setFont(small_font)
+        painter.setPen(Qt.GlobalColor.gray)
+        date_width = QFontMetrics(small_font).horizontalAdvance(date_str)
+        name_height = QFontMetrics(name_font).height()
+        painter.drawText(QRect(rect.right() - date_width, rect.top(), date_width, name_height),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, date_str)
+        painter.setFont(name_font)
+        painter.setPen(text_color)
+        name_rect = QRect(rect.left(), rect.top(), rect.width() - date_width - 10, name_height)
+        name = QFontMetrics(name_font).elidedText(entry.name, Qt.TextElideMode.ElideMiddle, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, name)
 
-class FileUploadWidget(QWidget):
-    def __init__(self, file_path):
-        super().__init__()
-        self.file_path = file_path
-        self.viewer_url = ""
-        self.direct_url = ""
-        self.setup_ui()
+        # Środkowy wiersz: Statystyki
+        painter.setFont(stats_font)
+        stats = f"💾 {format_size(entry.size)}     👁️ {entry.views}     ⬇️ {entry.downloads}"
+        stats_top = rect.top() + name_height + self.SPACING
+        painter.drawText(QRect(rect.left(), stats_top, rect.width(), QFontMetrics(stats_font).height()),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, stats)
+        painter.restore()
 
-    def setup_ui(self):
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5,5,5,5)
-        self.title_label = QLabel(f"⏳ {os.path.basename(self.file_path)}")
-        self.progress = QProgressBar()
-        layout.addWidget(self.title_label)
-        layout.addWidget(self.progress)
-        hl = QHBoxLayout()
-        self.viewer_btn = QPushButton("🔗 Otwórz link")
-        self.viewer_btn.setEnabled(False)
-        self.viewer_btn.clicked.connect(lambda: webbrowser.open(self.viewer_url) if self.viewer_url else None)
-        self.direct_btn = QPushButton("📋 Kopiuj link file")
-        self.direct_btn.setEnabled(False)
-        self.direct_btn.clicked.connect(lambda: QApplication.clipboard().setText(self.direct_url) if self.direct_url else None)
-        hl.addWidget(self.viewer_btn)
-        hl.addWidget(self.direct_btn)
-        layout.addLayout(hl)
+        # Dolny wiersz: Przyciski
+        for action, label, button_rect in self._button_rects(option.rect, option.font):
+            button = QStyleOptionButton()
+            button.rect = button_rect
+            button.text = label
+            button.state = QStyle.StateFlag.State_Enabled
+            if self.pressed == (index.row(), action):
+                button.state |= QStyle.StateFlag.State_Sunken
+            else:
+                button.state |= QStyle.StateFlag.State_Raised
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+        pos = event.position().toPoint()
+        hit = next((action for action, _, r in self._button_rects(option.rect, option.font) if r.contains(pos)), None)
+        if event.type() == QEvent.Type.MouseButtonPress:
+            self.pressed = (index.row(), hit) if hit else None
+            return hit is not None
+        pressed, self.pressed = self.pressed, None
+        if hit and pressed == (index.row(), hit):
+            self.action_triggered.emit(hit, index.data(RemoteFileModel.EntryRole).file)
+            return True
+        return False
 
 class PixeldrainApp(QWidget):
     def __init__(self):
@@ -119,14 +310,43 @@ class PixeldrainApp(QWidget):
         self.setGeometry(150, 150, 1100, 750)
         self.selected_files = []
         self.remote_files = [] # Cache for fetched files
-        self.threadpool = QThreadPool()
+        self.remote_index = RemoteFileIndex()
+        try:
+            self.file_cache = RemoteFileCache(CACHE_FILE)
+        except Exception as e:
+            print(f"Nie udało się otworzyć cache plików: {e}")
+            self.file_cache = None
+        try:
+            self.journal = UploadJournal(JOURNAL_FILE)
+        except Exception as e:
+            print(f"Nie udało się otworzyć dziennika wysyłania: {e}")
+            self.journal = None
+        try:
+            self.dedup = DedupIndex(DEDUP_FILE)
+        except Exception as e:
+            print(f"Nie udało się otworzyć indeksu duplikatów: {e}")
+            self.dedup = None
+        self.limiter = BandwidthLimiter()
+        self.scheduler = UploadScheduler(parent=self)
+        self.api_pool = QThreadPool(self)
+        self.api_requests = {}
+        self.metrics_dialog = None
+        self.closing = False
+        self.profiles = []
+        self.routes = []
+        self.account_progress = AccountProgress()
+        self.account_items = {}
         self.setup_ui()
         self.load_api_key()
+        self.load_cached_files()
+        # Wznawianie kolejki (dziennik, rozmiary plików) dopiero po pokazaniu okna.
+        QTimer.singleShot(0, self.resume_pending_uploads)
 
     def setup_ui(self):
         self.api_key_input = QLineEdit()
         self.api_key_input.setPlaceholderText("Wpisz swój Pixeldrain API key...")
         self.api_key_input.setEchoMode(QLineEdit.EchoMode.Password)
+        self.api_key_input.editingFinished.connect(self.sync_profile_key)
         self.show_key_btn = QPushButton("👁️")
         self.show_key_btn.setCheckable(True)
         self.show_key_btn.toggled.connect(lambda c: self.api_key_input.setEchoMode(QLineEdit.EchoMode.Normal if c else QLineEdit.EchoMode.Password))
@@ -135,6 +355,16 @@ class PixeldrainApp(QWidget):
         hl_key.addWidget(self.api_key_input)
         hl_key.addWidget(self.show_key_btn)
 
+        # Profile kluczy - pliki z partii mogą trafić na różne konta według reguł.
+        self.profile_combo = QComboBox()
+        self.profile_combo.setToolTip("Konto, którego dotyczą lista plików i informacje; domyślne konto wysyłania.")
+        self.profile_combo.currentIndexChanged.connect(self.on_profile_changed)
+        self.profiles_btn = QPushButton("Konta…")
+        self.profiles_btn.clicked.connect(self.manage_profiles)
+        hl_profile = QHBoxLayout()
+        hl_profile.addWidget(self.profile_combo, 1)
+        hl_profile.addWidget(self.profiles_btn)
+
         self.info_btn = QPushButton("Pobierz info o koncie")
         self.info_btn.clicked.connect(self.get_account_info)
 
@@ -149,10 +379,30 @@ class PixeldrainApp(QWidget):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("🔍 Szukaj plików...")
-        self.search_input.textChanged.connect(self.filter_file_list)
+        self.search_input.setToolTip("Filtry: rozmiar>1GB, wyświetlenia>=10, pobrania<5, data>=2024-01-01, data=2024-05-20")
+        # Filtrujemy dopiero po krótkiej przerwie w pisaniu, a nie po każdym klawiszu.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.filter_file_list)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+        self.sort_combo = QComboBox()
+        for key, label in SORT_KEYS:
+            self.sort_combo.addItem(label, key)
+        self.sort_combo.currentIndexChanged.connect(self.filter_file_list)
+        self.sort_desc_btn = QPushButton("↓")
+        self.sort_desc_btn.setCheckable(True)
+        self.sort_desc_btn.setToolTip("Sortuj malejąco")
+        self.sort_desc_btn.toggled.connect(self.filter_file_list)
+        hl_sort = QHBoxLayout()
+        hl_sort.addWidget(QLabel("Sortuj:"))
+        hl_sort.addWidget(self.sort_combo, 1)
+        hl_sort.addWidget(self.sort_desc_btn)
 
         left_panel = QVBoxLayout()
         left_panel.addWidget(QLabel("<b>Konfiguracja:</b>"))
+        left_panel.addLayout(hl_profile)
         left_panel.addLayout(hl_key)
         left_panel.addWidget(self.info_btn)
         left_panel.addSpacing(15)
@@ -162,10 +412,39 @@ class PixeldrainApp(QWidget):
         hl_upload.addWidget(self.choose_btn)
         hl_upload.addWidget(self.upload_btn)
         left_panel.addLayout(hl_upload)
+
+        # --- Ustawienia kolejki wysyłania ---
+        self.parallel_spin = QSpinBox()
+        self.parallel_spin.setRange(1, MAX_PARALLEL)
+        self.parallel_spin.setValue(DEFAULT_MAX_PARALLEL)
+        self.parallel_spin.valueChanged.connect(self.scheduler.set_max_parallel)
+        self.order_combo = QComboBox()
+        for key, label in UPLOAD_ORDERS:
+            self.order_combo.addItem(label, key)
+        self.order_combo.currentIndexChanged.connect(
+            lambda _: setattr(self.scheduler, "order", self.order_combo.currentData()))
+        self.limit_spin = QSpinBox()
+        self.limit_spin.setRange(0, 1000)
+        self.limit_spin.setSuffix(" MB/s")
+        self.limit_spin.setSpecialValueText("bez limitu")
+        self.limit_spin.valueChanged.connect(lambda v: self.limiter.set_rate(v * 1024 * 1024))
+        self.dedup_check = QCheckBox("Nie wysyłaj ponownie identycznych plików")
+        self.dedup_check.setChecked(True)
+        self.dedup_check.setToolTip("Porównuje zawartość pliku (BLAKE2b) z plikami już wysłanymi na to konto.")
+        queue_form = QFormLayout()
+        queue_form.addRow("Równolegle:", self.parallel_spin)
+        queue_form.addRow("Kolejność:", self.order_combo)
+        queue_form.addRow("Limit prędkości:", self.limit_spin)
+        left_panel.addLayout(queue_form)
+        left_panel.addWidget(self.dedup_check)
+        metrics_btn = QPushButton("Metryki transferów…")
+        metrics_btn.clicked.connect(self.show_metrics)
+        left_panel.addWidget(metrics_btn)
         left_panel.addSpacing(15)
         
         left_panel.addWidget(QLabel("<b>Zarządzanie plikami:</b>"))
         left_panel.addWidget(self.search_input)
+        left_panel.addLayout(hl_sort)
         left_panel.addWidget(self.show_files_btn)
         left_panel.addStretch()
 
@@ -178,17 +457,44 @@ class PixeldrainApp(QWidget):
         self.output.setReadOnly(True)
         log_layout.addWidget(self.output)
 
-        # --- Lista plików ---
+        # --- Pliki na koncie (model + delegat - koszt mają tylko widoczne wiersze) ---
+        remote_widget = QWidget()
+        remote_layout = QVBoxLayout(remote_widget)
+        remote_layout.setContentsMargins(0,0,0,0)
+        self.remote_status = QLabel("Kliknij 'Odśwież listę plików', aby pobrać pliki z konta.")
+        self.remote_model = RemoteFileModel(self)
+        self.remote_delegate = RemoteFileDelegate(self)
+        self.remote_delegate.action_triggered.connect(self.on_remote_file_action)
+        self.remote_view = QListView()
+        self.remote_view.setModel(self.remote_model)
+        self.remote_view.setItemDelegate(self.remote_delegate)
+        self.remote_view.setUniformItemSizes(True)
+        self.remote_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        remote_layout.addWidget(self.remote_status)
+        remote_layout.addWidget(self.remote_view)
+
+        # --- Wysyłane pliki (z podsumowaniem postępu każdego konta) ---
+        self.file_list = TransferListView()
+        self.file_list.action_triggered.connect(self.on_upload_action)
+        self.account_table = QTreeWidget()
+        self.account_table.setHeaderLabels(["Konto", "Pliki", "Wysłano", "Postęp", "Prędkość"])
+        self.account_table.setRootIsDecorated(False)
+        self.account_table.header().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.account_table.setMaximumHeight(110)
+        self.account_table.hide()
         upload_widget = QWidget()
         upload_layout = QVBoxLayout(upload_widget)
         upload_layout.setContentsMargins(0,0,0,0)
-        upload_layout.addWidget(QLabel("Lista plików:"))
-        self.file_list = QListWidget()
+        upload_layout.addWidget(self.account_table)
         upload_layout.addWidget(self.file_list)
 
+        self.list_tabs = QTabWidget()
+        self.list_tabs.addTab(remote_widget, "Pliki na koncie")
+        self.list_tabs.addTab(upload_widget, "Wysyłanie")
+
         splitter = QSplitter(Qt.Orientation.Vertical)
         splitter.addWidget(log_widget)
-        splitter.addWidget(upload_widget)
+        splitter.addWidget(self.list_tabs)
         splitter.setSizes([150, 550])
 
         right_panel = QVBoxLayout()
@@ -205,199 +511,476 @@ class PixeldrainApp(QWidget):
         main_layout.addLayout(right_panel, 1) # Prawa strona zajmuje resztę miejsca
 
     def load_api_key(self):
-        if os.path.exists(CONFIG_FILE):
+        config = load_config(CONFIG_FILE)
+        if config:
             try:
-                with open(CONFIG_FILE, "r") as f:
-                    self.api_key_input.setText(json.load(f).get("api_key", ""))
+                self.profiles, self.routes, active = load_profiles(config)
+                self.populate_profiles(active)
+                self.parallel_spin.setValue(config.get("max_parallel", DEFAULT_MAX_PARALLEL))
+                index = self.order_combo.findData(config.get("order", "fifo"))
+                self.order_combo.setCurrentIndex(max(0, index))
+                self.limit_spin.setValue(config.get("bandwidth_limit_mb", 0))
+                self.dedup_check.setChecked(config.get("dedup", True))
             except: pass
 
+    def populate_profiles(self, active):
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        for p in self.profiles:
+            self.profile_combo.addItem(p["name"], p["name"])
+        self.profile_combo.setCurrentIndex(max(0, self.profile_combo.findData(active)))
+        self.profile_combo.blockSignals(False)
+        profile = self.current_profile()
+        self.api_key_input.setText(profile["api_key"] if profile else "")
+
+    def current_profile(self):
+        name = self.profile_combo.currentData()
+        return next((p for p in self.profiles if p["name"] == name), None)
+
+    def profile_key(self, name):
+        return next((p["api_key"] for p in self.profiles if p["name"] == name), None)
+
+    def sync_profile_key(self):
+        """Klucz wpisany ręcznie w pole zapisuje się do aktywnego profilu (lub tworzy pierwszy profil)."""
+        key = self.api_key_input.text().strip()
+        if not key:
+            return
+        profile = self.current_profile()
+        if profile is None:
+            self.profiles.append({"name": DEFAULT_PROFILE, "api_key": key})
+            self.populate_profiles(DEFAULT_PROFILE)
+        else:
+            profile["api_key"] = key
+
+    def on_profile_changed(self):
+        profile = self.current_profile()
+        self.api_key_input.setText(profile["api_key"] if profile else "")
+        self.remote_files = []
+        self.remote_index = RemoteFileIndex()
+        self.remote_model.set_entries([])
+        self.remote_status.setText("Kliknij 'Odśwież listę plików', aby pobrać pliki z konta.")
+        self.save_api_key()
+        self.load_cached_files()
+
+    def manage_profiles(self):
+        self.sync_profile_key()
+        dialog = KeyProfilesDialog(self.profiles, self.routes, self)
+        if dialog.exec():
+            self.profiles = dialog.profiles
+            self.routes = dialog.rules
+            self.populate_profiles(self.profile_combo.currentData())
+            self.save_api_key()
+            self.on_profile_changed()
+
     def save_api_key(self):
+        self.sync_profile_key()
         key = self.api_key_input.text().strip()
         try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump({"api_key": key}, f)
+            save_config(CONFIG_FILE, {
+                "api_key": key,
+                "profiles": self.profiles,
+                "routes": self.routes,
+                "active_profile": self.profile_combo.currentData(),
+                "max_parallel": self.parallel_spin.value(),
+                "order": self.order_combo.currentData(),
+                "bandwidth_limit_mb": self.limit_spin.value(),
+                "dedup": self.dedup_check.isChecked(),
+            })
         except Exception as e:
             self.output.append(f"⚠️ Nie udało się zapisać API key: {e}")
 
+    def run_api_request(self, name, url, key, callback, postprocess=None):
+        """Uruchamia zapytanie w tle; nowe zapytanie tego samego rodzaju anuluje poprzednie."""
+        self.run_background(name, ApiWorker(url, key, postprocess=postprocess), callback)
+
+    def run_background(self, name, worker, callback):
+        previous = self.api_requests.pop(name, None)
+        if previous:
+            previous.cancel()
+        worker.signals.finished.connect(lambda res, w=worker: self._api_request_finished(name, w, res, callback))
+        self.api_requests[name] = worker
+        self.api_pool.start(worker)
+
+    def _api_request_finished(self, name, worker, result, callback):
+        if self.api_requests.get(name) is worker:
+            del self.api_requests[name]
+        callback(result)
+
+    def closeEvent(self, event):
+        for worker in self.api_requests.values():
+            worker.cancel()
+        self.api_requests.clear()
+        # Zadania przerwane zamknięciem okna zostają w dzienniku jako niedokończone i wrócą po restarcie.
+        self.closing = True
+        self.scheduler.cancel_all()
+        super().closeEvent(event)
+
     def get_account_info(self):
         key = self.api_key_input.text().strip()
         if not key: return QMessageBox.warning(self, "Błąd", "Podaj API key!")
         self.save_api_key()
         self.output.setText("Pobieranie informacji o koncie...")
-        try:
-            r = requests.get(USER_INFO_URL, auth=('', key))
-            data = r.json()
-            if r.status_code == 200:
-                self.output.setText(json.dumps(data, indent=2))
-            else:
-                self.output.setText(f"Błąd API (Status: {r.status_code}):\n{json.dumps(data, indent=2)}")
-        except Exception as e:
-            self.output.setText(f"Błąd połączenia: {e}")
+        self.run_api_request("account", USER_INFO_URL, key, self.on_account_info)
+
+    def on_account_info(self, result):
+        if "error" in result:
+            self.output.setText(f"Błąd połączenia: {result['error']}")
+        elif result["status"] == 200:
+            self.output.setText(json.dumps(result["data"], indent=2))
+        else:
+            self.output.setText(f"Błąd API (Status: {result['status']}):\n{json.dumps(result['data'], indent=2)}")
+
+    def load_cached_files(self):
+        """Pokazuje listę z lokalnego cache od razu po starcie, a potem synchronizuje ją w tle."""
+        key = self.api_key_input.text().strip()
+        if not key or not self.file_cache:
+            return
+        account = account_id(key)
+        cache = self.file_cache
+
+        def load():
+            files = cache.load(account)
+            return {"files": files, "index": RemoteFileIndex(files), "synced_at": cache.synced_at(account)}
+
+        self.remote_status.setText("Wczytywanie listy plików z cache...")
+        self.run_background("files", TaskWorker(load), lambda res: self.on_cached_files(res, key))
+
+    def on_cached_files(self, result, key):
+        if "error" in result:
+            self.output.append(f"⚠️ Nie udało się wczytać cache plików: {result['error']}")
+        elif result["files"]:
+            self.remote_files = result["files"]
+            self.remote_index = result["index"]
+            synced = time.strftime("%Y-%m-%d %H:%M", time.localtime(result["synced_at"])) if result["synced_at"] else "?"
+            self.output.append(f"💾 Wczytano {len(self.remote_files)} plików z cache (stan z {synced}).")
+            self.filter_file_list()
+        self.sync_remote_files(key)
+
+    def show_metrics(self):
+        # Okno metryk ładowane dopiero przy pierwszym użyciu, potem tylko pokazywane.
+        if self.metrics_dialog is None:
+            from dlc_common.metrics_view import MetricsDialog
+            self.metrics_dialog = MetricsDialog(self)
+        self.metrics_dialog.show()
+        self.metrics_dialog.raise_()
 
     def show_remote_files(self):
         key = self.api_key_input.text().strip()
         if not key: return QMessageBox.warning(self, "Błąd", "Podaj API key!")
-        
-        self.file_list.clear()
-        self.file_list.addItem("Ładowanie listy plików...")
-        QApplication.processEvents()
+        self.list_tabs.setCurrentIndex(0)
+        self.sync_remote_files(key)
 
-        try:
-            r = requests.get(FILES_URL, auth=('', key))
-            data = r.json()
+    def sync_remote_files(self, key):
+        if not self.remote_files:
+            self.remote_status.setText("Ładowanie listy plików...")
+        self.show_files_btn.setEnabled(False)
+        cache = self.file_cache
+        dedup = self.dedup
+        account = account_id(key)
+
+        def postprocess(data):
+            # Zapis różnic do cache i budowa indeksu odbywają się jeszcze w wątku roboczym.
+            files = data.get("files", [])
+            result = {"index": RemoteFileIndex(files)}
+            if cache:
+                # Błąd zapisu cache nie może zabrać listy plików pobranej z serwera.
+                try:
+                    added, removed_ids, changed = cache.apply(account, files)
+                    result["diff"] = (added, len(removed_ids), changed)
+                    if dedup:
+                        # Pliki usunięte z konta nie mogą już służyć jako gotowe linki dla duplikatów.
+                        for file_id in removed_ids:
+                            dedup.forget(DEDUP_SERVICE, key, file_id)
+                except (OSError, sqlite3.Error) as e:
+                    result["warning"] = f"Nie udało się zapisać listy plików w cache: {e}"
+            return result
+
+        self.run_api_request("files", FILES_URL, key, self.on_remote_files, postprocess=postprocess)
+
+    def on_remote_files(self, result):
+        self.show_files_btn.setEnabled(True)
+        if "error" in result:
+            self.output.append(f"Błąd połączenia: {result['error']}")
+            self.remote_status.setText("Błąd połączenia.")
+            return
+
+        data = result["data"]
+        if result["status"] == 200 and "files" in data:
+            self.remote_files = data.get("files", [])
+            self.remote_index = result.get("index") or RemoteFileIndex(self.remote_files)
+            if result.get("warning"):
+                self.output.append(f"⚠️ {result['warning']}")
+            if not self.remote_files:
+                self.remote_model.set_entries([])
+                self.output.append("📂 Twoje konto Pixeldrain jest puste.")
+                self.remote_status.setText("Brak plików na koncie")
+                return
             
-            if r.status_code == 200 and "files" in data:
-                self.remote_files = data.get("files", [])
-                if not self.remote_files:
-                    self.file_list.clear()
-                    self.output.append("📂 Twoje konto Pixeldrain jest puste.")
-                    self.file_list.addItem("Brak plików na koncie")
-                    return
-                
-                self.output.append(f"📄 Pobrano listę {len(self.remote_files)} plików.")
-                self.filter_file_list() # Wywołuje wyświetlenie z uwzględnieniem filtra
+            diff = result.get("diff")
+            if diff:
+                added, removed, changed = diff
+                self.output.append(
+                    f"🔄 Zsynchronizowano {len(self.remote_files)} plików "
+                    f"(nowe: {added}, usunięte: {removed}, zmienione: {changed}).")
             else:
-                self.file_list.clear()
-                self.output.append(f"Błąd API (Status: {r.status_code}):\n{json.dumps(data, indent=2)}")
-                self.file_list.addItem("Nie udało się załadować plików.")
-        except Exception as e:
-            self.file_list.clear()
-            self.output.append(f"Błąd połączenia: {e}")
-            self.file_list.addItem("Błąd połączenia.")
+                self.output.append(f"📄 Pobrano listę {len(self.remote_files)} plików.")
+            self.filter_file_list() # Wywołuje wyświetlenie z uwzględnieniem filtra
+        else:
+            self.output.append(f"Błąd API (Status: {result['status']}):\n{json.dumps(data, indent=2)}")
+            self.remote_status.setText("Nie udało się załadować plików.")
 
     def filter_file_list(self):
-        """Filtruje i wyświetla pliki z cache (self.remote_files) na podstawie search_input."""
-        query = self.search_input.text().lower()
-        self.file_list.clear()
+        """Filtruje i sortuje pliki z indeksu (self.remote_index) na podstawie search_input."""
+        self.search_timer.stop()
+        query = self.search_input.text()
+        entries = self.remote_index.search(query, self.sort_combo.currentData(), self.sort_desc_btn.isChecked())
+        self.remote_model.set_entries(entries)
 
-        if not self.remote_files:
+        if not len(self.remote_index):
             return
+        if not entries and query:
+            self.remote_status.setText("Brak wyników wyszukiwania.")
+        else:
+            self.remote_status.setText(f"Plików: {len(entries)} z {len(self.remote_index)}")
 
-        filtered_files = [f for f in self.remote_files if query in f.get("name", "").lower()]
-        
-        for f in filtered_files:
-            self.add_remote_file_to_list(f)
-            
-        if not filtered_files and query:
-            self.file_list.addItem("Brak wyników wyszukiwania.")
-
-    def add_remote_file_to_list(self, f):
+    def on_remote_file_action(self, action, f):
         file_id = f.get("id")
-        name = f.get("name", "(brak nazwy)")
-        size = f.get("size", 0)
-        views = f.get("views", 0)
-        downloads = f.get("downloads", 0)
-        date_upload = f.get("date_upload", "")
-        
-        # Formatowanie daty
-        date_str = date_upload
-        try:
-            # Próba parsowania daty (zależy od formatu API Pixeldrain, zazwyczaj ISO)
-            dt = datetime.datetime.fromisoformat(date_upload.replace("Z", "+00:00"))
-            date_str = dt.strftime("%Y-%m-%d %H:%M")
-        except:
-            pass
-
-        view_url, embed_url = VIEW_URL.format(file_id), EMBED_URL.format(file_id)
-        
-        item_widget = QWidget()
-        item_layout = QVBoxLayout(item_widget)
-        item_layout.setContentsMargins(5, 5, 5, 5)
-        item_layout.setSpacing(2)
-        
-        # Górny wiersz: Nazwa i Data
-        top_row = QHBoxLayout()
-        name_label = QLabel(f"<b>{name}</b>")
-        name_label.setStyleSheet("font-size: 14px;")
-        date_label = QLabel(f"<span style='color: gray; font-size: 10px;'>{date_str}</span>")
-        top_row.addWidget(name_label)
-        top_row.addStretch()
-        top_row.addWidget(date_label)
-        item_layout.addLayout(top_row)
-
-        # Środkowy wiersz: Statystyki
-        stats_row = QHBoxLayout()
-        stats_style = "color: #DDD; font-size: 11px;" # Jasny tekst dla ciemnego motywu, ale uniwersalny
-        
-        size_lbl = QLabel(f"💾 {format_size(size)}")
-        views_lbl = QLabel(f"👁️ {views}")
-        downloads_lbl = QLabel(f"⬇️ {downloads}")
-        
-        # Dodajemy trochę odstępu między statystykami
-        stats_row.addWidget(size_lbl)
-        stats_row.addSpacing(15)
-        stats_row.addWidget(views_lbl)
-        stats_row.addSpacing(15)
-        stats_row.addWidget(downloads_lbl)
-        stats_row.addStretch()
-        item_layout.addLayout(stats_row)
-
-        # Dolny wiersz: Przyciski
-        buttons_layout = QHBoxLayout()
-        view_btn = QPushButton("🔗 Otwórz")
-        view_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        view_btn.clicked.connect(lambda: webbrowser.open(view_url))
-        
-        embed_btn = QPushButton("📋 Kopiuj Link")
-        embed_btn.setCursor(Qt.CursorShape.PointingHandCursor)
-        embed_btn.clicked.connect(lambda: QApplication.clipboard().setText(embed_url))
-        
-        buttons_layout.addWidget(view_btn)
-        buttons_layout.addWidget(embed_btn)
-        buttons_layout.addStretch()
-        item_layout.addLayout(buttons_layout)
-        
-        # Linia oddzielająca (opcjonalnie, ale QListWidget ma swoje)
-        
-        list_item = QListWidgetItem()
-        list_item.setSizeHint(item_widget.sizeHint())
-        self.file_list.addItem(list_item)
-        self.file_list.setItemWidget(list_item, item_widget)
+        if action == "open":
+            webbrowser.open(VIEW_URL.format(file_id))
+        elif action == "copy":
+            QApplication.clipboard().setText(EMBED_URL.format(file_id))
 
     def choose_files(self):
         paths, _ = QFileDialog.getOpenFileNames(self, "Wybierz pliki", "", "Wszystkie pliki (*)")
         if paths:
             self.selected_files = paths
             self.output.append(f"Wybrano {len(paths)} plików do wysłania.")
-            self.file_list.clear()
-            self.file_list.addItem(f"Gotowe do wysłania: {len(paths)} plików. Naciśnij 'Wyślij pliki'.")
+            self.list_tabs.setCurrentIndex(1)
+            if not self.scheduler.is_busy():
+                self.file_list.transfers.clear()
+                self.output.append("Naciśnij 'Wyślij pliki', aby rozpocząć wysyłanie.")
 
     def upload_files(self):
         key = self.api_key_input.text().strip()
         if not key or not self.selected_files:
             return QMessageBox.warning(self, "Błąd", "Podaj API key i wybierz pliki!")
         self.save_api_key()
-        self.file_list.clear()
-        
+        default = self.profile_combo.currentData()
+        jobs = []
         for file_path in self.selected_files:
-            widget = FileUploadWidget(file_path)
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(widget.sizeHint())
-            self.file_list.addItem(list_item)
-            self.file_list.setItemWidget(list_item, widget)
-
-            worker = UploadWorker(file_path, key)
-            worker.signals.progress.connect(widget.progress.setValue)
-            worker.signals.finished.connect(lambda res, w=widget: self.upload_finished(res, w))
-            self.threadpool.start(worker)
-
-    def upload_finished(self, result, widget):
+            profile = route_file(file_path, self.routes, default)
+            jobs.append((file_path, None, profile, self.profile_key(profile) or key))
+        counts = {}
+        for _, _, profile, _ in jobs:
+            counts[profile] = counts.get(profile, 0) + 1
+        if len(counts) > 1:
+            self.output.append("🔀 Podział na konta: " + ", ".join(f"{n}: {c}" for n, c in counts.items()))
+        self.enqueue_uploads(jobs)
+
+    def resume_pending_uploads(self):
+        """Po ponownym uruchomieniu dodaje do kolejki niedokończone zadania z dziennika (ze wszystkich kont)."""
+        if not self.journal:
+            return
+        jobs = []
+        for profile in self.profiles:
+            try:
+                pending = self.journal.incomplete(account_id(profile["api_key"]))
+            except Exception as e:
+                self.output.append(f"⚠️ Nie udało się odczytać dziennika wysyłania: {e}")
+                return
+            jobs.extend((job["path"], job, profile["name"], profile["api_key"]) for job in pending)
+        if jobs:
+            self.output.append(f"♻️ Wznawianie {len(jobs)} niedokończonych zadań wysyłania z poprzedniej sesji.")
+            self.enqueue_uploads(jobs)
+
+    def enqueue_uploads(self, jobs):
+        """jobs: lista (ścieżka, wpis z dziennika lub None dla nowego zadania, nazwa profilu, API key)."""
+        # Nie usuwamy zadań, które wciąż czekają lub trwają w kolejce.
+        if not self.scheduler.is_busy():
+            self.file_list.transfers.clear()
+            self.account_progress.clear_finished()
+        self.list_tabs.setCurrentIndex(1)
+
+        workers = []
+        items = []
+        for file_path, job, profile, key in jobs:
+            account = account_id(key)
+            if job is None and self._skip_completed(account, file_path):
+                continue
+            transfer = TransferItem(file_path, "🕓", UPLOAD_ACTIONS)
+            transfer.set_action("open", enabled=False)
+            transfer.set_action("copy", enabled=False)
+            transfer.viewer_url = transfer.direct_url = ""
+            transfer.paused = False
+            items.append(transfer)
+
+            transfer.api_key = key
+            transfer.profile = profile or DEFAULT_PROFILE
+            transfer.attempts = job["attempts"] if job else 0
+            transfer.job_id = job["id"] if job else None
+            if self.journal and transfer.job_id is None:
+                try:
+                    transfer.job_id = self.journal.add(account, file_path)
+                except (OSError, sqlite3.Error) as e:
+                    self.output.append(f"⚠️ Nie można dodać {os.path.basename(file_path)} do dziennika: {e}")
+            worker = self._create_upload_worker(transfer)
+            self.account_progress.add(transfer.profile, transfer, worker.size)
+            workers.append(worker)
+        self.file_list.transfers.add(items)
+        self.refresh_account_progress()
+        self.scheduler.add(workers)
+
+    def _skip_completed(self, account, file_path):
+        """Czy ta sama wersja pliku (ścieżka, rozmiar, mtime) jest już w dzienniku jako wysłana na to konto."""
+        if not self.journal:
+            return False
+        try:
+            file_id = self.journal.completed_file_id(account, file_path)
+        except (OSError, sqlite3.Error) as e:
+            self.output.append(f"⚠️ Nie udało się odczytać dziennika wysyłania: {e}")
+            return False
+        if file_id:
+            self.output.append(f"⏭️ Pominięto, już wysłany: {os.path.basename(file_path)}\n➡️ {VIEW_URL.format(file_id)}")
+        return bool(file_id)
+
+    def on_upload_progress(self, transfer, percent):
+        transfer.set_progress(percent)
+        self.account_progress.update(transfer.profile, transfer, percent)
+        self.refresh_account_progress()
+
+    def refresh_account_progress(self):
+        rows = self.account_progress.rows()
+        self.account_table.setVisible(bool(rows))
+        names = set()
+        for row in rows:
+            names.add(row["name"])
+            item = self.account_items.get(row["name"])
+            if item is None:
+                item = self.account_items[row["name"]] = QTreeWidgetItem(self.account_table)
+            files = f"{row['done_files']}/{row['files']}"
+            if row["failed_files"]:
+                files += f" (błędy: {row['failed_files']})"
+            item.setText(0, ("✅ " if row["finished"] else "⏳ ") + row["name"])
+            item.setText(1, files)
+            item.setText(2, f"{format_size(row['done'])} / {format_size(row['total'])}")
+            item.setText(3, f"{row['percent']}%")
+            item.setText(4, f"{format_size(row['rate'])}/s" if row["rate"] else "-")
+        for name in list(self.account_items):
+            if name not in names:
+                item = self.account_items.pop(name)
+                self.account_table.takeTopLevelItem(self.account_table.indexOfTopLevelItem(item))
+
+    def _create_upload_worker(self, transfer):
+        dedup = self.dedup if self.dedup_check.isChecked() else None
+        # Każde konto ma własną pulę połączeń, więc transfery na różne konta się nie blokują.
+        worker = UploadWorker(transfer.file_path, transfer.api_key, self.limiter, dedup, get_pool(transfer.profile))
+        worker.signals.progress.connect(lambda percent, w=transfer: self.on_upload_progress(w, percent))
+        worker.signals.started.connect(lambda w=transfer: self.upload_started(w))
+        worker.signals.finished.connect(lambda res, w=transfer: self.upload_finished(res, w))
+        if transfer.paused:
+            # Wstrzymane w czasie oczekiwania na ponowienie - nowy worker czeka w kolejce na "Wznów".
+            worker.pause()
+        transfer.worker = worker
+        transfer.retry_timer = None
+        return worker
+
+    def _journal_mark(self, transfer, status, **kwargs):
+        if self.journal and transfer.job_id is not None:
+            try:
+                self.journal.mark(transfer.job_id, status, **kwargs)
+            except Exception as e:
+                self.output.append(f"⚠️ Błąd zapisu dziennika wysyłania: {e}")
+
+    def upload_started(self, transfer):
+        transfer.set_status("⏳")
+        self._journal_mark(transfer, "uploading", attempt=True)
+        transfer.attempts += 1
+
+    def on_upload_action(self, transfer, action):
+        if action == "pause":
+            self.toggle_pause(transfer, not transfer.paused)
+        elif action == "cancel":
+            self.cancel_upload(transfer)
+        elif action == "open" and transfer.viewer_url:
+            webbrowser.open(transfer.viewer_url)
+        elif action == "copy" and transfer.direct_url:
+            QApplication.clipboard().setText(transfer.direct_url)
+
+    def toggle_pause(self, transfer, paused):
+        transfer.paused = paused
+        if paused:
+            self.scheduler.pause(transfer.worker)
+            transfer.set_action("pause", label="▶ Wznów")
+        else:
+            self.scheduler.resume(transfer.worker)
+            transfer.set_action("pause", label="⏸ Wstrzymaj")
+
+    def cancel_upload(self, transfer):
+        if transfer.retry_timer:
+            # Zadanie czeka na ponowienie - nie ma aktywnego workera do anulowania.
+            transfer.retry_timer.stop()
+            transfer.retry_timer = None
+            self.upload_finished({"error": "Anulowano", "cancelled": True}, transfer)
+        else:
+            self.scheduler.cancel(transfer.worker)
+
+    def schedule_retry(self, transfer, error):
+        delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (transfer.attempts - 1)) + random.uniform(0, 1)
+        transfer.set_status("🔁", f"ponowienie za {int(delay)} s (próba {transfer.attempts + 1}/{MAX_UPLOAD_RETRIES + 1})")
+        self.output.append(f"🔁 Błąd przejściowy przy {os.path.basename(transfer.file_path)}: {error}. Ponawiam za {int(delay)} s.")
+        self._journal_mark(transfer, "retry", error=error)
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda w=transfer: self.scheduler.add([self._create_upload_worker(w)]))
+        timer.start(int(delay * 1000))
+        transfer.retry_timer = timer
+
+    @traced("pixeldrain.finish", "gui")
+    def upload_finished(self, result, transfer):
+        if result.get("transient") and transfer.attempts <= MAX_UPLOAD_RETRIES:
+            transfer.set_progress(0)
+            self.schedule_retry(transfer, result.get("error", "Nieznany błąd"))
+            return
+        transfer.set_action("pause", enabled=False)
+        transfer.set_action("cancel", enabled=False)
+        if result.get("cancelled"):
+            transfer.set_status("⛔")
+            self.output.append(f"⛔ Anulowano: {os.path.basename(transfer.file_path)}")
+            if not self.closing:
+                self._journal_mark(transfer, "cancelled")
+            self.account_progress.finish(transfer.profile, transfer, False)
+            self.refresh_account_progress()
+            return
         if result.get("status") == 200:
-            widget.title_label.setText(f"✅ {os.path.basename(widget.file_path)}")
-            widget.viewer_url = result.get("viewer_url", "")
-            widget.direct_url = result.get("direct_url", "")
-            widget.viewer_btn.setEnabled(True)
-            widget.direct_btn.setEnabled(True)
-            self.output.append(f"✅ Wysłano: {os.path.basename(widget.file_path)}\n➡️ {widget.viewer_url}")
+            transfer.set_status("✅")
+            transfer.viewer_url = result.get("viewer_url", "")
+            transfer.direct_url = result.get("direct_url", "")
+            transfer.set_action("open", enabled=True)
+            transfer.set_action("copy", enabled=True)
+            if result.get("dedup"):
+                self.output.append(f"♻️ Już wysłany wcześniej (ta sama zawartość): {os.path.basename(transfer.file_path)}\n➡️ {transfer.viewer_url}")
+            else:
+                self.output.append(f"✅ Wysłano: {os.path.basename(transfer.file_path)}\n➡️ {transfer.viewer_url}")
+            self._journal_mark(transfer, "done", file_id=result.get("file_id"))
+            self.account_progress.finish(transfer.profile, transfer, True)
         else:
             err = result.get("error", "Nieznany błąd")
-            widget.title_label.setText(f"❌ {os.path.basename(widget.file_path)}")
-            self.output.append(f"❌ Błąd przy wysyłaniu {os.path.basename(widget.file_path)}: {err}")
-        widget.progress.setValue(100)
+            transfer.set_status("❌")
+            self.output.append(f"❌ Błąd przy wysyłaniu {os.path.basename(transfer.file_path)}: {err}")
+            self._journal_mark(transfer, "failed", error=err)
+            self.account_progress.finish(transfer.profile, transfer, False)
+        transfer.set_progress(100)
+        self.refresh_account_progress()
+
+def create_window():
+    """Punkt wejścia dla gospodarza dodatków (dlc_common/host.py)."""
+    return PixeldrainApp()
 
 if __name__ == "__main__":
+    from dlc_common.watchdog import install_watchdog
     app = QApplication(sys.argv)
     apply_theme(app)
-    window = PixeldrainApp()
+    install_watchdog(app, os.path.join(DATA_DIR, "watchdog.log"))
+    window = create_window()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,83 @@
+# upload_journal.py
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+# Zadania w tych stanach są wznawiane po ponownym uruchomieniu dodatku.
+INCOMPLETE_STATUSES = ("queued", "uploading", "retry")
+
+
+class UploadJournal:
+    """Trwały dziennik zadań wysyłania (sqlite) - przeżywa zamknięcie programu i zerwanie sieci."""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, account TEXT NOT NULL, path TEXT NOT NULL,"
+                " size INTEGER NOT NULL, mtime REAL NOT NULL, status TEXT NOT NULL, file_id TEXT,"
+                " attempts INTEGER NOT NULL DEFAULT 0, error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS jobs_account_status ON jobs (account, status)")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def add(self, account, path):
+        st = os.stat(path)
+        now = time.time()
+        with self._connect() as db:
+            cur = db.execute(
+                "INSERT INTO jobs (account, path, size, mtime, status, created, updated)"
+                " VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (account, path, st.st_size, st.st_mtime, now, now))
+            return cur.lastrowid
+
+    def mark(self, job_id, status, file_id=None, error=None, attempt=False):
+        with self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, file_id = COALESCE(?, file_id), error = ?,"
+                " attempts = attempts + ?, updated = ? WHERE id = ?",
+                (status, file_id, error, 1 if attempt else 0, time.time(), job_id))
+
+    def incomplete(self, account):
+        """Zadania do wznowienia; pliki usunięte lub zmienione od czasu dodania są oznaczane jako błędne."""
+        placeholders = ",".join("?" * len(INCOMPLETE_STATUSES))
+        with self._connect() as db:
+            rows = [dict(r) for r in db.execute(
+                f"SELECT * FROM jobs WHERE account = ? AND status IN ({placeholders}) ORDER BY id",
+                (account, *INCOMPLETE_STATUSES))]
+        resumable = []
+        for job in rows:
+            try:
+                st = os.stat(job["path"])
+                unchanged = st.st_size == job["size"] and st.st_mtime == job["mtime"]
+            except OSError:
+                unchanged = False
+            if unchanged:
+                resumable.append(job)
+            else:
+                self.mark(job["id"], "failed", error="Plik został zmieniony lub usunięty.")
+        return resumable
+
+    def completed_file_id(self, account, path):
+        """ID pliku, jeśli ta sama wersja pliku (ścieżka, rozmiar, mtime) została już wysłana."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT file_id FROM jobs WHERE account = ? AND path = ? AND size = ? AND mtime = ?"
+                " AND status = 'done' ORDER BY id DESC LIMIT 1",
+                (account, path, st.st_size, st.st_mtime)).fetchone()
+        return row["file_id"] if row else None
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark dodatków bez sieci: wysyłanie i listy plików Pixeldrain, EarnVids i MEGA przez prawdziwe
+okna dodatków (platforma offscreen), połączone z lokalnymi zastępnikami usług z standins.py.
+
+Dla każdego scenariusza raportowane są: czas, przepustowość (MB/s przy wysyłaniu, pozycje/s przy
+listach), CPU procesu dodatku (i CPU na GB wysłanych danych), zablokowanie wątku GUI (najdłuższa
+przerwa w pętli zdarzeń i suma przerw ponad STALL_THRESHOLD) oraz szczytowe RSS.
+
+Każdy pomiar to świeży proces dodatku; serwery-zastępniki działają w osobnych procesach, a fałszywe
+polecenia MEGAcmd są osobnymi procesami, więc ich CPU nie jest wliczany. Bazy i konfiguracje
+dodatków trafiają do katalogu tymczasowego.
+
+Wyniki można zapisać jako bazowe (--save-baseline) i porównywać z nimi kolejne przebiegi; przy
+regresji ponad tolerancję z TOLERANCES skrypt kończy się kodem 1. Wartości bazowe zależą od
+maszyny - porównuj wyniki z tego samego komputera.
+
+Użycie: python benchmarks/offline_suite.py [--scenario pixeldrain-upload] [--repeat 5]
+            [--files 4] [--size-mb 256] [--list-files 5000] [--latency-ms 0] [--bandwidth-mbps 0]
+            [--save-baseline | --baseline PLIK]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Queue
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DLC = os.path.join(ROOT, "DLC")
+BENCH = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH, "baselines", "offline_suite.json")
+sys.path.insert(0, BENCH)
+
+from standins import run_service, write_fake_megacmd  # noqa: E402
+
+SCENARIOS = (
+    "pixeldrain-upload", "pixeldrain-list",
+    "earnvids-upload", "earnvids-list",
+    "mega-upload", "mega-list",
+)
+HEARTBEAT_MS = 5  # odstęp sygnału pulsu w wątku GUI
+STALL_THRESHOLD = 0.05  # s - przerwy dłuższe od tej wliczają się do sumy zablokowania
+SCENARIO_TIMEOUT = 600  # s
+# metryka -> (kierunek: 1 = większa jest lepsza, -1 = mniejsza jest lepsza, tolerancja względna, próg bezwzględny)
+# Progi są szerokie, bo nawet mediana z kilku krótkich przebiegów waha się o kilkanaście procent.
+TOLERANCES = {
+    "rate": (1, 0.25, 0),
+    "cpu_per_gb": (-1, 0.30, 0.05),
+    "cpu": (-1, 0.30, 0.05),
+    "stall_max": (-1, 1.00, 0.03),
+    "stall_total": (-1, 1.00, 0.10),
+    "rss_mb": (-1, 0.15, 10),
+}
+
+
+# --- proces dodatku ---
+
+def load_plugin(plugin_dir, module):
+    sys.path.insert(0, os.path.join(DLC, plugin_dir))
+    return __import__(module)
+
+
+def wait_until(app, done, timeout=SCENARIO_TIMEOUT):
+    """Kręci pętlą zdarzeń (bez usypiania wątku GUI) aż do done() albo upływu czasu."""
+    from PyQt6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    poll = QTimer()
+    poll.timeout.connect(lambda: done() and loop.quit())
+    poll.start(10)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec()
+    poll.stop()
+    if not done():
+        raise RuntimeError("przekroczono czas scenariusza")
+
+
+class Heartbeat:
+    """Puls QTimer w wątku GUI: każda przerwa między tyknięciami ponad interwał to blokada pętli zdarzeń."""
+
+    def __init__(self, interval_ms=HEARTBEAT_MS):
+        from PyQt6.QtCore import Qt, QTimer
+        self.interval = interval_ms / 1000
+        self.gaps = []
+        self.last = None
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self.timer.start(interval_ms)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.gaps.append(now - self.last - self.interval)
+        self.last = now
+
+    def stop(self):
+        self.timer.stop()
+        stalls = [g for g in self.gaps if g > STALL_THRESHOLD]
+        return {"stall_max": max(self.gaps, default=0.0), "stall_total": sum(stalls), "stalls": len(stalls)}
+
+
+def run_pixeldrain(app, scenario, config, workdir):
+    pixel = load_plugin("pixeldrain_integration", "pixel")
+    for name in ("CONFIG_FILE", "CACHE_FILE", "JOURNAL_FILE", "DEDUP_FILE"):
+        setattr(pixel, name, os.path.join(workdir, os.path.basename(getattr(pixel, name))))
+    window = pixel.PixeldrainApp()
+    window.show()
+    window.api_key_input.setText("benchmark")
+    window.dedup_check.setChecked(False)
+    wait_until(app, lambda: window.show_files_btn.isEnabled())  # synchronizacja listy po starcie
+
+    def start():
+        if scenario == "pixeldrain-upload":
+            window.selected_files = config["paths"]
+            window.upload_files()
+        else:
+            window.file_cache = None  # pełne pobranie listy, bez różnic względem cache
+            window.remote_files = []
+            window.show_remote_files()
+
+    def done():
+        if scenario == "pixeldrain-upload":
+            return not window.scheduler.is_busy()
+        return window.show_files_btn.isEnabled()
+
+    def result():
+        if scenario == "pixeldrain-upload":
+            items = window.file_list.transfers.items
+            return {"ok": sum(1 for t in items if t.progress == 100), "items": len(items)}
+        return {"ok": window.remote_model.rowCount(), "items": window.remote_model.rowCount()}
+
+    return window, start, done, result
+
+
+def run_earnvids(app, scenario, config, workdir):
+    main = load_plugin("earnvids_integration", "main")
+    main.CONFIG_FILE = os.path.join(workdir, "config.json")
+    main.DEDUP_FILE = os.path.join(workdir, "dedup_index.db")
+    window = main.EarnVidsApp()
+    window.show()
+    window.api_key_input.setText("benchmark")
+    window.dedup_check.setChecked(False)
+    model = window.file_model
+
+    def start():
+        if scenario == "earnvids-upload":
+            window.selected_files = config["paths"]
+            window.upload_files()
+        else:
+            window.show_files_in_folder()
+
+    def done():
+        if scenario == "earnvids-upload":
+            return not window.upload_queue.is_busy()
+        # Przewijanie do końca listy: kolejne strony dociągane jak przez widok.
+        if model.canFetchMore() and not model.loading:
+            model.fetchMore()
+        return model.total is not None and len(model.files) >= model.total
+
+    def result():
+        if scenario == "earnvids-upload":
+            items = window.upload_list.transfers.items
+            return {"ok": sum(1 for t in items if t.link), "items": len(items)}
+        return {"ok": len(model.files), "items": len(model.files)}
+
+    return window, start, done, result
+
+
+def run_mega(app, scenario, config, workdir):
+    main = load_plugin("mega_upload_panel", "main")
+    from transfer_progress import TransferHistory
+    window = main.MegaUploader()
+    window.show()
+    window.history = TransferHistory(os.path.join(workdir, "historia_transferow.json"))
+    window.dane = {"Benchmark": [{"Seria": "Seria testowa", "Mail": "bench@example.com", "Haslo": "haslo"}]}
+    window.sezon_box.clear()
+    window.sezon_box.addItems(window.dane.keys())
+    window.update_series_list()
+    window._update_ui_state()
+    window.series_list.setCurrentRow(0)
+    uploads = list(config["paths"])
+    if scenario == "mega-list":
+        window.tabs.setCurrentIndex(1)  # buduje zakładkę "Podgląd konta"
+
+    def start():
+        if scenario == "mega-upload":
+            window.file_path = uploads.pop(0)
+            window.start_upload()
+        else:
+            window._refresh_file_list()
+
+    def done():
+        if scenario == "mega-list":
+            return "(Wylogowano)" in window.browser_status_label.text()
+        # MEGAcmd wysyła po jednym pliku: kolejny startuje po zakończeniu poprzedniego.
+        if window.is_uploading:
+            return False
+        if uploads:
+            start()
+            return False
+        return True
+
+    def result():
+        if scenario == "mega-upload":
+            # Każde udane wysłanie zapisuje rekord w historii transferów.
+            return {"ok": len(window.history.load()), "items": len(config["paths"])}
+        count = window.file_tree.topLevelItemCount()
+        return {"ok": count, "items": count}
+
+    return window, start, done, result
+
+
+RUNNERS = {"pixeldrain": run_pixeldrain, "earnvids": run_earnvids, "mega": run_mega}
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(config):
+    """Jeden scenariusz w bieżącym procesie; zwraca słownik metryk."""
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+    scenario = config["scenario"]
+    with tempfile.TemporaryDirectory() as workdir:
+        window, start, done, result = RUNNERS[scenario.split("-")[0]](app, scenario, config, workdir)
+        app.processEvents()
+        rss_start = peak_rss_mb()
+        heartbeat = Heartbeat()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        start()
+        wait_until(app, done)
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        metrics = heartbeat.stop()
+        metrics.update(result(), wall=wall, cpu=cpu, rss_mb=peak_rss_mb(), rss_growth_mb=peak_rss_mb() - rss_start)
+        window.close()
+    return metrics
+
+
+# --- proces nadzorujący ---
+
+def start_services(args):
+    services = {}
+    for service in ("pixeldrain", "earnvids"):
+        queue = Queue()
+        Process(target=run_service, daemon=True, args=(
+            queue, service, args.latency_ms / 1000, int(args.bandwidth_mbps * 1024 ** 2), args.list_files)).start()
+        services[service] = queue.get(timeout=10)
+    return services
+
+
+def make_files(workdir, count, size_mb):
+    block = os.urandom(1 << 20)
+    paths = []
+    for i in range(count):
+        path = os.path.join(workdir, f"bench_{i}.mkv")
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+        paths.append(path)
+    return paths
+
+
+def measure(scenario, args, services, paths, bin_dir):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen",
+               PIXELDRAIN_API_URL=services["pixeldrain"], EARNVIDS_API_URL=services["earnvids"],
+               PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""),
+               FAKE_MEGA_LATENCY=str(args.latency_ms / 1000),
+               FAKE_MEGA_BANDWIDTH=str(int(args.bandwidth_mbps * 1024 ** 2)),
+               FAKE_MEGA_FILES=str(args.list_files))
+    config = json.dumps({"scenario": scenario, "paths": paths})
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", config], env=env,
+                          capture_output=True, text=True, timeout=SCENARIO_TIMEOUT + 60)
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode or not lines:
+        raise RuntimeError(f"{scenario}: kod {proc.returncode}\n{proc.stderr[-2000:]}")
+    metrics = json.loads(lines[-1])
+    if metrics["ok"] != metrics["items"] or not metrics["items"]:
+        raise RuntimeError(f"{scenario}: udane {metrics['ok']} z {metrics['items']}")
+    upload = scenario.endswith("-upload")
+    volume = sum(os.path.getsize(p) for p in paths) / 1024 ** 2 if upload else metrics["items"]
+    metrics["rate"] = volume / metrics["wall"]
+    if upload:
+        metrics["cpu_per_gb"] = metrics["cpu"] / (volume / 1024)
+    return metrics
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def compare(results, baseline):
+    """Wiersze porównania z bazą: (scenariusz, metryka, baza, teraz, zmiana, czy regresja)."""
+    rows = []
+    for scenario, metrics in results.items():
+        base = baseline.get("results", {}).get(scenario)
+        if not base:
+            continue
+        for metric, (direction, relative, absolute) in TOLERANCES.items():
+            if metric not in metrics or metric not in base:
+                continue
+            old, new = base[metric], metrics[metric]
+            change = (new - old) / old if old else None
+            worse = (old - new) if direction > 0 else (new - old)
+            regression = worse > abs(old) * relative and worse > absolute
+            rows.append((scenario, metric, old, new, change, regression))
+    return rows
+
+
+def print_results(results):
+    print(f"{'scenariusz':<20}{'czas [s]':>9}{'tempo':>14}{'CPU [s]':>9}{'CPU/GB':>8}"
+          f"{'blok. max':>11}{'blok. suma':>11}{'RSS [MB]':>10}")
+    for scenario, m in results.items():
+        unit = "MB/s" if scenario.endswith("-upload") else "poz/s"
+        cpu_per_gb = f"{m['cpu_per_gb']:.2f}" if "cpu_per_gb" in m else "-"
+        print(f"{scenario:<20}{m['wall']:>9.2f}{m['rate']:>9.0f} {unit:<5}{m['cpu']:>8.2f}{cpu_per_gb:>8}"
+              f"{m['stall_max'] * 1000:>8.0f} ms{m['stall_total'] * 1000:>8.0f} ms{m['rss_mb']:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario", choices=SCENARIOS, action="append", help="tylko wybrane scenariusze")
+    parser.add_argument("--repeat", type=int, default=5, help="liczba pomiarów na scenariusz (brana jest mediana)")
+    parser.add_argument("--files", type=int, default=4, help="liczba wysyłanych plików")
+    parser.add_argument("--size-mb", type=int, default=256, help="rozmiar każdego wysyłanego pliku")
+    parser.add_argument("--list-files", type=int, default=5000, help="liczba plików na listach kont")
+    parser.add_argument("--latency-ms", type=float, default=0, help="opóźnienie na zapytanie/polecenie")
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="przepustowość łącza w MB/s (0 = bez limitu)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="plik z wynikami bazowymi")
+    parser.add_argument("--save-baseline", action="store_true", help="zapisz wyniki jako bazowe")
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(json.loads(args.child))))
+        return 0
+
+    settings = {k: getattr(args, k) for k in ("files", "size_mb", "list_files", "latency_ms", "bandwidth_mbps")}
+    services = start_services(args)
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        bin_dir = os.path.join(workdir, "bin")
+        os.mkdir(bin_dir)
+        write_fake_megacmd(bin_dir)
+        paths = make_files(workdir, args.files, args.size_mb)
+        for scenario in args.scenario or SCENARIOS:
+            runs = [measure(scenario, args, services, paths, bin_dir) for _ in range(args.repeat)]
+            results[scenario] = {key: median(r[key] for r in runs) for key in runs[0]}
+
+    print(f"Mediana z {args.repeat} pomiarów; {args.files} x {args.size_mb} MiB, listy {args.list_files} pozycji, "
+          f"opóźnienie {args.latency_ms:g} ms, łącze {args.bandwidth_mbps or 'bez limitu'} MB/s")
+    print_results(results)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"machine": platform.platform(), "python": platform.python_version(),
+                       "settings": settings, "results": {
+                           scenario: {k: round(v, 4) for k, v in metrics.items()}
+                           for scenario, metrics in results.items()}}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nZapisano wyniki bazowe: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != settings:
+        print(f"\nUstawienia różnią się od bazowych ({baseline.get('settings')}) - porównanie pominięte.")
+        return 0
+    rows = compare(results, baseline)
+    print(f"\nPorównanie z {os.path.relpath(args.baseline, ROOT)} ({baseline.get('machine')}):")
+    for scenario, metric, old, new, change, regression in rows:
+        mark = "  REGRESJA" if regression else ""
+        change = "-" if change is None else f"{change:+.0%}"
+        print(f"  {scenario:<20}{metric:<13}{old:>10.3f} -> {new:>10.3f} ({change}){mark}")
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark strumieniowania w UploadWorker (Pixeldrain): stare kawałki 8 KiB z sygnałem
+postępu na każdy kawałek kontra adaptacyjne kawałki 1-16 MiB z dławionym postępem.
+
+Plik jest wysyłany przez prawdziwą sesję HTTP do lokalnego serwera-zlewu uruchomionego
+w osobnym procesie, a sygnały trafiają do wątku GUI przez pętlę zdarzeń Qt - tak jak
+w dodatku. Mierzony jest czas CPU procesu (wątek wysyłający + wątek GUI).
+
+Użycie: python benchmarks/pixeldrain_chunks.py [--size-mb 512]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Queue
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "DLC"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+class SinkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_PUT(self):
+        received = 0
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                while size:
+                    part = self.rfile.read(min(size, 1 << 20))
+                    size -= len(part)
+                    received += len(part)
+                self.rfile.readline()
+        else:
+            remaining = int(self.headers.get("Content-Length", 0))
+            while remaining:
+                part = self.rfile.read(min(remaining, 1 << 20))
+                remaining -= len(part)
+                received += len(part)
+        body = f'{{"id": "bench{received}"}}'.encode()
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def run_sink(queue):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SinkHandler)
+    queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def legacy_body(f, signals, total_size):
+    """Dawny generator z UploadWorker.run: 8 KiB i sygnał na każdy kawałek."""
+    uploaded_size = 0
+    while True:
+        data = f.read(8192)
+        if not data:
+            break
+        uploaded_size += len(data)
+        signals.progress.emit(int((uploaded_size / total_size) * 100))
+        yield data
+
+
+def run_case(mode, file_path, url):
+    from dlc_common.progress import ProgressThrottle
+    from dlc_common.scheduler import WorkerSignals
+    from dlc_common.transport import get_session, read_adaptive_chunks
+    from PyQt6.QtCore import QCoreApplication, QEventLoop, QRunnable, QThreadPool
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    received = []
+
+    class BenchWorker(QRunnable):
+        def __init__(self):
+            super().__init__()
+            self.signals = WorkerSignals()
+            self.emitted = 0
+
+        def run(self):
+            total_size = os.path.getsize(file_path)
+            with open(file_path, "rb") as f:
+                if mode == "legacy":
+                    body = legacy_body(f, self.signals, total_size)
+                    throttle = None
+                else:
+                    throttle = ProgressThrottle(self.signals.progress.emit, total_size)
+                    body = read_adaptive_chunks(f, throttle.add)
+                resp = get_session().put(url, data=body, headers={"Content-Type": "application/octet-stream"})
+            self.signals.finished.emit({"status": resp.status_code})
+
+    worker = BenchWorker()
+    loop = QEventLoop()
+    worker.signals.progress.connect(received.append)
+    worker.signals.finished.connect(lambda _: loop.quit())
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    QThreadPool.globalInstance().start(worker)
+    loop.exec()
+    app.processEvents()
+    return time.process_time() - cpu_start, time.perf_counter() - wall_start, len(received)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=512)
+    args = parser.parse_args()
+
+    queue = Queue()
+    sink = Process(target=run_sink, args=(queue,), daemon=True)
+    sink.start()
+    url = f"http://127.0.0.1:{queue.get()}/api/file/bench.bin"
+
+    fd, file_path = tempfile.mkstemp(suffix=".bin")
+    try:
+        block = os.urandom(1 << 20)
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(block)
+        gb = args.size_mb / 1024
+        print(f"Plik testowy: {args.size_mb} MiB")
+        print(f"{'tryb':<10}{'CPU [s]':>10}{'CPU/GB [s]':>12}{'czas [s]':>10}{'MB/s':>10}{'sygnały':>10}")
+        results = {}
+        for mode in ("legacy", "adaptive"):
+            cpu, wall, signals = run_case(mode, file_path, url)
+            results[mode] = cpu
+            print(f"{mode:<10}{cpu:>10.2f}{cpu / gb:>12.2f}{wall:>10.2f}{args.size_mb / wall:>10.1f}{signals:>10}")
+        if results["legacy"]:
+            saved = (1 - results["adaptive"] / results["legacy"]) * 100
+            print(f"Oszczędność CPU: {saved:.1f}%")
+    finally:
+        os.remove(file_path)
+        sink.terminate()
+
+
+if __name__ == "__main__":
+    main()
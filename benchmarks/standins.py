@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokalne zastępniki usług dla benchmarków: serwery HTTP udające API Pixeldrain i EarnVids
+oraz fałszywe polecenia MEGAcmd (mega-login/logout/put/ls/export/rm), wszystkie z ustawianym
+opóźnieniem na zapytanie i przepustowością łącza.
+
+Serwery działają w osobnych procesach (run_service), żeby ich CPU nie wliczał się do mierzonego
+dodatku. Polecenia MEGA są skryptami w katalogu tymczasowym (write_fake_megacmd), który trzeba
+dodać na początek PATH; ustawienia dostają przez zmienne środowiskowe FAKE_MEGA_*.
+
+Ręczne uruchomienie serwera: python benchmarks/standins.py pixeldrain|earnvids [--latency-ms 20]
+"""
+import argparse
+import json
+import os
+import stat
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BLOCK = 64 * 1024
+
+
+class Throttle:
+    """Ogranicza przepustowość (B/s, 0 = bez limitu) wspólnie dla wszystkich połączeń serwera."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.next_free = time.monotonic()
+
+    def consume(self, count):
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.next_free = max(self.next_free, now) + count / self.rate
+            delay = self.next_free - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.0  # s na zapytanie
+    throttle = Throttle(0)
+    files = 1000  # liczba plików na koncie (listy)
+
+    def log_message(self, *args):
+        pass
+
+    def read_body(self):
+        """Odbiera ciało zapytania w tempie łącza; zwraca liczbę bajtów (treść nie jest potrzebna)."""
+        received = 0
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return received
+                received += self._read(size)
+                self.rfile.readline()
+        return self._read(int(self.headers.get("Content-Length", 0)))
+
+    def _read(self, remaining):
+        received = 0
+        while remaining:
+            part = self.rfile.read(min(remaining, BLOCK))
+            if not part:
+                break
+            self.throttle.consume(len(part))
+            remaining -= len(part)
+            received += len(part)
+        return received
+
+    def send_json(self, data, status=200):
+        time.sleep(self.latency)
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        for start in range(0, len(body), BLOCK):
+            self.throttle.consume(min(BLOCK, len(body) - start))
+            self.wfile.write(body[start:start + BLOCK])
+
+    def query(self):
+        url = urlsplit(self.path)
+        return url.path, {k: v[0] for k, v in parse_qs(url.query).items()}
+
+
+class PixeldrainHandler(StandInHandler):
+    """PUT /api/file/{nazwa}, GET /api/user/files, GET /api/user."""
+
+    def do_PUT(self):
+        path, _ = self.query()
+        if not path.startswith("/api/file/"):
+            return self.send_json({"success": False, "value": "not_found"}, 404)
+        size = self.read_body()
+        self.send_json({"id": f"bench{size:x}"}, 201)
+
+    def do_GET(self):
+        path, _ = self.query()
+        if path == "/api/user/files":
+            return self.send_json({"files": [
+                {"id": f"id{i}", "name": f"Seria {i % 50} - odcinek {i}.mkv", "size": 350_000_000 + i,
+                 "views": i % 97, "downloads": i % 13, "date_upload": "2024-01-02T03:04:05Z"}
+                for i in range(self.files)
+            ]})
+        if path == "/api/user":
+            return self.send_json({"username": "benchmark", "subscription": {"name": "free"}})
+        self.send_json({"success": False, "value": "not_found"}, 404)
+
+
+class EarnVidsHandler(StandInHandler):
+    """GET /api/upload/server, POST /upload (multipart), GET /api/file/list, /api/folder/list, /api/account/info."""
+
+    def do_GET(self):
+        path, params = self.query()
+        if path == "/api/upload/server":
+            host, port = self.server.server_address
+            return self.send_json({"status": 200, "result": f"http://{host}:{port}/upload"})
+        if path == "/api/file/list":
+            page, per_page = int(params.get("page", 1)), int(params.get("per_page", 100))
+            first = (page - 1) * per_page
+            files = [{"file_code": f"code{i}", "title": f"Seria {i % 50} - odcinek {i}", "canplay": 1}
+                     for i in range(first, min(self.files, first + per_page))]
+            return self.send_json({"status": 200, "result": {
+                "files": files, "results": len(files), "results_total": self.files,
+                "pages": -(-self.files // per_page)}})
+        if path == "/api/folder/list":
+            return self.send_json({"status": 200, "result": {"folders": [], "files": []}})
+        if path == "/api/account/info":
+            return self.send_json({"status": 200, "result": {"login": "benchmark", "files_total": self.files}})
+        self.send_json({"status": 404, "msg": "not found"})
+
+    def do_POST(self):
+        size = self.read_body()
+        self.send_json({"msg": "OK", "status": 200, "files": [{"filecode": f"bench{size:x}", "status": "OK"}]})
+
+
+SERVICES = {"pixeldrain": PixeldrainHandler, "earnvids": EarnVidsHandler}
+
+
+def make_server(service, latency=0.0, bandwidth=0, files=1000, port=0):
+    handler = type(SERVICES[service].__name__, (SERVICES[service],),
+                   {"latency": latency, "throttle": Throttle(bandwidth), "files": files})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def run_service(queue, service, latency=0.0, bandwidth=0, files=1000):
+    """Cel dla multiprocessing.Process: uruchamia serwer i oddaje jego adres API przez kolejkę."""
+    server = make_server(service, latency, bandwidth, files)
+    queue.put(f"http://127.0.0.1:{server.server_address[1]}/api")
+    server.serve_forever()
+
+
+# --- MEGAcmd ---
+
+MEGA_COMMANDS = ("mega-login", "mega-logout", "mega-put", "mega-ls", "mega-export", "mega-rm")
+MEGA_PROGRESS_INTERVAL = 0.1  # s między liniami postępu mega-put
+
+
+def write_fake_megacmd(bin_dir):
+    """Tworzy w bin_dir skrypty mega-* wołające fake_megacmd() z tego modułu."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    for command in MEGA_COMMANDS:
+        path = os.path.join(bin_dir, command)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"#!{sys.executable}\n"
+                    f"import sys\nsys.path.insert(0, {here!r})\n"
+                    f"from standins import fake_megacmd\nsys.exit(fake_megacmd({command!r}, sys.argv[1:]))\n")
+        os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def fake_megacmd(command, args):
+    """
+    Zachowanie poleceń MEGAcmd na potrzeby dodatku mega_upload_panel. Zmienne środowiskowe:
+    FAKE_MEGA_LATENCY (s na polecenie), FAKE_MEGA_BANDWIDTH (B/s dla mega-put, 0 = bez limitu),
+    FAKE_MEGA_FILES (liczba wpisów mega-ls).
+    """
+    time.sleep(float(os.environ.get("FAKE_MEGA_LATENCY", "0")))
+    if command == "mega-put":
+        return _fake_put(args[-1], int(os.environ.get("FAKE_MEGA_BANDWIDTH", "0")))
+    if command == "mega-ls":
+        print("FLAGS VERS     SIZE   DATE      NAME")
+        for i in range(int(os.environ.get("FAKE_MEGA_FILES", "1000"))):
+            print(f"-ep- {1:>4} {350_000_000 + i:>10} 02Jan2024 03:04:05 Seria {i % 50} - odcinek {i}.mkv")
+        return 0
+    if command == "mega-export":
+        print(f"Exported /{args[-1]}: https://mega.nz/file/bench{abs(hash(args[-1])) % 10 ** 8}#klucz")
+    return 0
+
+
+def _fake_put(path, bandwidth):
+    # Plik jest naprawdę czytany (jak przez MEGAcmd), a postęp wypisywany w formacie mega-put.
+    throttle = Throttle(bandwidth)
+    total = os.path.getsize(path)
+    total_mb = total / 1024 ** 2
+    done = 0
+    last = 0.0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(1 << 20)
+            if not block:
+                break
+            throttle.consume(len(block))
+            done += len(block)
+            now = time.monotonic()
+            if now - last >= MEGA_PROGRESS_INTERVAL or done == total:
+                last = now
+                percent = done / total * 100 if total else 100.0
+                bar = "#" * int(percent / 5)
+                sys.stderr.write(f"TRANSFERRING ||{bar:.<20}||({done / 1024 ** 2:.0f}/{total_mb:.0f} MB: {percent:6.2f} %)\r")
+                sys.stderr.flush()
+    sys.stderr.write("\n")
+    print(f"Upload finished: /{os.path.basename(path)}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("service", choices=sorted(SERVICES))
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0, help="MB/s, 0 = bez limitu")
+    parser.add_argument("--files", type=int, default=1000, help="liczba plików na liście konta")
+    args = parser.parse_args()
+    server = make_server(args.service, args.latency_ms / 1000, int(args.bandwidth_mbps * 1024 ** 2), args.files, args.port)
+    print(f"{args.service}: http://127.0.0.1:{server.server_address[1]}/api")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
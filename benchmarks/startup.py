@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark startu dodatków: ile trwa od uruchomienia interpretera do pierwszego
+narysowanego okna, w podziale na etapy (QApplication, import modułu dodatku,
+konstrukcja okna, pierwsze wyświetlenie), oraz najdroższe importy z -X importtime.
+
+Każdy pomiar to osobny proces (jak przy uruchamianiu dodatku z automatyzera), z katalogiem
+roboczym i danymi dodatków (DLC_DATA_DIR) w folderze tymczasowym, więc prawdziwe konfiguracje,
+bazy i dzienniki wysyłania nie są otwierane. Okna są tworzone na platformie offscreen.
+Z --host mierzony jest też czas otwarcia okna w gospodarzu dodatków (dlc_common/host.py):
+pierwsze otwarcie (import modułu + okno) i ponowne (okno już istnieje), liczone od zapytania
+do odpowiedzi gospodarza.
+
+Użycie: python benchmarks/startup.py [--repeat 5] [--top 8] [--plugin pixeldrain] [--host]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DLC = os.path.join(ROOT, "DLC")
+sys.path.insert(0, DLC)
+
+# nazwa -> (katalog dodatku, moduł, klasa okna)
+PLUGINS = {
+    "pixeldrain": ("pixeldrain_integration", "pixel", "PixeldrainApp"),
+    "earnvids": ("earnvids_integration", "main", "EarnVidsApp"),
+    "mega": ("mega_upload_panel", "main", "MegaUploader"),
+    "fonts": ("Sprawdzacz czcionek", "sprawdzacz_czcionek", "MainWindow"),
+}
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+t1 = time.perf_counter()
+sys.path.insert(0, {plugin_dir!r})
+import {module} as plugin
+t2 = time.perf_counter()
+window = plugin.{cls}()
+t3 = time.perf_counter()
+window.show()
+app.processEvents()
+t4 = time.perf_counter()
+print(json.dumps({{"qapp": t1 - t0, "import": t2 - t1, "construct": t3 - t2, "show": t4 - t3}}))
+"""
+
+
+def child_env(workdir):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", DLC_DATA_DIR=workdir)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def measure(name, workdir):
+    plugin_dir, module, cls = PLUGINS[name]
+    code = CHILD.format(plugin_dir=os.path.join(DLC, plugin_dir), module=module, cls=cls)
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", code], cwd=workdir, env=child_env(workdir),
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    # Czas do okna liczymy do chwili, gdy proces zgłosi wyświetlenie - bez zamykania interpretera.
+    line = proc.stdout.readline()
+    window = time.perf_counter() - start
+    proc.communicate()
+    if proc.returncode or not line:
+        raise RuntimeError(f"{name}: proces zakończył się kodem {proc.returncode}")
+    phases = json.loads(line)
+    phases["window"] = window
+    return phases
+
+
+def import_profile(name, workdir, top):
+    """Najdroższe importy (czas łączny z podmodułami) z -X importtime dla modułu dodatku."""
+    plugin_dir, module, _ = PLUGINS[name]
+    code = f"import sys; sys.path.insert(0, {os.path.join(DLC, plugin_dir)!r}); import {module}"
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=workdir, env=child_env(workdir),
+                         capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, mod = line[len("import time:"):].split("|")
+        depth = (len(mod) - len(mod.lstrip())) // 2
+        rows.append((int(cumulative), depth, mod.strip()))
+    # -X importtime wypisuje podmoduły przed modułem, który je zaimportował: poddrzewo dodatku
+    # to wiersze między poprzednim importem najwyższego poziomu a wierszem samego dodatku.
+    end = next(i for i, (_, depth, mod) in enumerate(rows) if depth == 0 and mod == module)
+    start = end
+    while start > 0 and rows[start - 1][1] > 0:
+        start -= 1
+    # Importy z modułu dodatku i poziom pod nimi - głębsze są wliczone w czas łączny.
+    subtree = sorted((r for r in rows[start:end] if r[1] <= 2), reverse=True)
+    return rows[end][0], subtree[:top]
+
+
+def measure_host(names, workdir):
+    """
+    Czasy otwarcia okien w świeżo uruchomionym gospodarzu: {dodatek: (pierwsze, ponowne)}.
+    Dodatki, którym brakuje wymagań z plugin.json (np. MEGAcmd), są pomijane.
+    """
+    os.environ.update(child_env(workdir))
+    from dlc_common.launcher import send_to_host, start_host
+    if send_to_host({"cmd": "ping"}) is not None:
+        raise RuntimeError("gospodarz dodatków już działa - zamknij go przed pomiarem")
+    if not start_host():
+        raise RuntimeError("gospodarz dodatków nie wystartował")
+    times = {}
+    try:
+        for name in names:
+            request = {"cmd": "open", "plugin": PLUGINS[name][0], "args": []}
+            opened = []
+            for _ in range(2):
+                start = time.perf_counter()
+                reply = send_to_host(request)
+                opened.append(time.perf_counter() - start)
+                if reply and reply.get("missing"):
+                    break
+                if not reply or not reply.get("ok"):
+                    raise RuntimeError(f"{name}: {reply}")
+            else:
+                times[name] = tuple(opened)
+    finally:
+        send_to_host({"cmd": "quit"})
+        while send_to_host({"cmd": "ping"}) is not None:
+            time.sleep(0.05)
+    return times
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="liczba uruchomień na dodatek (brana jest mediana)")
+    parser.add_argument("--top", type=int, default=8, help="ile najdroższych importów pokazać")
+    parser.add_argument("--plugin", choices=sorted(PLUGINS), action="append", help="tylko wybrane dodatki")
+    parser.add_argument("--host", action="store_true", help="zmierz też otwieranie okien w gospodarzu dodatków")
+    args = parser.parse_args()
+
+    names = args.plugin or list(PLUGINS)
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"Mediana z {args.repeat} uruchomień, czasy w ms")
+        print(f"{'dodatek':<12}{'QApp':>8}{'import':>8}{'okno':>8}{'show':>8}{'do okna':>9}")
+        for name in names:
+            measure(name, workdir)  # rozgrzewka: pliki .pyc i pamięć podręczna dysku
+            runs = [measure(name, workdir) for _ in range(args.repeat)]
+            row = {key: median(r[key] for r in runs) * 1000 for key in runs[0]}
+            print(f"{name:<12}{row['qapp']:>8.0f}{row['import']:>8.0f}{row['construct']:>8.0f}"
+                  f"{row['show']:>8.0f}{row['window']:>9.0f}")
+
+        if args.host:
+            runs = [measure_host(names, workdir) for _ in range(args.repeat)]
+            print(f"\nGospodarz dodatków (mediana z {args.repeat}), czasy w ms")
+            print(f"{'dodatek':<12}{'pierwsze':>10}{'ponowne':>10}")
+            for name in names:
+                if name not in runs[0]:
+                    print(f"{name:<12}  pominięty - brak wymagań z plugin.json")
+                    continue
+                first = median(r[name][0] for r in runs) * 1000
+                again = median(r[name][1] for r in runs) * 1000
+                print(f"{name:<12}{first:>10.1f}{again:>10.1f}")
+
+        for name in names:
+            total, direct = import_profile(name, workdir, args.top)
+            print(f"\n{name}: import modułu {total / 1000:.0f} ms, najdroższe importy:")
+            for cumulative, depth, mod in direct:
+                print(f"  {'  ' * (depth - 1)}{mod:<40}{cumulative / 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark ścieżki wysyłania Pixeldrain: CPU na GB dla ciała zapytania budowanego z obiektów
+bytes (stary generator 8 KiB i adaptacyjne kawałki przez requests) kontra dlc_common.transport,
+który oddaje plik do gniazda przez socket.sendfile() albo widoki memoryview na mmap.
+
+Wysyłka idzie do lokalnego serwera-zlewu w osobnym procesie (ten sam co w
+pixeldrain_chunks.py), więc mierzony czas CPU to wyłącznie strona wysyłająca.
+Plik jest wysyłany dwa razy pod rząd, pierwszy przebieg tylko rozgrzewa pamięć podręczną
+plików, żeby wszystkie tryby czytały z RAM.
+
+Użycie: python benchmarks/zero_copy_upload.py [--size-mb 1024] [--repeat 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process, Queue
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "DLC"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from pixeldrain_chunks import legacy_body, run_sink  # noqa: E402
+
+
+class NullSignals:
+    class progress:
+        @staticmethod
+        def emit(value):
+            pass
+
+
+def run_case(mode, file_path, url):
+    from dlc_common.progress import ProgressThrottle
+    from dlc_common.transport import get_session, read_adaptive_chunks, send_file
+
+    total_size = os.path.getsize(file_path)
+    headers = {"Content-Type": "application/octet-stream"}
+    throttle = ProgressThrottle(lambda percent: None, total_size)
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    if mode in ("legacy", "adaptive"):
+        with open(file_path, "rb") as f:
+            if mode == "legacy":
+                body = legacy_body(f, NullSignals, total_size)
+            else:
+                body = read_adaptive_chunks(f, throttle.add)
+            resp = get_session().put(url, data=body, headers=headers)
+    else:
+        resp = send_file("PUT", url, file_path, headers=headers, on_chunk=throttle.add, mapped=(mode == "mmap"))
+    assert resp.status_code == 201, resp.status_code
+    return time.process_time() - cpu_start, time.perf_counter() - wall_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3, help="liczba pomiarów na tryb (brana jest mediana)")
+    args = parser.parse_args()
+
+    queue = Queue()
+    sink = Process(target=run_sink, args=(queue,), daemon=True)
+    sink.start()
+    url = f"http://127.0.0.1:{queue.get()}/api/file/bench.bin"
+
+    fd, file_path = tempfile.mkstemp(suffix=".bin")
+    try:
+        block = os.urandom(1 << 20)
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(args.size_mb):
+                f.write(block)
+        gb = args.size_mb / 1024
+        modes = ("legacy", "adaptive", "sendfile", "mmap")
+        run_case("sendfile", file_path, url)
+
+        print(f"Plik testowy: {args.size_mb} MiB, mediana z {args.repeat} pomiarów")
+        print(f"{'tryb':<10}{'CPU [s]':>10}{'CPU/GB [s]':>12}{'czas [s]':>10}{'MB/s':>10}")
+        results = {}
+        for mode in modes:
+            runs = sorted(run_case(mode, file_path, url) for _ in range(args.repeat))
+            cpu, wall = runs[len(runs) // 2]
+            results[mode] = cpu
+            print(f"{mode:<10}{cpu:>10.2f}{cpu / gb:>12.2f}{wall:>10.2f}{args.size_mb / wall:>10.1f}")
+        for mode in ("sendfile", "mmap"):
+            if results["adaptive"]:
+                saved = (1 - results[mode] / results["adaptive"]) * 100
+                print(f"{mode}: {saved:.1f}% mniej CPU niż adaptive")
+    finally:
+        os.remove(file_path)
+        sink.terminate()
+
+
+if __name__ == "__main__":
+    main()